@@ -0,0 +1,261 @@
+"""File __main__.py
+Copyright 2012-2025 Aris Xanthos
+-----------------------------------------------------------------------------
+This file is part of the Orange3-Textable package.
+
+Orange3-Textable is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Orange3-Textable is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Orange3-Textable. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""
+Command line interface of Textable. Usage:
+
+    python -m _textable run [options] workflow.ows
+
+runs the Textable widgets of a workflow without GUI and writes the outputs
+of its last widgets (or of all widgets) to files (see TextableHeadless).
+
+    python -m _textable bench [options]
+
+runs the benchmark suite of widget processing on a synthetic corpus, and
+optionally saves results as a baseline or compares them to one (see
+TextableBenchmark).
+"""
+
+import os
+import sys
+import argparse
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m _textable')
+    commands = parser.add_subparsers(dest='command')
+    runParser = commands.add_parser(
+        'run', help='run a workflow without GUI and write its outputs',
+    )
+    runParser.add_argument('workflow', help='workflow file (.ows)')
+    runParser.add_argument(
+        '-o', '--output-dir', default='.',
+        help='directory where outputs are written (default: current one)',
+    )
+    runParser.add_argument(
+        '-a', '--all-outputs', action='store_true',
+        help='write the outputs of all widgets, not only of the last ones',
+    )
+    runParser.add_argument(
+        '-w', '--workers', type=int, default=1,
+        help='maximum number of widgets processing at the same time '
+             '(also used by widgets with several worker processes)',
+    )
+    runParser.add_argument(
+        '-m', '--max-memory', type=int, default=0,
+        help='limit of the memory allocated by each process of the run, '
+             'in MB (0 for none)',
+    )
+    runParser.add_argument(
+        '-q', '--quiet', action='store_true',
+        help="don't report progress",
+    )
+    benchParser = commands.add_parser(
+        'bench', help='run benchmarks of widget processing',
+    )
+    benchParser.add_argument(
+        '-n', '--num-words', type=int, default=None,
+        help='number of words in the corpus',
+    )
+    benchParser.add_argument(
+        '-d', '--num-documents', type=int, default=None,
+        help='number of documents in the corpus',
+    )
+    benchParser.add_argument(
+        '-V', '--vocabulary-size', type=int, default=None,
+        help='number of distinct words in the corpus vocabulary',
+    )
+    benchParser.add_argument(
+        '-c', '--cardinality', type=int, default=None,
+        help='number of distinct values of annotations',
+    )
+    benchParser.add_argument(
+        '--no-markup', action='store_true',
+        help="don't mark up words and sentences in XML",
+    )
+    benchParser.add_argument(
+        '--seed', type=int, default=None,
+        help='seed of the random corpus generator',
+    )
+    benchParser.add_argument(
+        '-r', '--repeat', type=int, default=None,
+        help='number of timed runs of each benchmark (the best is kept)',
+    )
+    benchParser.add_argument(
+        '-k', '--pattern', default=None,
+        help='run only benchmarks whose name matches this pattern '
+             '(e.g. "Segment.*")',
+    )
+    benchParser.add_argument(
+        '-s', '--save', metavar='FILE',
+        help='save results to FILE (JSON)',
+    )
+    benchParser.add_argument(
+        '--compare', metavar='FILE',
+        help='compare results to those saved in FILE and exit with '
+             'status 1 in case of regression',
+    )
+    benchParser.add_argument(
+        '-t', '--threshold', type=float, default=None,
+        help='relative increase of time or peak memory considered as '
+             'a regression (e.g. 0.2 for 20%%)',
+    )
+    benchParser.add_argument(
+        '-q', '--quiet', action='store_true',
+        help="don't report results of each benchmark",
+    )
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        return run(args)
+    if args.command == 'bench':
+        return bench(args)
+    parser.print_help()
+    return 2
+
+
+def run(args):
+    """Run a workflow according to command line arguments"""
+    from _textable.widgets.TextableHeadless import (
+        Workflow, HeadlessRunner, setMemoryLimit, writeOutput,
+        getOutputBasePath,
+    )
+    if args.max_memory > 0:
+        try:
+            limit = setMemoryLimit(args.max_memory * 2**20)
+        except (NotImplementedError, ValueError) as exc:
+            print(u"Warning: %s" % exc, file=sys.stderr)
+        else:
+            if limit < args.max_memory * 2**20:
+                print(
+                    u"Warning: memory limit lowered to the maximum allowed "
+                    u"for this process (%i MB)." % (limit // 2**20),
+                    file=sys.stderr,
+                )
+    try:
+        workflow = Workflow(args.workflow)
+    except (OSError, ValueError) as exc:
+        print(u"Error: %s" % exc, file=sys.stderr)
+        return 1
+    runner = HeadlessRunner(
+        workflow,
+        maxWorkers=args.workers,
+        log=None if args.quiet else sys.stderr,
+    )
+    try:
+        results = runner.run()
+    except ValueError as exc:
+        print(u"Error: %s" % exc, file=sys.stderr)
+        return 1
+    except MemoryError:
+        print(u"Error: memory limit exceeded.", file=sys.stderr)
+        return 1
+
+    # Write outputs of widgets that aren't linked to other ones (unless
+    # all outputs are requested)...
+    os.makedirs(args.output_dir, exist_ok=True)
+    sources = {link['source'] for link in workflow.links}
+    for nodeId, result in results.items():
+        if nodeId in sources and not args.all_outputs:
+            continue
+        for channelName, values in result['outputs'].items():
+            for signalId, value in values.items():
+                basePath = getOutputBasePath(
+                    args.output_dir,
+                    workflow.nodes[nodeId],
+                    channelName,
+                    signalId if len(values) > 1 else None,
+                )
+                path = writeOutput(value, basePath)
+                if path is not None and not args.quiet:
+                    print(u"Wrote %s" % path, file=sys.stderr)
+    failed = [r for r in results.values() if r['state'] == 'error']
+    return 1 if failed else 0
+
+
+def bench(args):
+    """Run benchmarks according to command line arguments"""
+    from _textable.widgets import TextableBenchmark
+    baseline = None
+    if args.compare:
+        try:
+            baseline = TextableBenchmark.loadResults(args.compare)
+        except (OSError, ValueError) as exc:
+            print(u"Error: %s" % exc, file=sys.stderr)
+            return 1
+
+    # Use the corpus parameters of the baseline unless specified...
+    parameters = dict()
+    if baseline is not None:
+        for key in ('numWords', 'numDocuments', 'vocabularySize',
+                    'cardinality', 'markup', 'seed'):
+            if key in baseline['corpus']:
+                parameters[key] = baseline['corpus'][key]
+    for key, value in (
+        ('numWords', args.num_words),
+        ('numDocuments', args.num_documents),
+        ('vocabularySize', args.vocabulary_size),
+        ('cardinality', args.cardinality),
+        ('seed', args.seed),
+    ):
+        if value is not None:
+            parameters[key] = value
+    if args.no_markup:
+        parameters['markup'] = False
+    corpus = TextableBenchmark.BenchmarkCorpus(**parameters)
+    results = TextableBenchmark.runBenchmarks(
+        corpus,
+        pattern=args.pattern,
+        repeat=(
+            args.repeat if args.repeat is not None
+            else TextableBenchmark.DEFAULT_REPEAT
+        ),
+        log=None if args.quiet else sys.stdout,
+    )
+    corpus.clear()
+    if args.save:
+        TextableBenchmark.saveResults(results, args.save)
+    if baseline is None:
+        return 0
+
+    mismatches = TextableBenchmark.getParameterMismatches(baseline, results)
+    if mismatches:
+        print(
+            u"Warning: corpus parameters differ from baseline (%s)."
+            % u", ".join(mismatches),
+            file=sys.stderr,
+        )
+    threshold = (
+        args.threshold if args.threshold is not None
+        else TextableBenchmark.DEFAULT_THRESHOLD
+    )
+    regressions = TextableBenchmark.compareResults(
+        baseline, results, threshold,
+    )
+    for name, metric, old, new, ratio in regressions:
+        print(
+            u"Regression: %s %s %.4g -> %.4g (+%.0f%%)"
+            % (name, metric, old, new, (ratio - 1) * 100),
+        )
+    if not regressions:
+        print(u"No regression beyond %.0f%%." % (threshold * 100))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
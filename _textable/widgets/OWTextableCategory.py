@@ -18,7 +18,7 @@ You should have received a copy of the GNU General Public License
 along with Orange3-Textable. If not, see <http://www.gnu.org/licenses/>.
 """
 
-__version__ = '0.12.9'
+__version__ = '0.12.11'
 
 from LTTL.TableThread import Table
 from LTTL.Segmentation import Segmentation
@@ -76,6 +76,10 @@ class OWTextableCategory(OWTextableBaseWidget):
     want_main_area = False
     resizing_enabled = False
 
+    # Reuse the result of previous runs with the same input and settings
+    # (see OWTextableBaseWidget.getMemoKey)...
+    memoizeResults = True
+
     def __init__(self):
 
         """Initialize a Category widget"""
@@ -266,6 +270,9 @@ class OWTextableCategory(OWTextableBaseWidget):
             ),
         )
 
+        # Profiling box
+        self.create_profilingBox()
+
         gui.rubber(self.controlArea)
 
         # Send button & Info box
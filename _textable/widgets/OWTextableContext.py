@@ -18,7 +18,7 @@ You should have received a copy of the GNU General Public License
 along with Orange3-Textable. If not, see <http://www.gnu.org/licenses/>.
 """
 
-__version__ = '0.10.10'
+__version__ = '0.10.12'
 
 from LTTL.TableThread import Table
 from LTTL.Segmentation import Segmentation
@@ -79,6 +79,10 @@ class OWTextableContext(OWTextableBaseWidget):
     want_main_area = False
     resizing_enabled = False
 
+    # Reuse the result of previous runs with the same input and settings
+    # (see OWTextableBaseWidget.getMemoKey)...
+    memoizeResults = True
+
     def __init__(self):
         """Initialize a Context widget"""
         super().__init__()
@@ -317,6 +321,9 @@ class OWTextableContext(OWTextableBaseWidget):
             ),
         )
 
+        # Profiling box
+        self.create_profilingBox()
+
         gui.rubber(self.controlArea)
 
         # Send button & Info box
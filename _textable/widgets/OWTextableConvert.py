@@ -18,7 +18,7 @@ You should have received a copy of the GNU General Public License
 along with Orange3-Textable. If not, see <http://www.gnu.org/licenses/>.
 """
 
-__version__ = '0.19.14'
+__version__ = '0.19.17'
 
 import os
 import codecs
@@ -99,6 +99,10 @@ class OWTextableConvert(OWTextableBaseWidget):
     want_main_area = False
     resizing_enabled = False
 
+    # Reuse the result of previous runs with the same input and settings
+    # (see OWTextableBaseWidget.getMemoKey)...
+    memoizeResults = True
+
     @property
     def colDelimiter(self):
         _, delimiter = ColumnDelimiters[self.colDelimiter_idx]
@@ -530,6 +534,9 @@ class OWTextableConvert(OWTextableBaseWidget):
         )
         self.advancedSettings.basicWidgets.append(self.basicExportBox)
 
+        # Profiling box (advanced settings)
+        self.create_profilingBox()
+
         gui.rubber(self.controlArea)
 
         # Send button & Info box
@@ -571,7 +578,9 @@ class OWTextableConvert(OWTextableBaseWidget):
     def process_data(self, caller, transformed_table, numIterations):
         """ Process data in a worker thread
         instead of the main thread so that
-        the operations can be cancelled """
+        the operations can be cancelled (each
+        operation is run with runTaskStep, so
+        that hard cancel applies to it) """
 
         if self.displayAdvancedSettings:
             # Set max iterations
@@ -600,13 +609,14 @@ class OWTextableConvert(OWTextableBaseWidget):
                 else:
                     key_row_id = None
 
-                transformed_table = transformed_table.to_sorted(
+                transformed_table = self.runTaskStep(partial(
+                    transformed_table.to_sorted,
                     key_col_id,
                     self.sortRowsReverse,
                     key_row_id,
                     self.sortColsReverse,
                     caller=caller,
-                )
+                ))
 
             # Check if thread was cancelled
             if not transformed_table:
@@ -615,9 +625,10 @@ class OWTextableConvert(OWTextableBaseWidget):
 
             # Transpose if needed...
             if self.transpose:
-                transformed_table = transformed_table.to_transposed(
+                transformed_table = self.runTaskStep(partial(
+                    transformed_table.to_transposed,
                     caller=caller,
-                )
+                ))
                 
             # Check if thread was cancelled
             if not transformed_table:
@@ -626,11 +637,12 @@ class OWTextableConvert(OWTextableBaseWidget):
 
             # Normalize if needed...
             if self.normalize:
-                transformed_table = transformed_table.to_normalized(
+                transformed_table = self.runTaskStep(partial(
+                    transformed_table.to_normalized,
                     mode=self.normalizeMode,
                     type=self.normalizeType.lower(),
                     caller=self,
-                )
+                ))
                 
             # Check if thread was cancelled
             if not transformed_table:
@@ -640,14 +652,16 @@ class OWTextableConvert(OWTextableBaseWidget):
             # Convert if needed...
             elif self.convert:
                 if self.conversionType == 'document frequency':
-                    transformed_table = transformed_table.to_document_frequency(
+                    transformed_table = self.runTaskStep(partial(
+                        transformed_table.to_document_frequency,
                         caller=self,
-                    )
+                    ))
                 elif self.conversionType == 'association matrix':
-                    transformed_table = transformed_table.to_association_matrix(
+                    transformed_table = self.runTaskStep(partial(
+                        transformed_table.to_association_matrix,
                         bias=self.associationBias,
                         caller=self,
-                    )
+                    ))
                     
             # Check if thread was cancelled
             if not transformed_table:
@@ -657,13 +671,15 @@ class OWTextableConvert(OWTextableBaseWidget):
             # Reformat if needed...
             if self.reformat:
                 if self.unweighted:
-                    transformed_table = transformed_table.to_flat(
+                    transformed_table = self.runTaskStep(partial(
+                        transformed_table.to_flat,
                         caller=self,
-                    )
+                    ))
                 else:
-                    transformed_table = transformed_table.to_weighted_flat(
+                    transformed_table = self.runTaskStep(partial(
+                        transformed_table.to_weighted_flat,
                         caller=self,
-                    )
+                    ))
 
             # Check if thread was cancelled
             if not transformed_table:
@@ -676,7 +692,9 @@ class OWTextableConvert(OWTextableBaseWidget):
         caller.signal_text.emit('Step 2/3: Post-processing...', 'warning')
         caller.signal_prog.emit(1, True)
 
-        orange_table = transformed_table.to_orange_table(caller=self)
+        orange_table = self.runTaskStep(
+            partial(transformed_table.to_orange_table, caller=self)
+        )
         
         # Check if thread was cancelled
         if not orange_table:
@@ -694,10 +712,12 @@ class OWTextableConvert(OWTextableBaseWidget):
             colDelimiter = '\t'
             includeOrangeHeaders = False
             
-        output_string = transformed_table.to_string(
+        output_string = self.runTaskStep(partial(
+            transformed_table.to_string,
             output_orange_headers=includeOrangeHeaders,
             col_delimiter=colDelimiter,
-        )
+            caller=self,
+        ))
         
         # Check if thread was cancelled
         if not output_string:
@@ -18,7 +18,7 @@ You should have received a copy of the GNU General Public License
 along with Orange3-Textable. If not, see <http://www.gnu.org/licenses/>.
 """
 
-__version__ = u'1.0.8'
+__version__ = u'1.0.10'
 __author__ = "Mahtab Mohammadi"
 __maintainer__ = "LangTech Sarl"
 
@@ -81,6 +81,10 @@ class OWTextableCooccurrence(OWTextableBaseWidget):
     want_main_area = False
     resizing_enabled = False
 
+    # Reuse the result of previous runs with the same input and settings
+    # (see OWTextableBaseWidget.getMemoKey)...
+    memoizeResults = True
+
     def __init__(self):
         """Initialize a Cooccurrence widget"""
         super().__init__()
@@ -325,6 +329,9 @@ class OWTextableCooccurrence(OWTextableBaseWidget):
             )
         )
 
+        # Profiling box
+        self.create_profilingBox()
+
         gui.rubber(self.controlArea)
 
         # Send button & Info box
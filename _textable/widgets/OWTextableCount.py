@@ -18,7 +18,7 @@ You should have received a copy of the GNU General Public License
 along with Orange3-Textable. If not, see <http://www.gnu.org/licenses/>.
 """
 
-__version__ = '0.21.11'
+__version__ = '0.21.15'
 
 
 from LTTL.TableThread import IntPivotCrosstab
@@ -28,7 +28,8 @@ import LTTL.ProcessorThread as Processor
 from _textable.widgets.TextableUtils import (
     OWTextableBaseWidget,
     InfoBox, SendButton, updateMultipleInputs, pluralize,
-    SegmentationListContextHandler, SegmentationsInputList, Task
+    SegmentationListContextHandler, SegmentationsInputList, Task,
+    DEBOUNCE_INTERVAL,
 )
 
 import Orange
@@ -78,9 +79,16 @@ class OWTextableCount(OWTextableBaseWidget):
     _contexts = settings.ContextSetting(-1)
     contextAnnotationKey = settings.ContextSetting(u'(none)')
 
+    # Milliseconds without changes before automatic sending...
+    debounceInterval = settings.Setting(DEBOUNCE_INTERVAL, schema_only=True)
+
     want_main_area = False
     resizing_enabled = False
 
+    # Reuse the result of previous runs with the same input and settings
+    # (see OWTextableBaseWidget.getMemoKey)...
+    memoizeResults = True
+
     def __init__(self, *args, **kwargs):
         """Initialize a Count widget"""
         super().__init__(*args, **kwargs)
@@ -99,6 +107,8 @@ class OWTextableCount(OWTextableBaseWidget):
             buttonLabel=u'Send',
             checkboxLabel=u'Send automatically',
             sendIfPreCallback=self.updateGUI,
+            # Wait for bursts of setting changes to end before running...
+            debounceInterval=self.debounceInterval,
         )
 
         # GUI...
@@ -348,6 +358,16 @@ class OWTextableCount(OWTextableBaseWidget):
             ),
         )
 
+        # Options box...
+        self.optionsBox = self.create_widgetbox(
+            box=u'Options',
+            orientation='vertical',
+        )
+        self.create_debounceSpin(self.optionsBox)
+
+        # Profiling box
+        self.create_profilingBox()
+
         gui.rubber(self.controlArea)
 
         # Send button & Info box
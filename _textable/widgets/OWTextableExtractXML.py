@@ -18,7 +18,7 @@ You should have received a copy of the GNU General Public License
 along with Orange3-Textable. If not, see <http://www.gnu.org/licenses/>.
 """
 
-__version__ = '0.15.11'
+__version__ = '0.15.13'
 
 import re
 
@@ -74,6 +74,10 @@ class OWTextableExtractXML(OWTextableBaseWidget):
     want_main_area = False
     resizing_enabled = False
 
+    # Reuse the result of previous runs with the same input and settings
+    # (see OWTextableBaseWidget.getMemoKey)...
+    memoizeResults = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -432,6 +436,9 @@ class OWTextableExtractXML(OWTextableBaseWidget):
         )
         self.advancedSettings.basicWidgets.append(self.basicXmlExtractionBox)
 
+        # Profiling box (advanced settings)
+        self.create_profilingBox()
+
         gui.rubber(self.controlArea)
 
         # Send button & Info box
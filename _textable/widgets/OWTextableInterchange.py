@@ -18,7 +18,7 @@ You should have received a copy of the GNU General Public License
 along with Orange3-Textable. If not, see <http://www.gnu.org/licenses/>.
 """
 
-__version__ = '0.1.5'
+__version__ = '0.1.6'
 
 
 from LTTL.Segment import Segment
@@ -28,9 +28,9 @@ from _textable.widgets.TextableUtils import (
     OWTextableBaseWidget, VersionedSettingsHandler, ProgressBar,
     SendButton, InfoBox, pluralize
 )
+from _textable.widgets.TextableInterchange import segmentationToTable
 
 from Orange.widgets import gui, settings
-from Orange.data import DiscreteVariable, StringVariable, Domain, Table
 from Orange.widgets.widget import Input, Output
 from Orange.widgets.utils.widgetpreview import WidgetPreview
 
@@ -247,52 +247,17 @@ class OWTextableInterchange(OWTextableBaseWidget):
 
         # Convert segmentation to corpus...
         if self.segmentation:
-            metas = list()
-            attributes = list()
-            meta_keys = list()
-            attribute_keys = list()
-            for key in self.segmentation.get_annotation_keys():
-                possible_values = set()
-                for segment in self.segmentation:
-                    try:
-                        possible_values.add(str(segment.annotations[key]))
-                    except KeyError:
-                        pass
-                if (
-                    self.limitNumCategories
-                    and len(possible_values) > self.maxNumCategories
-                ):
-                    metas.append(StringVariable(key))
-                    meta_keys.append(key)
-                else:
-                    attributes.append(
-                        DiscreteVariable(key, values=list(possible_values))
-                    )
-                    attribute_keys.append(key)
-            metas.append(StringVariable("textable_text"))
-            domain = Domain(attributes, [], metas)
-            rows = list()
-            for segment in self.segmentation:
-                row = [
-                    str(segment.annotations.get(annotation_key, None))
-                    for annotation_key in attribute_keys
-                ]
-                row.extend(
-                    [
-                        str(segment.annotations.get(annotation_key, None))
-                        for annotation_key in meta_keys
-                    ]
-                )
-                row.append(segment.get_content())
-                rows.append(row)
-                progressBar.advance
-            table = Table(domain, rows)
+            table = segmentationToTable(
+                self.segmentation,
+                self.maxNumCategories if self.limitNumCategories else None,
+                progressBar.advance,
+            )
             if textMiningIsInstalled:
                 corpus = Corpus(
-                    domain,
+                    table.domain,
                     X=table.X,
                     metas=table.metas,
-                    text_features=[metas[-1]]
+                    text_features=[table.domain.metas[-1]]
                 )
             msg_corpus = u'%i document@p' % len(self.segmentation)
             msg_corpus = pluralize(msg_corpus, len(self.segmentation))
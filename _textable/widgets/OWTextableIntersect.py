@@ -18,7 +18,7 @@ You should have received a copy of the GNU General Public License
 along with Orange3-Textable. If not, see <http://www.gnu.org/licenses/>.
 """
 
-__version__ = "0.15.6"
+__version__ = "0.15.8"
 
 import LTTL.SegmenterThread as Segmenter
 from LTTL.Segmentation import Segmentation
@@ -74,6 +74,10 @@ class OWTextableIntersect(OWTextableBaseWidget):
 
     want_main_area = False
     resizing_enabled = False
+
+    # Reuse the result of previous runs with the same input and settings
+    # (see OWTextableBaseWidget.getMemoKey)...
+    memoizeResults = True
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -280,6 +284,9 @@ class OWTextableIntersect(OWTextableBaseWidget):
         )
         self.advancedSettings.basicWidgets.append(self.basicIntersectBox)
 
+        # Profiling box (advanced settings)
+        self.create_profilingBox()
+
         gui.rubber(self.controlArea)
 
         # Send button & Infobox
@@ -18,7 +18,7 @@ You should have received a copy of the GNU General Public License
 along with Orange3-Textable. If not, see <http://www.gnu.org/licenses/>.
 """
 
-__version__ = '0.14.9'
+__version__ = '0.14.11'
 
 
 from LTTL.TableThread import Table
@@ -75,6 +75,10 @@ class OWTextableLength(OWTextableBaseWidget):
     want_main_area = False
     resizing_enabled = False
 
+    # Reuse the result of previous runs with the same input and settings
+    # (see OWTextableBaseWidget.getMemoKey)...
+    memoizeResults = True
+
     def __init__(self, *args, **kwargs):
         """Initialize a Length widget"""
         super().__init__(*args, **kwargs)
@@ -276,6 +280,9 @@ class OWTextableLength(OWTextableBaseWidget):
             ),
         )
 
+        # Profiling box
+        self.create_profilingBox()
+
         gui.rubber(self.controlArea)
 
         # Send button & Info box
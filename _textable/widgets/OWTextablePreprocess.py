@@ -18,7 +18,7 @@ You should have received a copy of the GNU General Public License
 along with Orange3-Textable. If not, see <http://www.gnu.org/licenses/>.
 """
 
-__version__ = '0.11.8'
+__version__ = '0.11.10'
 
 import LTTL.SegmenterThread as Segmenter
 from LTTL.Segmentation import Segmentation
@@ -62,6 +62,10 @@ class OWTextablePreprocess(OWTextableBaseWidget, openclass=True):
     want_main_area = False
     resizing_enabled = False
 
+    # Reuse the result of previous runs with the same input and settings
+    # (see OWTextableBaseWidget.getMemoKey)...
+    memoizeResults = True
+
     def __init__(self, *args, **kwargs):
         """Initialize a Preprocess widget"""
         super().__init__(*args, **kwargs)
@@ -135,6 +139,9 @@ class OWTextablePreprocess(OWTextableBaseWidget, openclass=True):
             ),
         )
 
+        # Profiling box
+        self.create_profilingBox()
+
         gui.rubber(self.controlArea)
 
         # Send button and Info box
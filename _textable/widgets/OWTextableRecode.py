@@ -18,7 +18,7 @@ You should have received a copy of the GNU General Public License
 along with Orange3-Textable. If not, see <http://www.gnu.org/licenses/>.
 """
 
-__version__ = '0.13.13'
+__version__ = '0.13.15'
 
 import os, re, codecs, json
 
@@ -70,6 +70,10 @@ class OWTextableRecode(OWTextableBaseWidget):
     want_main_area = False
     resizing_enabled = False
 
+    # Reuse the result of previous runs with the same input and settings
+    # (see OWTextableBaseWidget.getMemoKey)...
+    memoizeResults = True
+
     def __init__(self, *args, **kwargs):
 
         """Initialize a Recode widget"""
@@ -357,6 +361,9 @@ class OWTextableRecode(OWTextableBaseWidget):
         )
         self.advancedSettings.basicWidgets.append(self.basicSubstBox)
 
+        # Profiling box (advanced settings)
+        self.create_profilingBox()
+
         gui.rubber(self.controlArea)
 
         # Send button and Info box
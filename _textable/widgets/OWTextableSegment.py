@@ -18,7 +18,7 @@ You should have received a copy of the GNU General Public License
 along with Orange3-Textable. If not, see <http://www.gnu.org/licenses/>.
 """
 
-__version__ = '0.21.13'
+__version__ = '0.21.17'
 
 import os, re, codecs, json
 
@@ -30,7 +30,8 @@ from LTTL.Segmentation import Segmentation
 from _textable.widgets.TextableUtils import (
     OWTextableBaseWidget, VersionedSettingsHandler,
     JSONMessage, InfoBox, SendButton, AdvancedSettings,
-    normalizeCarriageReturns, pluralize, ExpandableOrangeLineEdit, Task
+    normalizeCarriageReturns, pluralize, ExpandableOrangeLineEdit, Task,
+    DEBOUNCE_INTERVAL,
 )
 
 import Orange
@@ -72,9 +73,16 @@ class OWTextableSegment(OWTextableBaseWidget):
     regex = settings.Setting(u'')
     mode = settings.Setting(u'Tokenize')
 
+    # Milliseconds without changes before automatic sending...
+    debounceInterval = settings.Setting(DEBOUNCE_INTERVAL, schema_only=True)
+
     want_main_area = False
     resizing_enabled = False
 
+    # Reuse the result of previous runs with the same input and settings
+    # (see OWTextableBaseWidget.getMemoKey)...
+    memoizeResults = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         
@@ -99,6 +107,8 @@ class OWTextableSegment(OWTextableBaseWidget):
             cancelCallback=manualCancel, # Manual cancel button
             infoBoxAttribute='infoBox',
             sendIfPreCallback=self.updateGUI,
+            # Wait for bursts of setting changes to end before running...
+            debounceInterval=self.debounceInterval,
         )
         self.advancedSettings = self.create_advancedSettings()
 
@@ -413,6 +423,7 @@ class OWTextableSegment(OWTextableBaseWidget):
                 u"application) will be kept."
             ),
         )
+        self.create_debounceSpin(self.optionsBox)
         self.advancedSettings.advancedWidgets.append(self.optionsBox)
 
         # (Basic) Regex box...
@@ -461,6 +472,9 @@ class OWTextableSegment(OWTextableBaseWidget):
 
         self.advancedSettings.basicWidgets.append(self.basicRegexBox)
 
+        # Profiling box (advanced settings)
+        self.create_profilingBox()
+
         gui.rubber(self.controlArea)
 
         # Send button & Info box
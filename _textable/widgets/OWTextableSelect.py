@@ -20,7 +20,7 @@ along with Orange3-Textable. If not, see <http://www.gnu.org/licenses/>.
 
 from __future__ import division
 
-__version__ = '0.14.12'
+__version__ = '0.14.14'
 
 import re, math
 
@@ -90,6 +90,10 @@ class OWTextableSelect(OWTextableBaseWidget):
     want_main_area = False
     resizing_enabled = False
 
+    # Reuse the result of previous runs with the same input and settings
+    # (see OWTextableBaseWidget.getMemoKey)...
+    memoizeResults = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -550,6 +554,9 @@ class OWTextableSelect(OWTextableBaseWidget):
         )
         self.advancedSettings.basicWidgets.append(self.basicSelectBox)
 
+        # Profiling box (advanced settings)
+        self.create_profilingBox()
+
         gui.rubber(self.controlArea)
 
         # Send button & Info box
@@ -577,6 +584,12 @@ class OWTextableSelect(OWTextableBaseWidget):
             self.Outputs.discarded_data.send(None)
 
 
+    def getMemoKey(self, function):
+        """Don't memoize random samples (see OWTextableBaseWidget)"""
+        if getattr(function, 'func', None) is Segmenter.sample:
+            return None
+        return super().getMemoKey(function)
+
     def sendData(self):
         """(Have LTTL.Segmenter) perform the actual selection"""
 
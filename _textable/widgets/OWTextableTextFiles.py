@@ -18,23 +18,23 @@ You should have received a copy of the GNU General Public License
 along with Orange3-Textable. If not, see <http://www.gnu.org/licenses/>.
 """
 
-__version__ = '0.17.14'
+__version__ = '0.17.27'
 
 
 import codecs
 import os
 import re
 import json
-from unicodedata import normalize
+import collections
+import concurrent.futures
 
 from AnyQt.QtCore import QTimer
 from AnyQt.QtGui import QFont
 from AnyQt.QtWidgets import QFileDialog, QMessageBox
 
-from chardet.universaldetector import UniversalDetector
-
 from LTTL.Segmentation import Segmentation
 from LTTL.Input import Input as LTTL_Input
+from LTTL.Segment import Segment
 import LTTL.SegmenterThread as Segmenter
 
 from _textable.widgets.TextableUtils import (
@@ -43,6 +43,11 @@ from _textable.widgets.TextableUtils import (
     addSeparatorAfterDefaultEncodings, addAutoDetectEncoding,
     getPredefinedEncodings, normalizeCarriageReturns, pluralize, Task
 )
+from _textable.widgets.TextableIO import (
+    readTextFile, getFileCacheKey, getCacheDirectory, TextFileCache,
+    DirectoryFiles, FileReaderPool, ReadCancelled, readArchive,
+    getArchiveType, MemoryMonitor, getCurrentMonitor
+)
 
 from Orange.widgets import widget, gui, settings
 from Orange.widgets.widget import Input, Output
@@ -51,9 +56,6 @@ from Orange.widgets.utils.widgetpreview import WidgetPreview
 # Threading
 from functools import partial
 
-CHUNK_LENGTH = 1000000
-CHUNK_NUM = 100
-
 
 class OWTextableTextFiles(OWTextableBaseWidget):
     """Orange widget for loading text files"""
@@ -83,6 +85,20 @@ class OWTextableTextFiles(OWTextableBaseWidget):
     lastLocation = settings.Setting('.')
     displayAdvancedSettings = settings.Setting(False)
     file = settings.Setting(u'')
+    numWorkers = settings.Setting(1)
+    useCache = settings.Setting(False)
+    cacheSize = settings.Setting(1024)
+    importEncodings = settings.Setting(False)
+    importEncodingsKey = settings.Setting(u'encoding')
+    detectionSampleSize = settings.Setting(64)
+    useDirectory = settings.Setting(False)
+    directory = settings.Setting(u'')
+    includePatterns = settings.Setting(u'*.txt')
+    excludePatterns = settings.Setting(u'')
+    relativePathKey = settings.Setting(u'path')
+    archiveMembers = settings.Setting(u'')
+    importMemberPaths = settings.Setting(True)
+    importMemberPathsKey = settings.Setting(u'member')
 
     want_main_area = False
     resizing_enabled = False
@@ -92,11 +108,17 @@ class OWTextableTextFiles(OWTextableBaseWidget):
 
         # Other attributes...
         self.createdInputs = list()
+        self.retainedInputs = dict()
+        self.detectedEncodings = dict()
         self.fileLabels = list()
         self.selectedFileLabels = list()
         self.newFiles = u''
         self.newAnnotationKey = u''
         self.newAnnotationValue = u''
+        self.ingestionCache = None
+        self.cacheHits = 0
+        self.cacheMisses = 0
+        self.peakMemoryIncrease = None
         self.infoBox = InfoBox(widget=self.controlArea)
         self.sendButton = SendButton(
             widget=self.controlArea,
@@ -173,7 +195,7 @@ class OWTextableTextFiles(OWTextableBaseWidget):
             orientation='vertical',
             )
 
-        fileBoxLine1 = gui.widgetBox(
+        self.fileListBox = fileBoxLine1 = gui.widgetBox(
             widget=self.fileBox,
             box=False,
             orientation='horizontal',
@@ -265,7 +287,7 @@ class OWTextableTextFiles(OWTextableBaseWidget):
             orientation='vertical',
         )
         # Add file box
-        addFileBox = gui.widgetBox(
+        self.addFileBox = addFileBox = gui.widgetBox(
             widget=fileBoxLine2,
             box=True,
             orientation='vertical',
@@ -363,6 +385,118 @@ class OWTextableTextFiles(OWTextableBaseWidget):
                 u"assigned a different encoding and annotation."
             ),
         )
+        # Directory box
+        directoryBox = gui.widgetBox(
+            widget=fileBoxLine2,
+            box=True,
+            orientation='vertical',
+        )
+        gui.checkBox(
+            widget=directoryBox,
+            master=self,
+            value='useDirectory',
+            label=u'Import files from directory instead of list',
+            callback=self.sendButton.settingsChanged,
+            tooltip=(
+                u"Import all files in a directory (and its\n"
+                u"subdirectories) that match the patterns below,\n"
+                u"rather than the files in the list above.\n\n"
+                u"Files are enumerated when data is sent, in the\n"
+                u"order of their paths, so that the widget can be\n"
+                u"pointed at very large directory trees."
+            ),
+        )
+        self.directoryOptionsBox = gui.widgetBox(
+            widget=directoryBox,
+            orientation='vertical',
+        )
+        directoryBoxLine1 = gui.widgetBox(
+            widget=self.directoryOptionsBox,
+            orientation='horizontal',
+        )
+        gui.lineEdit(
+            widget=directoryBoxLine1,
+            master=self,
+            value='directory',
+            orientation='horizontal',
+            label=u'Directory:',
+            labelWidth=101,
+            callback=self.sendButton.settingsChanged,
+            tooltip=(
+                u"The path of the directory whose files will be\n"
+                u"imported."
+            ),
+        )
+        gui.button(
+            widget=directoryBoxLine1,
+            master=self,
+            label=u'Browse',
+            callback=self.browseDirectory,
+            tooltip=(
+                u"Open a dialog for selecting a directory."
+            ),
+        )
+        gui.lineEdit(
+            widget=self.directoryOptionsBox,
+            master=self,
+            value='includePatterns',
+            orientation='horizontal',
+            label=u'Include:',
+            labelWidth=101,
+            callback=self.sendButton.settingsChanged,
+            tooltip=(
+                u"Glob patterns (such as '*.txt') for the files to\n"
+                u"be imported; leave empty to import all files.\n\n"
+                u"Successive patterns must be separated with ' / '\n"
+                u"(whitespace + slash + whitespace). Patterns that\n"
+                u"contain a slash are matched against paths relative\n"
+                u"to the directory (e.g. 'novels/*.txt'), others\n"
+                u"against file names."
+            ),
+        )
+        gui.lineEdit(
+            widget=self.directoryOptionsBox,
+            master=self,
+            value='excludePatterns',
+            orientation='horizontal',
+            label=u'Exclude:',
+            labelWidth=101,
+            callback=self.sendButton.settingsChanged,
+            tooltip=(
+                u"Glob patterns for the files and subdirectories\n"
+                u"that must not be imported (same syntax as above)."
+            ),
+        )
+        directoryEncodingsCombobox = gui.comboBox(
+            widget=self.directoryOptionsBox,
+            master=self,
+            value='encoding',
+            items=getPredefinedEncodings(),
+            sendSelectedValue=True,
+            orientation='horizontal',
+            label=u'Encoding:',
+            labelWidth=101,
+            callback=self.sendButton.settingsChanged,
+            tooltip=(
+                u"Select input files encoding."
+            ),
+        )
+        addSeparatorAfterDefaultEncodings(directoryEncodingsCombobox)
+        addAutoDetectEncoding(directoryEncodingsCombobox)
+        gui.lineEdit(
+            widget=self.directoryOptionsBox,
+            master=self,
+            value='relativePathKey',
+            orientation='horizontal',
+            label=u'Path key:',
+            labelWidth=101,
+            callback=self.sendButton.settingsChanged,
+            tooltip=(
+                u"Annotation key for importing the path of each\n"
+                u"file relative to the directory (leave empty to\n"
+                u"skip this annotation)."
+            ),
+        )
         self.advancedSettings.advancedWidgets.append(self.fileBox)
 
         # Options box...
@@ -423,8 +557,156 @@ class OWTextableTextFiles(OWTextableBaseWidget):
                 u"Annotation key for file auto-numbering."
             ),
         )
+        optionsBoxLine5 = gui.widgetBox(
+            widget=self.optionsBox,
+            box=False,
+            orientation='horizontal',
+        )
+        gui.checkBox(
+            widget=optionsBoxLine5,
+            master=self,
+            value='importMemberPaths',
+            label=u'Import archive member paths with key:',
+            labelWidth=180,
+            callback=self.sendButton.settingsChanged,
+            tooltip=(
+                u"Import the path of each file extracted from an\n"
+                u"archive (zip, tar, gz, bz2 or xz) as annotations."
+            ),
+        )
+        self.importMemberPathsKeyLineEdit = gui.lineEdit(
+            widget=optionsBoxLine5,
+            master=self,
+            value='importMemberPathsKey',
+            orientation='horizontal',
+            callback=self.sendButton.settingsChanged,
+            tooltip=(
+                u"Annotation key for importing archive member paths."
+            ),
+        )
+        gui.lineEdit(
+            widget=self.optionsBox,
+            master=self,
+            value='archiveMembers',
+            orientation='horizontal',
+            label=u'Archive members:',
+            labelWidth=180,
+            callback=self.sendButton.settingsChanged,
+            tooltip=(
+                u"Glob patterns (such as '*.txt') for the files to be\n"
+                u"extracted from archives; leave empty to extract all\n"
+                u"files.\n\n"
+                u"Successive patterns must be separated with ' / '\n"
+                u"(whitespace + slash + whitespace). Patterns that\n"
+                u"contain a slash are matched against paths within\n"
+                u"the archive, others against file names."
+            ),
+        )
+        optionsBoxLine4 = gui.widgetBox(
+            widget=self.optionsBox,
+            box=False,
+            orientation='horizontal',
+        )
+        gui.checkBox(
+            widget=optionsBoxLine4,
+            master=self,
+            value='importEncodings',
+            label=u'Import encodings with key:',
+            labelWidth=180,
+            callback=self.sendButton.settingsChanged,
+            tooltip=(
+                u"Import the encoding used for decoding each file\n"
+                u"(detected or selected) as annotations."
+            ),
+        )
+        self.importEncodingsKeyLineEdit = gui.lineEdit(
+            widget=optionsBoxLine4,
+            master=self,
+            value='importEncodingsKey',
+            orientation='horizontal',
+            callback=self.sendButton.settingsChanged,
+            tooltip=(
+                u"Annotation key for importing encodings."
+            ),
+        )
+        gui.spin(
+            widget=self.optionsBox,
+            master=self,
+            value='detectionSampleSize',
+            minv=0,
+            maxv=1000000,
+            step=16,
+            orientation='horizontal',
+            label=u'Encoding detection sample (KB):',
+            labelWidth=180,
+            callback=self.sendButton.settingsChanged,
+            keyboardTracking=False,
+            tooltip=(
+                u"Number of kilobytes at the beginning of each file\n"
+                u"that are examined to detect its encoding when\n"
+                u"'(auto-detect)' is selected. If decoding the file\n"
+                u"with the detected encoding fails, detection is\n"
+                u"performed again on the whole file. Set to 0 to\n"
+                u"always examine the whole file."
+            ),
+        )
+        gui.spin(
+            widget=self.optionsBox,
+            master=self,
+            value='numWorkers',
+            minv=1,
+            maxv=os.cpu_count() or 1,
+            step=1,
+            orientation='horizontal',
+            label=u'Worker processes:',
+            labelWidth=180,
+            callback=self.sendButton.settingsChanged,
+            keyboardTracking=False,
+            tooltip=(
+                u"Number of processes that read, decode and normalize\n"
+                u"files in parallel. Files appear in the output in the\n"
+                u"same order as in the list regardless of this value."
+            ),
+        )
+        optionsBoxLine3 = gui.widgetBox(
+            widget=self.optionsBox,
+            box=False,
+            orientation='horizontal',
+        )
+        gui.checkBox(
+            widget=optionsBoxLine3,
+            master=self,
+            value='useCache',
+            label=u'Cache imported files, max. size (MB):',
+            labelWidth=180,
+            callback=self.sendButton.settingsChanged,
+            tooltip=(
+                u"Keep a copy of the decoded and normalized content of\n"
+                u"imported files on disk, so that files that haven't\n"
+                u"changed since they were last imported needn't be\n"
+                u"decoded again. Least recently used files are removed\n"
+                u"from the cache when it exceeds the specified size."
+            ),
+        )
+        self.cacheSizeSpin = gui.spin(
+            widget=optionsBoxLine3,
+            master=self,
+            value='cacheSize',
+            minv=1,
+            maxv=1000000,
+            step=100,
+            orientation='horizontal',
+            callback=self.sendButton.settingsChanged,
+            keyboardTracking=False,
+            tooltip=(
+                u"Maximum size of the cache of imported files (in MB)."
+            ),
+        )
         self.advancedSettings.advancedWidgets.append(self.optionsBox)
 
+        # Profiling box (advanced settings)
+        self.create_profilingBox()
+
         gui.rubber(self.controlArea)
 
         # Send button & Info box
@@ -446,164 +728,245 @@ class OWTextableTextFiles(OWTextableBaseWidget):
                 numChars += segmentLength
             message += u'(%i character@p).' % numChars
             message = pluralize(message, numChars)
+            if self.useCache:
+                message += u' Cache: %i hit@p, ' % self.cacheHits
+                message = pluralize(message, self.cacheHits)
+                message += u'%i miss@p.' % self.cacheMisses
+                message = pluralize(message, self.cacheMisses, u'es')
+            if self.peakMemoryIncrease is not None:
+                message += u' Peak memory increase: %i MB.' % (
+                    self.peakMemoryIncrease // 2**20
+                )
             self.infoBox.setText(message)
             if len(processed_data):
                 self.Outputs.text_data.send(processed_data)
             else:
                 self.sendNoneToOutputs()
             
-    def process_data(self, myFiles):
+    def process_data(self, myFiles, cancelToken=None):
         """ Process data in a worker thread
         instead of the main thread so that
-        the operations can be cancelled """
+        the operations can be cancelled
+
+        The increase of the memory used by the process while files are
+        imported is recorded in peakMemoryIncrease (see importFiles for
+        other details).
+        """
+        # (The monitor of the task is used if there is one, see
+        # TaskTelemetry.)
+        monitor = getCurrentMonitor() or MemoryMonitor()
+        try:
+            with monitor:
+                return self.importFiles(myFiles, cancelToken)
+        finally:
+            self.peakMemoryIncrease = monitor.peakIncrease
+
+    def importFiles(self, myFiles, cancelToken=None):
+        """Import files and return their segmentation (or None)
+
+        myFiles is either a list of file entries or a DirectoryFiles
+        instance, whose entries are enumerated lazily (once for measuring
+        their total size and once for reading them). Cancelling
+        cancelToken stops worker processes from reading files at once.
+        """
         
         # Emit 1%
         self.signal_prog.emit(1, False)
         
-        # Progress bar
-        max_itr = len(myFiles)
-        cur_itr = 1
-
-        fileContents = list()
-        annotations = list()
-        counter = 1
-    
-        # Open and process each file successively...
+        # Progress bar (measured in bytes read, each file counting for at
+        # least one byte)...
+        numFiles = 0
+        totalBytes = 0
         for myFile in myFiles:
-            filePath = myFile[0]
-            encoding = myFile[1]
-            encoding = re.sub(r"[ ]\(.+", "", encoding)
-            annotation_key = myFile[2]
-            annotation_value = myFile[3]
-
-            # Try to open the file...
-            self.error()
-
+            numFiles += 1
             try:
-                if encoding == "(auto-detect)":
-                    detector = UniversalDetector()
-                    fh = open(filePath, 'rb')
-                    for line in fh:
-                        detector.feed(line)
-                        if detector.done: break
-                    detector.close()
-                    fh.close()
-                    encoding = detector.result['encoding']
-                fh = open(
-                    filePath,
-                    mode='r',
-                    encoding=encoding,
-                )
-                try:
-                    fileContent = ""
-                    i = 0
-                    chunks = list()
-                    for chunk in iter(lambda: fh.read(CHUNK_LENGTH), ""):
-                        chunks.append('\n'.join(chunk.splitlines()))
-                        i += CHUNK_LENGTH
-                        if i % (CHUNK_NUM * CHUNK_LENGTH) == 0:
-                            fileContent += "".join(chunks)
-                            chunks = list()
-                    if len(chunks):
-                        fileContent += "".join(chunks)
-                    del chunks
-
-                except UnicodeError:
-                    if len(myFiles) > 1:
-                        message = u"Please select another encoding "    \
-                                  + u"for file %s." % filePath
-                    else:
-                        message = u"Please select another encoding."
-                    
-                    # Emit message
-                    self.signal_text.emit(message, 'error')
-                    
-                    # Emit finished
-                    self.signal_prog.emit(100, False)
-                    
-                    # Send None
-                    self.sendNoneToOutputs()
-                    
-                    return
+                totalBytes += os.path.getsize(myFile[0]) + 1
+            except OSError:
+                totalBytes += 1
+            if self.cancel_operation:
+                self.signal_prog.emit(100, False)
+                return
+        readBytes = 0
+        progress = 1
+
+        def addReadBytes(numBytes):
+            """Update progress bar and check for cancellation"""
+            nonlocal readBytes, progress
+            readBytes += numBytes
+            newProgress = min(int(100*readBytes/totalBytes), 100)
+            if newProgress > progress:
+                progress = newProgress
+                self.signal_prog.emit(progress, False)
+            if self.cancel_operation:
+                raise ReadCancelled()
 
-                finally:
-                    fh.close()
+        if numFiles == 0:
+            self.signal_text.emit(
+                u"No file matches the specified patterns.", 'warning'
+            )
+            self.signal_prog.emit(100, False)
+            self.sendNoneToOutputs()
+            return
 
-            except IOError:
-                if len(myFiles) > 1:
-                    message = u"Couldn't open file '%s'." % filePath
+        createdInputs = list()
+        newInputs = list()
+        annotations = list()
+        keys = set()
+        counter = 1
+        completed = False
+
+        # Open and process each file successively (or in parallel), reusing
+        # the Inputs of files that haven't changed since a previous run...
+        results = self.readFiles(
+            myFiles, numFiles, addReadBytes, cancelToken
+        )
+        try:
+            for myFile, key, getResult in results:
+                filePath = myFile[0]
+                annotation_key = myFile[2]
+                annotation_value = myFile[3]
+                keys.add(key)
+
+                # Reuse the Inputs created in a previous run if possible...
+                if key in self.retainedInputs:
+                    members = self.retainedInputs[key]
+                    addReadBytes(key[2])
+
+                # Otherwise try to open the file...
                 else:
-                    message = u"Couldn't open file."
-                
-                # Emit message
-                self.signal_text.emit(message, 'error')
-                
-                # Emit finished
-                self.signal_prog.emit(100, False)
-                
-                # Send None
-                self.sendNoneToOutputs()
+                    self.error()
 
-                return
+                    try:
+                        result = getResult()
 
-            # Remove utf-8 BOM if necessary...
-            if encoding == u'utf-8':
-                fileContent = fileContent.lstrip(
-                    codecs.BOM_UTF8.decode('utf-8')
-                )
+                    except UnicodeError:
+                        if numFiles > 1:
+                            message = u"Please select another encoding "    \
+                                      + u"for file %s." % filePath
+                        else:
+                            message = u"Please select another encoding."
+                        
+                        # Emit message
+                        self.signal_text.emit(message, 'error')
+                        
+                        # Emit finished
+                        self.signal_prog.emit(100, False)
+                        
+                        # Send None
+                        self.sendNoneToOutputs()
+                        
+                        return
+
+                    except IOError:
+                        if numFiles > 1:
+                            message = u"Couldn't open file '%s'." % filePath
+                        else:
+                            message = u"Couldn't open file."
+                        
+                        # Emit message
+                        self.signal_text.emit(message, 'error')
+                        
+                        # Emit finished
+                        self.signal_prog.emit(100, False)
+                        
+                        # Send None
+                        self.sendNoneToOutputs()
+
+                        return
+
+                    # Create an LTTL.Input for the file (or for each of
+                    # its members if it is an archive)...
+                    members = [
+                        (LTTL_Input(fileContent, None), encoding, memberPath)
+                        for fileContent, encoding, memberPath in result
+                    ]
+                    del result
+                    newInputs.extend(myInput for myInput, _, _ in members)
+                    if key is not None:
+                        self.retainedInputs[key] = members
+
+                # Annotations...
+                for myInput, encoding, memberPath in members:
+                    createdInputs.append(myInput)
+                    annotation = dict()
+                    if self.displayAdvancedSettings:
+                        if annotation_key and annotation_value:
+                            annotation[annotation_key] = annotation_value
+                        if self.importFilenames and self.importFilenamesKey:
+                            filename = os.path.basename(filePath)
+                            annotation[self.importFilenamesKey] = filename
+                        if len(myFile) > 4 and self.relativePathKey:
+                            annotation[self.relativePathKey] = myFile[4]
+                        if (
+                            memberPath is not None and
+                            self.importMemberPaths and
+                            self.importMemberPathsKey
+                        ):
+                            annotation[self.importMemberPathsKey] = memberPath
+                        if self.importEncodings and self.importEncodingsKey:
+                            annotation[self.importEncodingsKey] = encoding
+                        if self.autoNumber and self.autoNumberKey:
+                            annotation[self.autoNumberKey] = counter
+                            counter += 1
+                    annotations.append(annotation)
+
+                # Update progress bar manually (and cancel operation if
+                # requested by user)
+                addReadBytes(1)
+            completed = True
+
+        # Cancelled while reading a file or waiting for a worker process...
+        except ReadCancelled:
+            self.signal_prog.emit(100, False)
+            return
 
-            # Normalize text (canonical decomposition then composition)...
-            fileContent = normalize('NFC', fileContent)
-
-            fileContents.append(fileContent)
-
-            # Annotations...
-            annotation = dict()
-            if self.displayAdvancedSettings:
-                if annotation_key and annotation_value:
-                    annotation[annotation_key] = annotation_value
-                if self.importFilenames and self.importFilenamesKey:
-                    filename = os.path.basename(filePath)
-                    annotation[self.importFilenamesKey] = filename
-                if self.autoNumber and self.autoNumberKey:
-                    annotation[self.autoNumberKey] = counter
-                    counter += 1
-            annotations.append(annotation)
-
-            # Update progress bar manually
-            self.signal_prog.emit(int(100*cur_itr/max_itr), False)
-            cur_itr += 1
-            
-            # Cancel operation if requested by uers
-            if self.cancel_operation:
-                self.signal_prog.emit(100, False)
-                return
+        finally:
+            results.close()
+            if not completed:
+                self.releaseInterruptedInputs(myFiles, keys, newInputs)
+
+        # Release Inputs of files that are no longer in the list...
+        for key in set(self.retainedInputs) - keys:
+            for myInput, _, _ in self.retainedInputs.pop(key):
+                Segmentation.set_data(myInput[0].str_index, None)
+        inUse = set(id(myInput) for myInput in createdInputs)
+        for myInput in self.createdInputs:
+            if id(myInput) not in inUse:
+                Segmentation.set_data(myInput[0].str_index, None)
+        self.createdInputs = createdInputs
+
+        if not createdInputs:
+            self.signal_text.emit(
+                u"No archive member matches the specified patterns.",
+                'warning'
+            )
+            self.signal_prog.emit(100, False)
+            self.sendNoneToOutputs()
+            return
 
-        # Create an LTTL.Input for each file...
-        if len(fileContents) == 1:
-            label = self.captionTitle
-        else:
-            label = None
-        for index in range(len(fileContents)):
-            myInput = LTTL_Input(fileContents[index], label)
-            segment = myInput[0]
-            segment.annotations.update(annotations[index])
-            myInput[0] = segment
-            self.createdInputs.append(myInput)
+        # Annotate a segment covering each Input (retained Inputs are never
+        # modified, so that they can be reused in later runs)...
+        pieces = [
+            Segmentation(
+                [Segment(myInput[0].str_index, annotations=annotation)]
+            )
+            for myInput, annotation in zip(createdInputs, annotations)
+        ]
 
         # Update infobox and reset progress bar
         self.signal_text.emit(u"Step 2/2: Post-processing...", "warning")
         self.signal_prog.emit(1, True)
 
-        # If there's only one file, the widget's output is the created Input.
-        if len(fileContents) == 1:
-            return self.createdInputs[0]
+        # If there's only one file, the widget's output is its segment.
+        if len(pieces) == 1:
+            pieces[0].label = self.captionTitle
+            return pieces[0]
 
         # Otherwise the widget's output is a concatenation...        
         else:
             return Segmenter.concatenate(
                 caller=self,
-                segmentations=self.createdInputs,
+                segmentations=pieces,
                 label=self.captionTitle,
                 copy_annotations=True,
                 import_labels_as=None,
@@ -612,12 +975,204 @@ class OWTextableTextFiles(OWTextableBaseWidget):
                 merge_duplicates=False,
             ) 
 
+    def releaseInterruptedInputs(self, myFiles, keys, newInputs):
+        """Release Inputs after an import was interrupted (by an error or
+        cancellation)
+
+        Inputs created by the interrupted import are released, as well as
+        retained Inputs of files that are no longer in the list or that
+        were found to have changed (keys are those of the files reached
+        before the interruption). Retained Inputs of other files are kept,
+        since they may be reused by the next import.
+        """
+        newIds = set(id(myInput) for myInput in newInputs)
+        for myInput in newInputs:
+            Segmentation.set_data(myInput[0].str_index, None)
+        reachedPaths = set(key[1] for key in keys if key is not None)
+        try:
+            paths = set(os.path.abspath(myFile[0]) for myFile in myFiles)
+        except OSError:
+            paths = reachedPaths
+        for key, members in list(self.retainedInputs.items()):
+            if (
+                any(id(myInput) in newIds for myInput, _, _ in members)
+                or key[1] not in paths
+                or (key[1] in reachedPaths and key not in keys)
+            ):
+                del self.retainedInputs[key]
+                for myInput, _, _ in members:
+                    Segmentation.set_data(myInput[0].str_index, None)
+
+    def readFiles(self, myFiles, numFiles, onBytes, cancelToken=None):
+        """Generate a (file entry, key, getResult) triple for each file
+
+        Entries are taken lazily from myFiles, and key identifies the
+        current version of each file (it is None if the file can't be
+        accessed). Calling getResult returns a list of (content, encoding,
+        member path) triples, i.e. one for each extracted member if the
+        file is an archive and a single one (with member path None)
+        otherwise. getResult is None for files whose Inputs were retained
+        from a previous run.
+
+        While getResult runs, onBytes is called with the number of bytes
+        read each time a chunk of a file is read (or a file is retrieved
+        from the cache); it may raise ReadCancelled to interrupt reading.
+        Worker processes stop reading as soon as cancelToken (if any) is
+        cancelled.
+
+        Files other than archives are retrieved from the ingestion cache if
+        possible. Otherwise files are read in the current thread if a
+        single worker process is requested, or dispatched to a pool of
+        processes a few files ahead of the one being generated. Encodings
+        detected in previous runs are reused for files that haven't changed
+        on disk since then.
+        """
+        self.cacheHits = 0
+        self.cacheMisses = 0
+        sampleSize = self.detectionSampleSize * 1024
+        memberPatterns = tuple(
+            p for p in re.split(r' +/ +', self.archiveMembers.strip()) if p
+        )
+        cache = self.getIngestionCache()
+        pool = None
+        poolBytes = 0
+
+        def prepare(myFile):
+            encoding = re.sub(r"[ ]\(.+", "", myFile[1])
+            try:
+                key = getFileCacheKey(myFile[0], encoding)
+                # Detected encodings depend on the sample size...
+                detectionKey = getFileCacheKey(myFile[0], sampleSize)
+            # Missing files are reported when they are read...
+            except OSError:
+                key = detectionKey = None
+
+            # Archives are read as a whole (and not cached on disk)...
+            if getArchiveType(myFile[0]) is not None:
+                if key is not None:
+                    key += (memberPatterns,)
+                args = (myFile[0], encoding, memberPatterns, sampleSize)
+                return key, None, None, readArchive, args
+
+            if encoding != "(auto-detect)":
+                detectionKey = None
+            known = self.detectedEncodings.get(myFile[0])
+            if detectionKey is not None and known and known[0] == detectionKey:
+                encoding = known[1]
+            args = (myFile[0], encoding, sampleSize)
+            cacheKey = key if cache is not None else None
+            return key, cacheKey, detectionKey, readTextFile, args
+
+        def reportPoolBytes():
+            nonlocal poolBytes
+            numBytes = pool.getBytesRead()
+            if numBytes > poolBytes:
+                numBytes, poolBytes = numBytes - poolBytes, numBytes
+                onBytes(numBytes)
+            elif self.cancel_operation:
+                raise ReadCancelled()
+
+        def getResultGetter(cacheKey, detectionKey, function, args, future):
+            def getResult(future=future):
+                if future is None:
+                    if cacheKey is not None:
+                        result = cache.get(cacheKey)
+                        if result is not None:
+                            self.cacheHits += 1
+                            onBytes(cacheKey[2])
+                            return [result + (None,)]
+                    if cache is not None and function is readTextFile:
+                        self.cacheMisses += 1
+                    if pool is None:
+                        return storeResult(function(*args, onChunk=onBytes))
+                    future = pool.submit(function, *args)
+                elif cache is not None and function is readTextFile:
+                    self.cacheMisses += 1
+                while not future.done():
+                    reportPoolBytes()
+                    concurrent.futures.wait([future], timeout=0.1)
+                reportPoolBytes()
+                return storeResult(future.result())
+
+            def storeResult(result):
+                if function is readArchive:
+                    return result
+                if cacheKey is not None:
+                    cache.put(cacheKey, *result)
+                if detectionKey is not None:
+                    self.detectedEncodings[args[0]] = (detectionKey, result[1])
+                return [result + (None,)]
+
+            return getResult
+
+        numWorkers = min(self.numWorkers, numFiles)
+        if not self.displayAdvancedSettings or numWorkers <= 1:
+            for myFile in myFiles:
+                key, cacheKey, detectionKey, function, args = prepare(myFile)
+                if key in self.retainedInputs:
+                    yield myFile, key, None
+                else:
+                    yield myFile, key, getResultGetter(
+                        cacheKey, detectionKey, function, args, None
+                    )
+            return
+
+        pool = FileReaderPool(numWorkers)
+        if cancelToken is not None:
+            cancelToken.onCancel(pool.cancelEvent.set)
+        pending = collections.deque()
+        try:
+            for myFile in myFiles:
+                key, cacheKey, detectionKey, function, args = prepare(myFile)
+                if key in self.retainedInputs:
+                    pending.append((myFile, key, None))
+                else:
+                    if cacheKey is not None and cacheKey in cache:
+                        future = None
+                    else:
+                        future = pool.submit(function, *args)
+                    pending.append((myFile, key, getResultGetter(
+                        cacheKey, detectionKey, function, args, future
+                    )))
+                if len(pending) > 2 * numWorkers:
+                    yield pending.popleft()
+            while pending:
+                yield pending.popleft()
+        finally:
+            pool.shutdown()
+
+    def getIngestionCache(self):
+        """Return the cache of imported files (or None if disabled)"""
+        if not self.useCache:
+            return None
+        if self.ingestionCache is None:
+            try:
+                self.ingestionCache = TextFileCache(
+                    getCacheDirectory("text_files"),
+                    self.cacheSize * 2**20,
+                )
+            except OSError:
+                return None
+        self.ingestionCache.maxSize = self.cacheSize * 2**20
+        return self.ingestionCache
+
     def sendData(self):
 
         """Load files, create and send segmentation"""
 
         # Check that there's something on input...
-        if (
+        if self.displayAdvancedSettings and self.useDirectory:
+            if not self.directory:
+                self.infoBox.setText(
+                    u'Please select input directory.', 'warning'
+                )
+                self.sendNoneToOutputs()
+                return
+            if not os.path.isdir(self.directory):
+                self.infoBox.setText(u"Couldn't open directory.", 'error')
+                self.sendNoneToOutputs()
+                return
+        elif (
             (self.displayAdvancedSettings and not self.files) or
             not (self.file or self.displayAdvancedSettings)
         ):
@@ -639,10 +1194,16 @@ class OWTextableTextFiles(OWTextableBaseWidget):
         else:
             autoNumberKey = None
 
-        # Clear created Inputs...
-        self.clearCreatedInputs()
-
-        if self.displayAdvancedSettings:
+        if self.displayAdvancedSettings and self.useDirectory:
+            includes = re.split(r' +/ +', self.includePatterns.strip())
+            excludes = re.split(r' +/ +', self.excludePatterns.strip())
+            myFiles = DirectoryFiles(
+                self.directory,
+                [p for p in includes if p],
+                [p for p in excludes if p],
+                self.encoding,
+            )
+        elif self.displayAdvancedSettings:
             myFiles = self.files
         else:
             myFiles = [[self.file, self.encoding, u'', u'']]
@@ -704,7 +1265,11 @@ class OWTextableTextFiles(OWTextableBaseWidget):
     def clearCreatedInputs(self):
         for i in self.createdInputs:
             Segmentation.set_data(i[0].str_index, None)
+        for members in self.retainedInputs.values():
+            for i, _, _ in members:
+                Segmentation.set_data(i[0].str_index, None)
         del self.createdInputs[:]
+        self.retainedInputs.clear()
 
     def importList(self):
         """Display a FileDialog and import file list"""
@@ -833,6 +1398,20 @@ class OWTextableTextFiles(OWTextableBaseWidget):
             self.updateGUI()
             self.sendButton.settingsChanged()
 
+    def browseDirectory(self):
+        """Display a FileDialog and select a directory"""
+        directory = QFileDialog.getExistingDirectory(
+            self,
+            u'Select Directory',
+            self.lastLocation,
+        )
+        if not directory:
+            return
+        self.directory = os.path.normpath(directory)
+        self.lastLocation = self.directory
+        self.updateGUI()
+        self.sendButton.settingsChanged()
+
     def moveUp(self):
         """Move file upward in Files listbox"""
         if self.selectedFileLabels:
@@ -931,6 +1510,16 @@ class OWTextableTextFiles(OWTextableBaseWidget):
                 self.importFilenamesKeyLineEdit.setDisabled(False)
             else:
                 self.importFilenamesKeyLineEdit.setDisabled(True)
+            self.importEncodingsKeyLineEdit.setDisabled(
+                not self.importEncodings
+            )
+            self.importMemberPathsKeyLineEdit.setDisabled(
+                not self.importMemberPaths
+            )
+            self.cacheSizeSpin.setDisabled(not self.useCache)
+            self.fileListBox.setDisabled(self.useDirectory)
+            self.addFileBox.setDisabled(self.useDirectory)
+            self.directoryOptionsBox.setDisabled(not self.useDirectory)
             self.updateFileBoxButtons()
             self.advancedSettings.setVisible(True)
         else:
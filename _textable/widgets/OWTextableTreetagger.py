@@ -19,7 +19,7 @@ You should have received a copy of the GNU General Public License
 along with Orange3-Textable. If not, see <http://www.gnu.org/licenses/>.
 """
 
-__version__ = u"0.1.12"
+__version__ = u"0.1.13"
 
 import os
 import re
@@ -32,6 +32,7 @@ from Orange.widgets import gui, settings
 from AnyQt.QtWidgets import QFileDialog, QMessageBox
 
 from LTTL.Segmentation import Segmentation
+from LTTL.Segment import Segment
 from LTTL.Input import Input as LTTL_Input
 import LTTL.Segmenter as Segmenter
 
@@ -237,8 +238,18 @@ class Treetagger(OWTextableBaseWidget):
                 ]
             )
 
-            segment.annotations["tt_ax"] = attr
-            copy_of_input_seg.append(segment)
+            # (Input segments are left unchanged, since they may be shared
+            # with other segmentations.)
+            annotations = dict(segment.annotations)
+            annotations["tt_ax"] = attr
+            copy_of_input_seg.append(
+                Segment(
+                    segment.str_index,
+                    segment.start,
+                    segment.end,
+                    annotations,
+                )
+            )
 
         self.progressBar.advance()
 
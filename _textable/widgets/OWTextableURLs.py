@@ -18,22 +18,22 @@ You should have received a copy of the GNU General Public License
 along with Orange3-Textable. If not, see <http://www.gnu.org/licenses/>.
 """
 
-__version__ = '0.14.14'
+__version__ = '0.14.27'
 
 import os
 import codecs
 import re
 import json
-import http
+import time
+import locale
+import hashlib
+import concurrent.futures
 from unicodedata import normalize
-from urllib.request import urlopen
 
 from AnyQt.QtCore import QTimer
 from AnyQt.QtGui import QFont
 from AnyQt.QtWidgets import QMessageBox, QFileDialog
 
-import chardet
-
 from LTTL.Segmentation import Segmentation
 from LTTL.Input import Input as LTTL_Input
 import LTTL.SegmenterThread as Segmenter
@@ -44,6 +44,10 @@ from _textable.widgets.TextableUtils import (
     addSeparatorAfterDefaultEncodings, addAutoDetectEncoding,
     normalizeCarriageReturns, getPredefinedEncodings, pluralize, Task
 )
+from _textable.widgets.TextableIO import detectEncoding, getCacheDirectory
+from _textable.widgets.TextableHTTP import (
+    URLFetcher, HTTPCache, URLArchive, describeError
+)
 
 from Orange.widgets import widget, gui, settings
 from Orange.widgets.widget import Input, Output
@@ -52,6 +56,9 @@ from Orange.widgets.utils.widgetpreview import WidgetPreview
 # Threading
 from functools import partial
 
+# Maximum number of failed URLs listed in the info box...
+MAX_LISTED_FAILURES = 5
+
 
 class OWTextableURLs(OWTextableBaseWidget):
     """Orange widget for fetching text from URLs"""
@@ -79,6 +86,24 @@ class OWTextableURLs(OWTextableBaseWidget):
     lastLocation = settings.Setting('.')
     displayAdvancedSettings = settings.Setting(False)
     URL = settings.Setting(u'')
+    importEncodings = settings.Setting(False)
+    importEncodingsKey = settings.Setting(u'encoding')
+    detectionSampleSize = settings.Setting(64)
+    maxConnections = settings.Setting(8)
+    maxConnectionsPerHost = settings.Setting(2)
+    useCache = settings.Setting(False)
+    cacheSize = settings.Setting(1024)
+    cacheMaxAge = settings.Setting(0)
+    offline = settings.Setting(False)
+    timeout = settings.Setting(30)
+    retries = settings.Setting(2)
+    skipFailedURLs = settings.Setting(False)
+    importStatus = settings.Setting(False)
+    importStatusKey = settings.Setting(u'status')
+    maxSize = settings.Setting(0)
+    keepAliveConnections = settings.Setting(2)
+    archiveMode = settings.Setting(u'None')
+    archiveFile = settings.Setting(u'')
 
     want_main_area = False
     resizing_enabled = False
@@ -89,6 +114,14 @@ class OWTextableURLs(OWTextableBaseWidget):
         # Other attributes...
         self.segmentation = None
         self.createdInputs = list()
+        self.detectedEncodings = dict()
+        self.HTTPCache = None
+        self.cacheHits = 0
+        self.cacheRevalidations = 0
+        self.cacheMisses = 0
+        self.failedURLs = list()
+        self.numOpenedConnections = 0
+        self.numReusedConnections = 0
         self.URLLabel = list()
         self.selectedURLLabel = list()
         self.newURL = u''
@@ -389,8 +422,329 @@ class OWTextableURLs(OWTextableBaseWidget):
                 u"Annotation key for URL auto-numbering."
             ),
         )
+        optionsBoxLine3 = gui.widgetBox(
+            widget=self.optionsBox,
+            box=False,
+            orientation='horizontal',
+        )
+        gui.checkBox(
+            widget=optionsBoxLine3,
+            master=self,
+            value='importEncodings',
+            label=u'Import encodings with key:',
+            labelWidth=180,
+            callback=self.sendButton.settingsChanged,
+            tooltip=(
+                u"Import the encoding used for decoding each URL\n"
+                u"(detected or selected) as annotations."
+            ),
+        )
+        self.importEncodingsKeyLineEdit = gui.lineEdit(
+            widget=optionsBoxLine3,
+            master=self,
+            value='importEncodingsKey',
+            orientation='horizontal',
+            callback=self.sendButton.settingsChanged,
+            tooltip=(
+                u"Annotation key for importing encodings."
+            ),
+        )
+        gui.spin(
+            widget=self.optionsBox,
+            master=self,
+            value='detectionSampleSize',
+            minv=0,
+            maxv=1000000,
+            step=16,
+            orientation='horizontal',
+            label=u'Encoding detection sample (KB):',
+            labelWidth=180,
+            callback=self.sendButton.settingsChanged,
+            keyboardTracking=False,
+            tooltip=(
+                u"Number of kilobytes at the beginning of each URL's\n"
+                u"content that are examined to detect its encoding\n"
+                u"when '(auto-detect)' is selected. If decoding with\n"
+                u"the detected encoding fails, detection is performed\n"
+                u"again on the whole content. Set to 0 to always\n"
+                u"examine the whole content."
+            ),
+        )
+        optionsBoxLine4 = gui.widgetBox(
+            widget=self.optionsBox,
+            box=False,
+            orientation='horizontal',
+        )
+        gui.spin(
+            widget=optionsBoxLine4,
+            master=self,
+            value='maxConnections',
+            minv=1,
+            maxv=64,
+            step=1,
+            orientation='horizontal',
+            label=u'Max. connections (total / per host):',
+            labelWidth=180,
+            callback=self.sendButton.settingsChanged,
+            keyboardTracking=False,
+            tooltip=(
+                u"Maximum number of URLs fetched at the same time.\n"
+                u"URLs appear in the output in the same order as in\n"
+                u"the list regardless of this value."
+            ),
+        )
+        gui.spin(
+            widget=optionsBoxLine4,
+            master=self,
+            value='maxConnectionsPerHost',
+            minv=1,
+            maxv=64,
+            step=1,
+            orientation='horizontal',
+            callback=self.sendButton.settingsChanged,
+            keyboardTracking=False,
+            tooltip=(
+                u"Maximum number of URLs fetched at the same time\n"
+                u"from the same host (so as not to overload servers)."
+            ),
+        )
+        gui.spin(
+            widget=self.optionsBox,
+            master=self,
+            value='keepAliveConnections',
+            minv=0,
+            maxv=64,
+            step=1,
+            orientation='horizontal',
+            label=u'Keep-alive connections per host:',
+            labelWidth=180,
+            callback=self.sendButton.settingsChanged,
+            keyboardTracking=False,
+            tooltip=(
+                u"Maximum number of connections to the same host that\n"
+                u"are kept open after a URL has been fetched, so as to\n"
+                u"be reused for the next URLs from this host (which\n"
+                u"saves the cost of establishing a connection). Set\n"
+                u"to 0 to open a new connection for each URL."
+            ),
+        )
+        optionsBoxLine5 = gui.widgetBox(
+            widget=self.optionsBox,
+            box=False,
+            orientation='horizontal',
+        )
+        gui.checkBox(
+            widget=optionsBoxLine5,
+            master=self,
+            value='useCache',
+            label=u'Cache downloaded content, max. size (MB):',
+            labelWidth=180,
+            callback=self.sendButton.settingsChanged,
+            tooltip=(
+                u"Keep a copy of the decoded content of each URL on\n"
+                u"disk. The next time the URL is imported, the server\n"
+                u"is asked whether the content has changed, and it is\n"
+                u"only downloaded (and decoded) again if so. Least\n"
+                u"recently used URLs are removed from the cache when\n"
+                u"it exceeds the specified size."
+            ),
+        )
+        self.cacheSizeSpin = gui.spin(
+            widget=optionsBoxLine5,
+            master=self,
+            value='cacheSize',
+            minv=1,
+            maxv=1000000,
+            step=100,
+            orientation='horizontal',
+            callback=self.sendButton.settingsChanged,
+            keyboardTracking=False,
+            tooltip=(
+                u"Maximum size of the cache of downloaded content (in MB)."
+            ),
+        )
+        self.cacheMaxAgeSpin = gui.spin(
+            widget=self.optionsBox,
+            master=self,
+            value='cacheMaxAge',
+            minv=0,
+            maxv=1000000,
+            step=60,
+            orientation='horizontal',
+            label=u'Use cache without checking for (min.):',
+            labelWidth=180,
+            callback=self.sendButton.settingsChanged,
+            keyboardTracking=False,
+            tooltip=(
+                u"Cached content that was downloaded (or checked)\n"
+                u"less than this number of minutes ago is used without\n"
+                u"asking the server whether it has changed. With 0, the\n"
+                u"server is always asked."
+            ),
+        )
+        self.offlineCheckBox = gui.checkBox(
+            widget=self.optionsBox,
+            master=self,
+            value='offline',
+            label=u'Offline (use cached content only)',
+            callback=self.sendButton.settingsChanged,
+            tooltip=(
+                u"Don't access the network at all: URLs are imported\n"
+                u"from the cache, regardless of its age, and URLs that\n"
+                u"aren't in the cache can't be retrieved."
+            ),
+        )
+        optionsBoxLine6 = gui.widgetBox(
+            widget=self.optionsBox,
+            box=False,
+            orientation='horizontal',
+        )
+        gui.spin(
+            widget=optionsBoxLine6,
+            master=self,
+            value='timeout',
+            minv=1,
+            maxv=3600,
+            step=5,
+            orientation='horizontal',
+            label=u'Timeout (s) / retries:',
+            labelWidth=180,
+            callback=self.sendButton.settingsChanged,
+            keyboardTracking=False,
+            tooltip=(
+                u"Number of seconds after which a server that doesn't\n"
+                u"answer (or stops sending data) is given up on."
+            ),
+        )
+        gui.spin(
+            widget=optionsBoxLine6,
+            master=self,
+            value='retries',
+            minv=0,
+            maxv=10,
+            step=1,
+            orientation='horizontal',
+            callback=self.sendButton.settingsChanged,
+            keyboardTracking=False,
+            tooltip=(
+                u"Number of times a URL is requested again after a\n"
+                u"transient failure (timeout, network error, server\n"
+                u"error or 'too many requests'). Retries are delayed\n"
+                u"by 1 second, then 2, 4, and so on."
+            ),
+        )
+        gui.spin(
+            widget=self.optionsBox,
+            master=self,
+            value='maxSize',
+            minv=0,
+            maxv=1000000,
+            step=10,
+            orientation='horizontal',
+            label=u'Max. size per URL (MB):',
+            labelWidth=180,
+            callback=self.sendButton.settingsChanged,
+            keyboardTracking=False,
+            tooltip=(
+                u"URLs whose content is larger than this number of\n"
+                u"megabytes are not downloaded beyond this size and\n"
+                u"can't be retrieved. Set to 0 for no limit."
+            ),
+        )
+        gui.checkBox(
+            widget=self.optionsBox,
+            master=self,
+            value='skipFailedURLs',
+            label=u"Skip URLs that can't be retrieved",
+            callback=self.sendButton.settingsChanged,
+            tooltip=(
+                u"Leave out URLs that can't be retrieved or decoded\n"
+                u"and send the content of the other ones, rather than\n"
+                u"sending nothing. Failed URLs are listed in the info\n"
+                u"box below."
+            ),
+        )
+        optionsBoxLine7 = gui.widgetBox(
+            widget=self.optionsBox,
+            box=False,
+            orientation='horizontal',
+        )
+        gui.checkBox(
+            widget=optionsBoxLine7,
+            master=self,
+            value='importStatus',
+            label=u'Import status with key:',
+            labelWidth=180,
+            callback=self.sendButton.settingsChanged,
+            tooltip=(
+                u"Import how the content of each URL was obtained as\n"
+                u"annotations: the HTTP status code of the server's\n"
+                u"answer (e.g. '200'), 'revalidated' if cached content\n"
+                u"was confirmed by the server, or 'cached' if it was\n"
+                u"used without asking the server."
+            ),
+        )
+        self.importStatusKeyLineEdit = gui.lineEdit(
+            widget=optionsBoxLine7,
+            master=self,
+            value='importStatusKey',
+            orientation='horizontal',
+            callback=self.sendButton.settingsChanged,
+            tooltip=(
+                u"Annotation key for importing status."
+            ),
+        )
+        gui.comboBox(
+            widget=self.optionsBox,
+            master=self,
+            value='archiveMode',
+            items=[u'None', u'Record', u'Replay'],
+            sendSelectedValue=True,
+            orientation='horizontal',
+            label=u'URL archive:',
+            labelWidth=180,
+            callback=self.sendButton.settingsChanged,
+            tooltip=(
+                u"Select 'Record' to store every downloaded URL (with\n"
+                u"the server's answer headers and the time when it\n"
+                u"was downloaded) in an archive file; the cache is\n"
+                u"then not used, so that all URLs are stored.\n\n"
+                u"Select 'Replay' to import URLs from an archive file\n"
+                u"without accessing the network at all (the output\n"
+                u"is then identical to that of the recorded run)."
+            ),
+        )
+        self.archiveFileBox = gui.widgetBox(
+            widget=self.optionsBox,
+            box=False,
+            orientation='horizontal',
+        )
+        gui.lineEdit(
+            widget=self.archiveFileBox,
+            master=self,
+            value='archiveFile',
+            orientation='horizontal',
+            label=u'Archive file:',
+            labelWidth=180,
+            callback=self.sendButton.settingsChanged,
+            tooltip=(
+                u"The path of the URL archive file (in SQLite format)."
+            ),
+        )
+        gui.button(
+            widget=self.archiveFileBox,
+            master=self,
+            label=u'Browse',
+            callback=self.browseArchiveFile,
+            tooltip=(
+                u"Open a dialog for selecting a URL archive file."
+            ),
+        )
         self.advancedSettings.advancedWidgets.append(self.optionsBox)
 
+        # Profiling box (advanced settings)
+        self.create_profilingBox()
+
         gui.rubber(self.controlArea)
 
         # Send button & Info box
@@ -412,124 +766,315 @@ class OWTextableURLs(OWTextableBaseWidget):
                 numChars += segmentLength
             message += u'(%i character@p).' % numChars
             message = pluralize(message, numChars)
-            self.infoBox.setText(message)
+            if self.useCache:
+                message += u' Cache: %i hit@p ' % self.cacheHits
+                message = pluralize(message, self.cacheHits)
+                message += u'(%i revalidated), ' % self.cacheRevalidations
+                message += u'%i miss@p.' % self.cacheMisses
+                message = pluralize(message, self.cacheMisses, u'es')
+            if self.numOpenedConnections:
+                message += u' Connections: %i opened, %i reused.' % (
+                    self.numOpenedConnections,
+                    self.numReusedConnections,
+                )
+            if self.failedURLs:
+                message += u" %i URL@p couldn't be retrieved: " % len(
+                    self.failedURLs
+                )
+                message = pluralize(message, len(self.failedURLs))
+                message += u"; ".join(
+                    u"%s (%s)" % failure
+                    for failure in self.failedURLs[:MAX_LISTED_FAILURES]
+                )
+                if len(self.failedURLs) > MAX_LISTED_FAILURES:
+                    message += u"; ..."
+                self.infoBox.setText(message + u".", 'warning')
+            else:
+                self.infoBox.setText(message)
             if len(processed_data):
                 self.Outputs.text_data.send(processed_data)
             else:
                 self.sendNoneToOutputs()
             
-    def process_data(self, myURLs):
+    def process_data(self, myURLs, cancelToken=None):
         """ Process data in a worker thread
         instead of the main thread so that
-        the operations can be cancelled """
+        the operations can be cancelled
+
+        Cancelling cancelToken interrupts downloads at once, except
+        connections being established, which stop when they succeed or
+        time out (see URLFetcher.cancel).
+        """
         
         # Emit 1%
         self.signal_prog.emit(1, False)
         
         # Progress bar
         max_itr = len(myURLs)
-        cur_itr = 1
+        progress = 1
         
         URLContents = list()
         annotations = list()
         counter = 1
         
-        # Process each URL successively...
-        for myURL in myURLs:
-
-            URL = myURL[0]
-            if not URL.startswith("http"):
-                URL = "http://" + URL
-            encoding = myURL[1]
-            encoding = re.sub(r"[ ]\(.+", "", encoding)
-            annotation_key = myURL[2]
-            annotation_value = myURL[3]
-
-            # Try to fetch URL content...
-            self.error()
-            URLContent = ""
+        # Look up URLs in the cache...
+        URLs = [myURL[0] for myURL in myURLs]
+        URLs = [u if u.startswith("http") else "http://" + u for u in URLs]
+        encodings = [re.sub(r"[ ]\(.+", "", myURL[1]) for myURL in myURLs]
+        self.cacheHits = 0
+        self.cacheRevalidations = 0
+        self.cacheMisses = 0
+        self.failedURLs = list()
+
+        # Open URL archive (if needed); the cache isn't used when recording
+        # or replaying an archive...
+        archive = None
+        if self.archiveMode != u'None':
             try:
-                URLHandle = urlopen(URL)
-                URLContent = URLHandle.read()
-                URLHandle.close()
-            except http.client.IncompleteRead as e:
-                URLContent = e.partial
+                archive = URLArchive(self.archiveFile)
             except IOError:
-                if len(myURLs) > 1:
-                    message = u"Couldn't retrieve %s." % URL
-                else:
-                    message = u"Couldn't retrieve URL."
+                self.signal_text.emit(u"Couldn't open URL archive.", 'error')
+                self.signal_prog.emit(100, False)
+                self.sendNoneToOutputs()
+                return
+        replay = self.archiveMode == u'Replay'
+        if archive is None:
+            cache = self.getHTTPCache()
+        else:
+            cache = None
+        if cache is not None:
+            entries = [
+                cache.get((URL, encoding))
+                for URL, encoding in zip(URLs, encodings)
+            ]
+        else:
+            entries = [None] * len(URLs)
+
+        # Fetch URLs concurrently (except those whose cached content can be
+        # used without asking the server) and process them successively...
+        now = time.time()
+        maxAge = self.cacheMaxAge * 60
+        toFetch = [
+            index for index, entry in enumerate(entries)
+            if not replay and (not entry or not (
+                self.offline or now - entry['fetchTime'] < maxAge
+            ))
+        ]
+        numCached = len(URLs) - len(toFetch)
+        futures = [None] * len(URLs)
+        fetcher = URLFetcher(
+            self.maxConnections,
+            self.maxConnectionsPerHost,
+            timeout=self.timeout,
+            retries=self.retries,
+            maxSize=self.maxSize * 2**20,
+            poolSize=self.keepAliveConnections,
+        )
+        if cancelToken is not None:
+            cancelToken.onCancel(fetcher.cancel)
+        if cache is not None and self.offline:
+            for index in toFetch:
+                futures[index] = concurrent.futures.Future()
+                futures[index].set_exception(IOError("URL not in cache"))
+        else:
+            fetched = fetcher.fetch(
+                [URLs[index] for index in toFetch],
+                [
+                    HTTPCache.getConditionalHeaders(entries[index])
+                    if entries[index] else None
+                    for index in toFetch
+                ],
+            )
+            for index, future in zip(toFetch, fetched):
+                futures[index] = future
+        try:
+            for index, (myURL, URL, requestedEncoding, entry, future) in (
+                enumerate(zip(myURLs, URLs, encodings, entries, futures))
+            ):
+
+                annotation_key = myURL[2]
+                annotation_value = myURL[3]
+
+                # Wait for URL content to be fetched (updating progress bar
+                # and checking for cancellation in the meantime)...
+                self.error()
+                response = None
+                try:
+                    while future is not None and not future.done():
+                        fetched = numCached + fetcher.getProgress()
+                        newProgress = int(100 * fetched / max_itr)
+                        if newProgress > progress:
+                            progress = newProgress
+                            self.signal_prog.emit(progress, False)
+                        if self.cancel_operation:
+                            self.signal_prog.emit(100, False)
+                            return
+                        concurrent.futures.wait([future], timeout=0.1)
+                    if self.cancel_operation:
+                        self.signal_prog.emit(100, False)
+                        return
+                    if future is not None:
+                        response = future.result()
+                    elif replay:
+                        newProgress = int(100 * index / max_itr)
+                        if newProgress > progress:
+                            progress = newProgress
+                            self.signal_prog.emit(progress, False)
+                        response = archive.get(URL)
+                        if response is None:
+                            raise IOError(u"URL not in archive")
+                except IOError as exc:
+                    if self.skipFailedURLs:
+                        self.failedURLs.append((URL, describeError(exc)))
+                        continue
+                    if len(myURLs) > 1:
+                        message = u"Couldn't retrieve %s." % URL
+                    else:
+                        message = u"Couldn't retrieve URL."
                 
-                # Emit message
-                self.signal_text.emit(message, 'error')
+                    # Emit message
+                    self.signal_text.emit(message, 'error')
                 
-                # Emit finished
-                self.signal_prog.emit(100, False)
+                    # Emit finished
+                    self.signal_prog.emit(100, False)
                 
-                # Send None
-                self.sendNoneToOutputs()
+                    # Send None
+                    self.sendNoneToOutputs()
                 
-                return
-            try:
-                if encoding == "(auto-detect)":
-                    encoding = chardet.detect(URLContent)['encoding']
-                URLContent = URLContent.decode(encoding)
-
-            except UnicodeError:
-                if len(myURLs) > 1:
-                    message = u"Please select another encoding "    \
-                              + u"for URL %s." % URL
+                    return
+
+                # Record downloaded content in archive...
+                if archive is not None and not replay:
+                    archive.put(URL, response, time.time())
+
+                # Use cached content if it is recent enough or unmodified...
+                if response is None or response.status == 304:
+                    URLContent = entry['content']
+                    encoding = entry['encoding']
+                    status = u'cached'
+                    self.cacheHits += 1
+                    if response is not None:
+                        status = u'revalidated'
+                        self.cacheRevalidations += 1
+                        cache.revalidate(
+                            (URL, requestedEncoding),
+                            response.headers.get('ETag', entry['etag']),
+                            response.headers.get(
+                                'Last-Modified', entry['lastModified']
+                            ),
+                            time.time(),
+                        )
+
+                # Otherwise decode and normalize downloaded content...
                 else:
-                    message = u"Please select another encoding."
+                    status = str(response.status)
+                    try:
+                        URLContent, encoding = self.decodeContent(
+                            URL, response.content, requestedEncoding
+                        )
+
+                    except UnicodeError:
+                        if self.skipFailedURLs:
+                            self.failedURLs.append(
+                                (URL, u"can't be decoded")
+                            )
+                            continue
+                        if len(myURLs) > 1:
+                            message = u"Please select another encoding "    \
+                                      + u"for URL %s." % URL
+                        else:
+                            message = u"Please select another encoding."
 
-                # Emit message
-                self.signal_text.emit(message, 'error')
+                        # Emit message
+                        self.signal_text.emit(message, 'error')
                 
-                # Emit finished
-                self.signal_prog.emit(100, False)
+                        # Emit finished
+                        self.signal_prog.emit(100, False)
                 
-                # Send None
-                self.sendNoneToOutputs()
-
-                return
-
-            # Replace newlines with '\n'...
-            # URLContent = URLContent.replace('\r\n', '\n').replace('\r', '\n')
-
-            # TODO: check if this is more efficient than replace above...
-            URLContent = '\n'.join(URLContent.splitlines())
+                        # Send None
+                        self.sendNoneToOutputs()
+
+                        return
+
+                    # Replace newlines with '\n'...
+                    # URLContent = URLContent.replace('\r\n', '\n').replace('\r', '\n')
+
+                    # TODO: check if this is more efficient than replace
+                    # above...
+                    URLContent = '\n'.join(URLContent.splitlines())
+
+                    # Remove utf-8 BOM if necessary...
+                    if encoding == u'utf-8':
+                        URLContent = URLContent.lstrip(
+                            codecs.BOM_UTF8.decode('utf-8')
+                        )
+
+                    # Normalize text (canonical decomposition then
+                    # composition)...
+                    URLContent = normalize('NFC', URLContent)
+
+                    # Store content in cache...
+                    if cache is not None:
+                        self.cacheMisses += 1
+                        cache.put(
+                            (URL, requestedEncoding),
+                            URLContent,
+                            encoding,
+                            response.headers.get('ETag'),
+                            response.headers.get('Last-Modified'),
+                            time.time(),
+                        )
+
+                URLContents.append(URLContent)
+
+                # Annotations...
+                annotation = dict()
+                if self.displayAdvancedSettings:
+                    if annotation_key and annotation_value:
+                        annotation[annotation_key] = annotation_value
+                    if self.importURLs and self.importURLsKey:
+                        annotation[self.importURLsKey] = URL
+                    if self.importEncodings and self.importEncodingsKey:
+                        annotation[self.importEncodingsKey] = encoding
+                    if self.importStatus and self.importStatusKey:
+                        annotation[self.importStatusKey] = status
+                    if self.autoNumber and self.autoNumberKey:
+                        annotation[self.autoNumberKey] = counter
+                        counter += 1
+                annotations.append(annotation)
+            
+                # Cancel operation if requested by user
+                if self.cancel_operation:
+                    self.signal_prog.emit(100, False)
+                    return
 
-            # Remove utf-8 BOM if necessary...
-            if encoding == u'utf-8':
-                URLContent = URLContent.lstrip(
-                    codecs.BOM_UTF8.decode('utf-8')
-                )
+            # Commit recorded content...
+            if archive is not None:
+                archive.close()
+                archive = None
 
-            # Normalize text (canonical decomposition then composition)...
-            URLContent = normalize('NFC', URLContent)
-
-            URLContents.append(URLContent)
-
-            # Annotations...
-            annotation = dict()
-            if self.displayAdvancedSettings:
-                if annotation_key and annotation_value:
-                    annotation[annotation_key] = annotation_value
-                if self.importURLs and self.importURLsKey:
-                    annotation[self.importURLsKey] = URL
-                if self.autoNumber and self.autoNumberKey:
-                    annotation[self.autoNumberKey] = counter
-                    counter += 1
-            annotations.append(annotation)
-            
-            # Update progress bar manually
-            self.signal_prog.emit(int(100*cur_itr/max_itr), False)
-            cur_itr += 1
-            
-            # Cancel operation if requested by user
-            if self.cancel_operation:
-                self.signal_prog.emit(100, False)
-                return
+        # Writing to URL archive failed...
+        except IOError:
+            self.signal_text.emit(u"Couldn't write URL archive.", 'error')
+            self.signal_prog.emit(100, False)
+            self.sendNoneToOutputs()
+            return
+        finally:
+            fetcher.shutdown()
+            self.numOpenedConnections = fetcher.pool.numOpened
+            self.numReusedConnections = fetcher.pool.numReused
+            if archive is not None:
+                try:
+                    archive.close()
+                except IOError:
+                    pass
+
+        # Give up if no URL could be retrieved...
+        if not URLContents:
+            self.signal_text.emit(u"Couldn't retrieve any URL.", 'error')
+            self.signal_prog.emit(100, False)
+            self.sendNoneToOutputs()
+            return
 
         # Create an LTTL.Input for each URL...
         if len(URLContents) == 1:
@@ -563,6 +1108,74 @@ class OWTextableURLs(OWTextableBaseWidget):
                 merge_duplicates=False,
             )
 
+    def getHTTPCache(self):
+        """Return the cache of downloaded content (or None if disabled)"""
+        if not self.useCache:
+            return None
+        if self.HTTPCache is None:
+            try:
+                self.HTTPCache = HTTPCache(
+                    getCacheDirectory("urls"),
+                    self.cacheSize * 2**20,
+                )
+            except OSError:
+                return None
+        self.HTTPCache.maxSize = self.cacheSize * 2**20
+        return self.HTTPCache
+
+    def browseArchiveFile(self):
+        """Display a FileDialog and select a URL archive file"""
+        filePath, _ = QFileDialog.getSaveFileName(
+            self,
+            u'Select URL Archive',
+            self.lastLocation,
+            u'URL archives (*.sqlite);;All files (*)',
+            options=QFileDialog.DontConfirmOverwrite,
+        )
+        if not filePath:
+            return
+        self.archiveFile = os.path.normpath(filePath)
+        self.lastLocation = os.path.dirname(filePath)
+        self.sendButton.settingsChanged()
+
+    def decodeContent(self, URL, URLContent, encoding):
+        """Decode the content of a URL and return (text, encoding)
+
+        If encoding is '(auto-detect)', it is detected on a sample of the
+        content and remembered for this URL as long as the content's length
+        and sample are unchanged. If decoding then fails, the encoding is
+        detected again on the whole content. The locale's preferred encoding
+        is used if none can be detected (as for Text Files).
+        """
+        if encoding != "(auto-detect)":
+            return URLContent.decode(encoding), encoding
+        sampleSize = self.detectionSampleSize * 1024
+        detectionKey = (
+            len(URLContent),
+            sampleSize,
+            hashlib.sha1(URLContent[:sampleSize or None]).digest(),
+        )
+        known = self.detectedEncodings.get(URL)
+        if known and known[0] == detectionKey:
+            encoding = known[1]
+        else:
+            encoding = (
+                detectEncoding(URLContent, sampleSize)
+                or locale.getpreferredencoding(False)
+            )
+        try:
+            text = URLContent.decode(encoding)
+        except UnicodeError:
+            if not sampleSize:
+                raise
+            encoding = (
+                detectEncoding(URLContent, 0)
+                or locale.getpreferredencoding(False)
+            )
+            text = URLContent.decode(encoding)
+        self.detectedEncodings[URL] = (detectionKey, encoding)
+        return text, encoding
+
     def sendData(self):
 
         """Fetch URL content, create and send segmentation"""
@@ -590,6 +1203,25 @@ class OWTextableURLs(OWTextableBaseWidget):
         else:
             autoNumberKey = None
 
+        # Check that an archive file is selected (if necessary)...
+        if self.archiveMode != u'None' and not self.archiveFile:
+            self.infoBox.setText(
+                u'Please select an archive file.',
+                'warning'
+            )
+            self.sendNoneToOutputs()
+            return
+        if (
+            self.archiveMode == u'Replay' and
+            not os.path.isfile(self.archiveFile)
+        ):
+            self.infoBox.setText(
+                u'Please select an existing archive file.',
+                'warning'
+            )
+            self.sendNoneToOutputs()
+            return
+
         # Clear created Inputs...
         self.clearCreatedInputs()
 
@@ -853,6 +1485,16 @@ class OWTextableURLs(OWTextableBaseWidget):
                 self.importURLsKeyLineEdit.setDisabled(False)
             else:
                 self.importURLsKeyLineEdit.setDisabled(True)
+            self.importEncodingsKeyLineEdit.setDisabled(
+                not self.importEncodings
+            )
+            self.importStatusKeyLineEdit.setDisabled(not self.importStatus)
+            self.cacheSizeSpin.setDisabled(not self.useCache)
+            self.cacheMaxAgeSpin.setDisabled(
+                not self.useCache or self.offline
+            )
+            self.offlineCheckBox.setDisabled(not self.useCache)
+            self.archiveFileBox.setDisabled(self.archiveMode == u'None')
             self.updateURLBoxButtons()
             self.advancedSettings.setVisible(True)
         else:
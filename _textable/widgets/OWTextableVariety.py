@@ -18,7 +18,7 @@ You should have received a copy of the GNU General Public License
 along with Orange3-Textable. If not, see <http://www.gnu.org/licenses/>.
 """
 
-__version__ = '0.13.11'
+__version__ = '0.13.13'
 
 
 from LTTL.TableThread import Table
@@ -82,6 +82,10 @@ class OWTextableVariety(OWTextableBaseWidget):
     want_main_area = False
     resizing_enabled = False
 
+    # Reuse the result of previous runs with the same input and settings
+    # (see OWTextableBaseWidget.getMemoKey)...
+    memoizeResults = True
+
     def __init__(self, *args, **kwargs):
         """Initialize a Variety widget"""
 
@@ -407,6 +411,9 @@ class OWTextableVariety(OWTextableBaseWidget):
         else:
             iBox2.setDisabled(True)
 
+        # Profiling box
+        self.create_profilingBox()
+
         gui.rubber(self.controlArea)
 
         # Send button & Info box
@@ -427,6 +434,13 @@ class OWTextableVariety(OWTextableBaseWidget):
             self.Outputs.textable_table.send(textable_table)
             self.Outputs.orange_table.send(orange_table)
 
+    def getMemoKey(self, function):
+        """Don't memoize results computed with random resampling (see
+        OWTextableBaseWidget)"""
+        if function.keywords.get('apply_resampling'):
+            return None
+        return super().getMemoKey(function)
+
     def sendData(self):
         """Check input, compute variety, then send table"""
 
@@ -0,0 +1,851 @@
+"""
+Module TextableBenchmark.py
+Copyright 2012-2025 Aris Xanthos
+-----------------------------------------------------------------------------
+This file is part of the Orange3-Textable package.
+
+Orange3-Textable is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Orange3-Textable is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Orange3-Textable. If not, see <http://www.gnu.org/licenses/>.
+-----------------------------------------------------------------------------
+Benchmark suite for the processing performed by Textable widgets (see
+"python -m _textable bench").
+
+Each benchmark calls the LTTL functions a widget calls in a worker thread,
+with arguments built as the widget does, on a synthetic corpus generated with
+a fixed seed: words are drawn from a pseudo-word vocabulary following
+Zipf's law, documents and words are annotated with a configurable number
+of categories, and words and sentences can be marked up in XML. Wall time
+(best of several runs), peak memory (measured with tracemalloc in a
+separate run) and throughput are recorded, and results can be saved as a
+JSON baseline which later results are compared to.
+
+Benchmarks of functions which produce Orange tables are skipped when
+Orange is not installed. Like TextableProcess, this module must not import
+Qt or Orange (except within benchmarks).
+-----------------------------------------------------------------------------
+Provides classes:
+- BenchmarkCorpus
+- BenchmarkCaller
+- SkipBenchmark
+-----------------------------------------------------------------------------
+Provides functions:
+- benchmark
+- generateCorpus
+- runBenchmarks
+- compareResults
+- getParameterMismatches
+- saveResults
+- loadResults
+- formatResult
+"""
+
+__version__ = '0.1'
+
+import re
+import gc
+import json
+import time
+import random
+import fnmatch
+import platform
+import itertools
+import tracemalloc
+import collections
+from functools import partial
+
+import LTTL.SegmenterThread as Segmenter
+import LTTL.ProcessorThread as Processor
+from LTTL.Segment import Segment
+from LTTL.Segmentation import Segmentation
+from LTTL.Input import Input as LTTL_Input
+
+# Default corpus parameters...
+DEFAULT_NUM_WORDS = 100000
+DEFAULT_NUM_DOCUMENTS = 20
+DEFAULT_VOCABULARY_SIZE = 5000
+DEFAULT_CARDINALITY = 10
+DEFAULT_SEED = 0
+ZIPF_EXPONENT = 1.0
+SENTENCE_LENGTHS = (4, 24)
+
+# Default run parameters...
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.2
+
+# Version of the format of saved results...
+RESULTS_FORMAT = 1
+
+# Metrics compared to baselines (lower is better)...
+COMPARED_METRICS = ('time', 'peak_memory')
+
+Case = collections.namedtuple('Case', ['name', 'widget', 'unit', 'setup'])
+
+# Registered benchmarks, in the order of definition...
+CASES = collections.OrderedDict()
+
+
+class SkipBenchmark(Exception):
+    """Raised by benchmark setup functions when a benchmark can't be run"""
+    pass
+
+
+class _Signal(object):
+    """Signal whose emissions are ignored"""
+
+    def emit(self, *args):
+        pass
+
+
+class BenchmarkCaller(object):
+    """Stand-in for the widget passed as caller to LTTL functions"""
+
+    def __init__(self):
+        self.cancel_operation = False
+        self.signal_prog = _Signal()
+        self.signal_text = _Signal()
+        self.signal_cancel_button = _Signal()
+
+
+def benchmark(widget, unit='segments'):
+    """Register a benchmark of the processing of a widget
+
+    The decorated function takes a BenchmarkCorpus and a BenchmarkCaller
+    and returns the function to be timed (called without arguments) and
+    the number of items (in the given unit) it processes; it may raise
+    SkipBenchmark.
+    """
+    def decorator(setup):
+        name = u'%s.%s' % (widget, setup.__name__)
+        CASES[name] = Case(name, widget, unit, setup)
+        return setup
+    return decorator
+
+
+def generateCorpus(
+    numWords=DEFAULT_NUM_WORDS,
+    numDocuments=DEFAULT_NUM_DOCUMENTS,
+    cardinality=DEFAULT_CARDINALITY,
+    markup=True,
+    vocabularySize=DEFAULT_VOCABULARY_SIZE,
+    seed=DEFAULT_SEED,
+):
+    """Generate the texts of a synthetic corpus
+
+    Return a list of (text, annotations) pairs, one per document. Documents
+    are annotated with key "category", and (if markup is True) words are
+    <w> elements with attribute "type", both with cardinality values;
+    sentences are <s> elements with attribute "n".
+    """
+    rng = random.Random(seed)
+    vocabulary = _generateVocabulary(rng, vocabularySize)
+    cumWeights = list(itertools.accumulate(
+        1 / rank ** ZIPF_EXPONENT for rank in range(1, vocabularySize + 1)
+    ))
+    wordTypes = [u't%i' % rng.randrange(cardinality) for _ in vocabulary]
+    documents = list()
+    for docIndex in range(numDocuments):
+        remaining = (
+            numWords // numDocuments
+            + (1 if docIndex < numWords % numDocuments else 0)
+        )
+        sentences = list()
+        while remaining > 0:
+            length = min(remaining, rng.randint(*SENTENCE_LENGTHS))
+            remaining -= length
+            indices = rng.choices(
+                range(vocabularySize), cum_weights=cumWeights, k=length
+            )
+            words = [vocabulary[index] for index in indices]
+            words[0] = words[0].capitalize()
+            if markup:
+                words = [
+                    u'<w type="%s">%s</w>' % (wordTypes[index], word)
+                    for index, word in zip(indices, words)
+                ]
+                sentences.append(u'<s n="%i">%s.</s>' % (
+                    len(sentences) + 1, u' '.join(words)
+                ))
+            else:
+                sentences.append(u' '.join(words) + u'.')
+        text = u'\n'.join(sentences)
+        if markup:
+            text = u'<text>\n%s\n</text>' % text
+        annotations = {u'category': u'c%i' % (docIndex % cardinality)}
+        documents.append((text, annotations))
+    return documents
+
+
+def _generateVocabulary(rng, size):
+    """Return a list of distinct pseudo-words, shortest first (so that
+    most frequent words are shortest, as in natural languages)"""
+    consonants = u'bcdfghjklmnprstvz'
+    vowels = u'aeiouyéà'
+    words = set()
+    numSyllables = 1
+    while len(words) < size:
+        # Go on with longer words when short ones get hard to find...
+        for _ in range(size * 4):
+            words.add(u''.join(
+                rng.choice(consonants) + rng.choice(vowels)
+                for _ in range(rng.randint(1, numSyllables))
+            ))
+            if len(words) == size:
+                break
+        numSyllables += 1
+    return sorted(words, key=lambda word: (len(word), word))
+
+
+class BenchmarkCorpus(object):
+    """Synthetic corpus and the segmentations benchmarks are run on
+
+    Attributes documents, sentences and words are segmentations (sentences
+    and words inherit annotation "category" from documents, and words have
+    annotation "type" if the corpus has markup, which is then categoryKey);
+    keywords is a selection of frequent words and table is a document-term
+    crosstab.
+    """
+
+    def __init__(
+        self,
+        numWords=DEFAULT_NUM_WORDS,
+        numDocuments=DEFAULT_NUM_DOCUMENTS,
+        cardinality=DEFAULT_CARDINALITY,
+        markup=True,
+        vocabularySize=DEFAULT_VOCABULARY_SIZE,
+        seed=DEFAULT_SEED,
+    ):
+        self.markup = markup
+        self.categoryKey = u'type' if markup else u'category'
+        self.seed = seed
+        self.parameters = {
+            u'numWords': numWords,
+            u'numDocuments': numDocuments,
+            u'cardinality': cardinality,
+            u'markup': markup,
+            u'vocabularySize': vocabularySize,
+            u'seed': seed,
+        }
+        texts = generateCorpus(**self.parameters)
+        self.inputs = list()
+        segments = list()
+        for text, annotations in texts:
+            newInput = LTTL_Input(text, u'document')
+            self.inputs.append(newInput)
+            segments.append(
+                Segment(newInput[0].str_index, annotations=annotations)
+            )
+        self.documents = Segmentation(segments, u'documents')
+        self.numChars = sum(len(text) for text, _ in texts)
+        caller = BenchmarkCaller()
+        if markup:
+            self.sentences = Segmenter.import_xml(
+                self.documents, u's', caller, label=u'sentences',
+            )
+            self.words = Segmenter.import_xml(
+                self.documents, u'w', caller, label=u'words',
+            )
+        else:
+            self.sentences = Segmenter.tokenize(
+                self.documents,
+                [(re.compile(r'[^\n]+'), u'tokenize')],
+                caller,
+                label=u'sentences',
+            )
+            self.words = Segmenter.tokenize(
+                self.documents,
+                [(re.compile(r'\w+'), u'tokenize')],
+                caller,
+                label=u'words',
+            )
+        self.keywords = Segmenter.threshold(
+            caller, self.words, min_count=len(self.words) // 200,
+            label=u'keywords',
+        )[0]
+        self.table = Processor.count_in_context(
+            caller,
+            units={u'segmentation': self.words},
+            contexts={u'segmentation': self.documents},
+            called_internally=True,
+        )
+
+    def clear(self):
+        """Remove the corpus strings from Segmentation.data"""
+        for myInput in self.inputs:
+            myInput.clear()
+        del self.inputs[:]
+
+
+def runBenchmarks(
+    corpus,
+    pattern=None,
+    repeat=DEFAULT_REPEAT,
+    log=None,
+):
+    """Run benchmarks (those whose name matches pattern, if any) on a
+    BenchmarkCorpus and return results (see saveResults)
+
+    Each benchmark is run repeat times to measure its time (the best run
+    is retained) and once more under tracemalloc to measure its peak
+    memory. Skipped benchmarks are reported with key "skipped".
+    """
+    results = collections.OrderedDict()
+    for name, case in CASES.items():
+        if pattern and not fnmatch.fnmatch(name.lower(), pattern.lower()):
+            continue
+        try:
+            function, numItems = case.setup(corpus, BenchmarkCaller())
+            result = _measure(function, repeat)
+        except SkipBenchmark as exc:
+            result = {u'skipped': str(exc)}
+        except ImportError as exc:
+            result = {u'skipped': u'requires %s' % (exc.name or exc)}
+        else:
+            result[u'items'] = numItems
+            result[u'unit'] = case.unit
+            result[u'throughput'] = (
+                numItems / result[u'time'] if result[u'time'] else None
+            )
+        result[u'widget'] = case.widget
+        results[name] = result
+        if log is not None:
+            log.write(formatResult(name, result) + u'\n')
+            log.flush()
+    return {
+        u'format': RESULTS_FORMAT,
+        u'environment': _getEnvironment(),
+        u'corpus': dict(
+            corpus.parameters,
+            numChars=corpus.numChars,
+            numSegments=len(corpus.words),
+        ),
+        u'repeat': repeat,
+        u'results': results,
+    }
+
+
+def _measure(function, repeat):
+    """Return the best time and the peak memory of calls to function"""
+    times = list()
+    gcWasEnabled = gc.isenabled()
+    try:
+        for _ in range(max(1, repeat)):
+            gc.collect()
+            gc.disable()
+            start = time.perf_counter()
+            output = function()
+            times.append(time.perf_counter() - start)
+            gc.enable()
+            del output
+    finally:
+        if gcWasEnabled:
+            gc.enable()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        output = function()
+        peakMemory = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+    del output
+    return {u'time': min(times), u'peak_memory': peakMemory}
+
+
+def _getEnvironment():
+    """Return a description of the environment benchmarks are run in"""
+    try:
+        from importlib.metadata import version
+        lttlVersion = version('LTTL')
+    except Exception:
+        lttlVersion = None
+    return {
+        u'python': platform.python_version(),
+        u'implementation': platform.python_implementation(),
+        u'platform': platform.platform(),
+        u'machine': platform.machine(),
+        u'lttl': lttlVersion,
+        u'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def compareResults(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Compare results to baseline results
+
+    Return a list of (name, metric, baselineValue, currentValue, ratio)
+    tuples, one for each metric which got worse by more than threshold
+    (e.g. 0.2 for 20%).
+    """
+    regressions = list()
+    for name, result in current[u'results'].items():
+        baselineResult = baseline[u'results'].get(name)
+        if not baselineResult or u'skipped' in baselineResult:
+            continue
+        if u'skipped' in result:
+            continue
+        for metric in COMPARED_METRICS:
+            old = baselineResult.get(metric)
+            new = result.get(metric)
+            if not old or new is None:
+                continue
+            ratio = new / old
+            if ratio > 1 + threshold:
+                regressions.append((name, metric, old, new, ratio))
+    return regressions
+
+
+def getParameterMismatches(baseline, current):
+    """Return the names of corpus parameters that differ from baseline"""
+    keys = set(baseline[u'corpus']) | set(current[u'corpus'])
+    return sorted(
+        key for key in keys
+        if baseline[u'corpus'].get(key) != current[u'corpus'].get(key)
+    )
+
+
+def saveResults(results, path):
+    """Save results to a JSON file"""
+    with open(path, 'w', encoding='utf-8') as resultFile:
+        json.dump(results, resultFile, indent=2, sort_keys=True)
+        resultFile.write(u'\n')
+
+
+def loadResults(path):
+    """Load results from a JSON file"""
+    with open(path, encoding='utf-8') as resultFile:
+        results = json.load(resultFile)
+    if results.get(u'format') != RESULTS_FORMAT:
+        raise ValueError(u"Unsupported results format in %s." % path)
+    return results
+
+
+def formatResult(name, result):
+    """Return a one-line summary of a benchmark result"""
+    if u'skipped' in result:
+        return u'%-40s skipped (%s)' % (name, result[u'skipped'])
+    return u'%-40s %9.3f s %9.1f MB %12s %s/s' % (
+        name,
+        result[u'time'],
+        result[u'peak_memory'] / 2**20,
+        u'%.0f' % result[u'throughput'] if result[u'throughput'] else u'-',
+        result[u'unit'],
+    )
+
+
+def _requireOrange():
+    """Raise SkipBenchmark unless Orange is installed (LTTL processing
+    functions convert their results to Orange tables)"""
+    try:
+        import Orange
+    except ImportError:
+        raise SkipBenchmark(u'requires Orange')
+
+
+# Segment...
+
+@benchmark(u'Segment', u'characters')
+def tokenizeWords(corpus, caller):
+    regexes = [(re.compile(r'\w+', re.UNICODE), u'tokenize')]
+    return partial(
+        Segmenter.tokenize, corpus.documents, regexes, caller,
+        label=u'words', import_annotations=True, total_steps=1,
+    ), corpus.numChars
+
+
+@benchmark(u'Segment', u'characters')
+def splitAnnotated(corpus, caller):
+    regexes = [
+        (re.compile(r'[.\n]+'), u'split', {u'kind': u'sentence'}),
+        (re.compile(r'\s+'), u'split'),
+    ]
+    return partial(
+        Segmenter.tokenize, corpus.documents, regexes, caller,
+        label=u'split', merge_duplicates=True, auto_number_as=u'num',
+        total_steps=2,
+    ), corpus.numChars
+
+
+# Select...
+
+@benchmark(u'Select')
+def selectRegex(corpus, caller):
+    return partial(
+        Segmenter.select, caller, corpus.words,
+        re.compile(r'^[b-m]', re.UNICODE), mode=u'include', label=u'selected',
+    ), len(corpus.words)
+
+
+@benchmark(u'Select')
+def selectAnnotation(corpus, caller):
+    return partial(
+        Segmenter.select, caller, corpus.words,
+        re.compile(r'^[ct][0-4]$', re.UNICODE), mode=u'exclude',
+        annotation_key=corpus.categoryKey, label=u'selected',
+        auto_number_as=u'num',
+    ), len(corpus.words)
+
+
+@benchmark(u'Select')
+def threshold(corpus, caller):
+    return partial(
+        Segmenter.threshold, caller, corpus.words, min_count=2,
+        max_count=len(corpus.words) // 100, label=u'thresholded',
+    ), len(corpus.words)
+
+
+@benchmark(u'Select')
+def sample(corpus, caller):
+    def sampleWords():
+        random.seed(corpus.seed)
+        return Segmenter.sample(
+            caller, corpus.words, len(corpus.words) // 10,
+            mode=u'random', label=u'sampled',
+        )
+    return sampleWords, len(corpus.words)
+
+
+# Recode...
+
+@benchmark(u'Recode', u'characters')
+def recode(corpus, caller):
+    substitutions = [
+        (re.compile(r'([aeiou])([bcdfg])'), u'&2&1'),
+        (re.compile(r'\s+'), u' '),
+    ]
+    return partial(
+        Segmenter.recode, caller, corpus.documents,
+        substitutions=substitutions, label=u'recoded',
+        check_overlap=False,
+    ), corpus.numChars
+
+
+# Preprocess...
+
+@benchmark(u'Preprocess', u'characters')
+def preprocess(corpus, caller):
+    return partial(
+        Segmenter.recode, caller, corpus.documents, case=u'lower',
+        remove_accents=True, label=u'preprocessed',
+    ), corpus.numChars
+
+
+# Extract XML...
+
+@benchmark(u'ExtractXML', u'characters')
+def extractElements(corpus, caller):
+    if not corpus.markup:
+        raise SkipBenchmark(u'corpus has no markup')
+    return partial(
+        Segmenter.import_xml, corpus.documents, u'w', caller,
+        conditions={u'type': re.compile(r'^t[0-4]$')},
+        import_element_as=u'element', label=u'xml',
+        auto_number_as=u'num',
+    ), corpus.numChars
+
+
+@benchmark(u'ExtractXML', u'characters')
+def removeMarkup(corpus, caller):
+    if not corpus.markup:
+        raise SkipBenchmark(u'corpus has no markup')
+    return partial(
+        Segmenter.import_xml, corpus.documents, u'text', caller,
+        label=u'xml', remove_markup=True, merge_duplicates=True,
+    ), corpus.numChars
+
+
+# Intersect...
+
+@benchmark(u'Intersect')
+def intersect(corpus, caller):
+    return partial(
+        Segmenter.intersect, caller, corpus.words, corpus.keywords,
+        mode=u'exclude', label=u'intersected', copy_annotations=True,
+    ), len(corpus.words)
+
+
+# Merge...
+
+@benchmark(u'Merge')
+def concatenate(corpus, caller):
+    return partial(
+        Segmenter.concatenate, caller, [corpus.sentences, corpus.words],
+        label=u'merged', import_labels_as=u'component', sort=True,
+        auto_number_as=u'num', merge_duplicates=True,
+    ), len(corpus.sentences) + len(corpus.words)
+
+
+# Count...
+
+@benchmark(u'Count')
+def countInContext(corpus, caller):
+    _requireOrange()
+    return partial(
+        Processor.count_in_context, caller,
+        units={u'segmentation': corpus.words, u'seq_length': 1},
+        contexts={
+            u'segmentation': corpus.documents,
+            u'annotation_key': u'category',
+        },
+    ), len(corpus.words)
+
+
+@benchmark(u'Count')
+def countInWindow(corpus, caller):
+    _requireOrange()
+    return partial(
+        Processor.count_in_window, caller,
+        units={
+            u'segmentation': corpus.words,
+            u'annotation_key': corpus.categoryKey,
+        },
+        window_size=5,
+    ), len(corpus.words)
+
+
+@benchmark(u'Count')
+def countInChain(corpus, caller):
+    _requireOrange()
+    return partial(
+        Processor.count_in_chain, caller,
+        units={
+            u'segmentation': corpus.words,
+            u'annotation_key': corpus.categoryKey,
+        },
+        contexts={u'left_size': 1, u'right_size': 1},
+    ), len(corpus.words)
+
+
+# Length...
+
+@benchmark(u'Length')
+def lengthInContext(corpus, caller):
+    _requireOrange()
+    return partial(
+        Processor.length_in_context, caller,
+        units=corpus.words,
+        averaging={
+            u'segmentation': corpus.sentences, u'std_deviation': True,
+        },
+        contexts={
+            u'segmentation': corpus.documents,
+            u'annotation_key': u'category',
+        },
+    ), len(corpus.words)
+
+
+@benchmark(u'Length')
+def lengthInWindow(corpus, caller):
+    _requireOrange()
+    return partial(
+        Processor.length_in_window, caller,
+        units=corpus.words,
+        averaging={
+            u'segmentation': corpus.sentences, u'std_deviation': True,
+        },
+        window_size=5,
+    ), len(corpus.sentences)
+
+
+# Variety...
+
+@benchmark(u'Variety')
+def varietyInContext(corpus, caller):
+    _requireOrange()
+    return partial(
+        Processor.variety_in_context, caller,
+        units={u'segmentation': corpus.words},
+        categories={u'annotation_key': corpus.categoryKey},
+        contexts={
+            u'segmentation': corpus.documents,
+            u'annotation_key': u'category',
+        },
+        measure_per_category=True,
+    ), len(corpus.words)
+
+
+@benchmark(u'Variety')
+def varietyResampled(corpus, caller):
+    _requireOrange()
+    return partial(
+        Processor.variety_in_context, caller,
+        units={u'segmentation': corpus.words},
+        contexts={u'segmentation': corpus.documents},
+        apply_resampling=True, subsample_size=100, num_subsamples=20,
+    ), len(corpus.words)
+
+
+# Category...
+
+@benchmark(u'Category')
+def annotateContexts(corpus, caller):
+    _requireOrange()
+    return partial(
+        Processor.annotate_contexts, caller,
+        units={
+            u'segmentation': corpus.words,
+            u'annotation_key': corpus.categoryKey,
+        },
+        multiple_values={
+            u'sort_order': u'Frequency', u'reverse': True,
+            u'keep_only_first': True, u'value_delimiter': u'|',
+        },
+        contexts={u'segmentation': corpus.sentences},
+        iterations=len(corpus.sentences),
+    ), len(corpus.words)
+
+
+# Context...
+
+@benchmark(u'Context')
+def neighbors(corpus, caller):
+    _requireOrange()
+    return partial(
+        Processor.neighbors, caller,
+        units={u'segmentation': corpus.keywords},
+        contexts={
+            u'segmentation': corpus.words, u'max_distance': 5,
+            u'merge_strings': False,
+        },
+        iterations=len(corpus.keywords),
+    ), len(corpus.keywords)
+
+
+@benchmark(u'Context')
+def collocations(corpus, caller):
+    _requireOrange()
+    return partial(
+        Processor.collocations, caller,
+        units=corpus.keywords,
+        contexts={
+            u'segmentation': corpus.words, u'max_distance': 5,
+            u'min_frequency': 2, u'merge_strings': False,
+        },
+        iterations=len(corpus.keywords),
+    ), len(corpus.keywords)
+
+
+@benchmark(u'Context')
+def containingSegmentation(corpus, caller):
+    _requireOrange()
+    return partial(
+        Processor.context, caller,
+        units={u'segmentation': corpus.keywords},
+        contexts={u'segmentation': corpus.sentences, u'max_num_chars': 50},
+        iterations=len(corpus.keywords),
+    ), len(corpus.keywords)
+
+
+# Cooccurrence...
+
+@benchmark(u'Cooccurrence')
+def coocInWindow(corpus, caller):
+    _requireOrange()
+    return partial(
+        Processor.cooc_in_window, caller,
+        units={u'segmentation': corpus.keywords},
+        window_size=5, iterations=len(corpus.keywords),
+    ), len(corpus.keywords)
+
+
+@benchmark(u'Cooccurrence')
+def coocInContext(corpus, caller):
+    _requireOrange()
+    return partial(
+        Processor.cooc_in_context, caller,
+        units={u'segmentation': corpus.keywords},
+        contexts={u'segmentation': corpus.sentences},
+        iterations=len(corpus.sentences) * 2,
+    ), len(corpus.keywords)
+
+
+# Convert...
+
+def _getNumCells(table):
+    return len(table.row_ids) * len(table.col_ids)
+
+
+@benchmark(u'Convert', u'cells')
+def sortAndTranspose(corpus, caller):
+    table = corpus.table
+    def sortAndTransposeTable():
+        return table.to_sorted(
+            table.col_ids[0], True, table.row_ids[0], False, caller=caller,
+        ).to_transposed(caller=caller)
+    return sortAndTransposeTable, _getNumCells(table)
+
+
+@benchmark(u'Convert', u'cells')
+def normalize(corpus, caller):
+    return partial(
+        corpus.table.to_normalized, mode=u'TF-IDF', type=u'l2',
+        caller=caller,
+    ), _getNumCells(corpus.table)
+
+
+@benchmark(u'Convert', u'cells')
+def associationMatrix(corpus, caller):
+    # Association between documents (rather than between the thousands of
+    # words, which would take minutes)...
+    table = corpus.table.to_transposed()
+    return partial(
+        table.to_association_matrix, bias=u'frequent', caller=caller,
+    ), _getNumCells(table)
+
+
+@benchmark(u'Convert', u'cells')
+def flatten(corpus, caller):
+    return partial(corpus.table.to_flat, caller=caller), \
+        _getNumCells(corpus.table)
+
+
+@benchmark(u'Convert', u'cells')
+def exportTable(corpus, caller):
+    return partial(
+        corpus.table.to_string, col_delimiter=u'\t', row_delimiter=u'\n',
+        caller=caller,
+    ), _getNumCells(corpus.table)
+
+
+@benchmark(u'Convert', u'cells')
+def orangeTable(corpus, caller):
+    _requireOrange()
+    return partial(corpus.table.to_orange_table, caller=caller), \
+        _getNumCells(corpus.table)
+
+
+# Display...
+
+@benchmark(u'Display')
+def displayFormatted(corpus, caller):
+    return partial(
+        corpus.words.to_string,
+        u'%(__num__)s\t%(__content__)s\t%(category)s',
+        u'\n', humanize_addresses=True, display_all=True,
+    ), len(corpus.words)
+
+
+@benchmark(u'Display')
+def displayHTML(corpus, caller):
+    return partial(
+        corpus.words.to_html, True, display_all=True,
+    ), len(corpus.words)
+
+
+# Interchange...
+
+@benchmark(u'Interchange')
+def segmentationToTable(corpus, caller):
+    _requireOrange()
+    from _textable.widgets.TextableInterchange import (
+        segmentationToTable as convert
+    )
+    return partial(convert, corpus.words, 100), len(corpus.words)
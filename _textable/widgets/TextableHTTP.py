@@ -0,0 +1,747 @@
+"""
+Module TextableHTTP.py
+Copyright 2012-2025 Aris Xanthos
+-----------------------------------------------------------------------------
+This file is part of the Orange3-Textable package.
+
+Orange3-Textable is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Orange3-Textable is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Orange3-Textable. If not, see <http://www.gnu.org/licenses/>.
+-----------------------------------------------------------------------------
+HTTP helpers for Textable's URLs widget. Like TextableIO, this module must
+not import Qt or Orange.
+-----------------------------------------------------------------------------
+Provides classes:
+- Response
+- PermanentError
+- ContentTooLarge
+- IncompleteContent
+- ConnectionPool
+- URLFetcher
+- HTTPCache
+- URLArchive
+-----------------------------------------------------------------------------
+Provides functions:
+- fetchURL
+- isRetryable
+- describeError
+"""
+
+__version__ = '0.10'
+
+import json
+import zlib
+import heapq
+import sys
+import ssl
+import socket
+import sqlite3
+import threading
+import collections
+import http.client
+import concurrent.futures
+from functools import partial
+from urllib.parse import urlsplit, urlunsplit, urljoin
+from urllib.error import HTTPError, URLError
+from urllib.request import getproxies, proxy_bypass
+
+from _textable.widgets.TextableIO import ReadCancelled, DiskCache
+
+# Number of bytes read from a URL at once...
+CHUNK_LENGTH = 2**16
+
+# Number of characters written to a cache entry at once...
+CACHE_CHUNK_LENGTH = 1000000
+
+# Result of fetching a URL: HTTP status code, response headers (an
+# http.client.HTTPMessage) and content (as bytes)...
+Response = collections.namedtuple('Response', ['status', 'headers', 'content'])
+
+# Content codings that servers are told they may use...
+ACCEPT_ENCODING = 'gzip, deflate'
+
+# Same User-Agent header as urllib.request.urlopen...
+USER_AGENT = 'Python-urllib/%i.%i' % sys.version_info[:2]
+
+# Redirections that are followed (at most MAX_REDIRECTS times)...
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 10
+
+
+class PermanentError(IOError):
+    """Raised when a URL can't be fetched and retrying wouldn't help (e.g.
+    its scheme isn't supported)
+    """
+    pass
+
+
+class ContentTooLarge(PermanentError):
+    """Raised when the content of a URL exceeds the maximum size"""
+    pass
+
+
+class IncompleteContent(IOError):
+    """Raised when the server closes the connection before it has sent
+    the whole content of a URL (which may succeed if retried)
+    """
+    pass
+
+
+def fetchURL(
+    URL, onChunk=None, headers=None, timeout=None, maxSize=0, pool=None
+):
+    """Fetch the content of a URL and return a Response.
+
+    If pool is not None, it is the ConnectionPool used for connecting to
+    servers (so that connections are reused across calls). Redirections
+    are followed.
+
+    If timeout is not None, IOError is raised whenever the server doesn't
+    respond (or send data) for this number of seconds.
+
+    The server may compress the content (with gzip or deflate), in which
+    case it is decompressed as it is read. If maxSize is not 0, reading
+    stops and ContentTooLarge is raised as soon as the (decompressed)
+    content is known to exceed this number of bytes.
+
+    Headers (a dict) are added to the request, e.g. for conditional
+    requests; if the server answers that the content wasn't modified, the
+    Response has status 304 and empty content.
+
+    The content is read in chunks; if onChunk is not None, it is called
+    after each chunk with the number of bytes read so far and the expected
+    number of bytes (None if the server didn't send a Content-Length), both
+    counting bytes as transferred (i.e. possibly compressed), and it may
+    raise ReadCancelled to interrupt reading. Raise IOError if the
+    URL can't be retrieved (HTTPError if the server answers with an error
+    status, IncompleteContent if the connection is closed before the
+    number of bytes given by Content-Length has been read).
+    """
+    headers = dict(headers or ())
+    headers.setdefault('Accept-Encoding', ACCEPT_ENCODING)
+    headers.setdefault('User-Agent', USER_AGENT)
+    if pool is None:
+        pool = ConnectionPool(0)
+    try:
+        for _ in range(MAX_REDIRECTS + 1):
+            connection, response = pool.request(URL, headers, timeout)
+            location = response.getheader('Location')
+            if response.status not in REDIRECT_CODES or not location:
+                break
+            pool.discard(connection, response)
+            URL = urljoin(URL, location)
+        else:
+            raise PermanentError(u"too many redirections")
+    except http.client.HTTPException as e:
+        raise IOError(describeError(e))
+    if response.status == 304 or response.status >= 400:
+        pool.discard(connection, response)
+        if response.status == 304:
+            return Response(304, response.headers, b"")
+        raise HTTPError(
+            URL, response.status, response.reason, response.headers, None
+        )
+    chunks = list()
+    try:
+        decompressor = _Decompressor(
+            response.getheader('Content-Encoding', ''),
+            maxSize,
+        )
+        length = response.getheader('Content-Length', '')
+        length = int(length) if length.isdigit() else None
+        if length and maxSize and not decompressor.decompressing:
+            decompressor.checkSize(length)
+        numBytes = 0
+        try:
+            for data in iter(lambda: response.read(CHUNK_LENGTH), b""):
+                chunks.append(decompressor.decompress(data))
+                numBytes += len(data)
+                if onChunk is not None:
+                    onChunk(numBytes, length)
+        except http.client.IncompleteRead as e:
+            numBytes += len(e.partial)
+            raise IncompleteContent(
+                u"incomplete content (%i of %i bytes)" % (numBytes, length)
+                if length else u"incomplete content"
+            )
+        except http.client.HTTPException as e:
+            raise IOError(describeError(e))
+        if length is not None and numBytes < length:
+            raise IncompleteContent(
+                u"incomplete content (%i of %i bytes)" % (numBytes, length)
+            )
+        chunks.append(decompressor.flush())
+    except BaseException:
+        pool.abandon(connection)
+        raise
+    pool.release(connection, response)
+    return Response(response.status, response.headers, b"".join(chunks))
+
+
+class ConnectionPool(object):
+    """Persistent (keep-alive) HTTP connections, reused across requests
+
+    At most maxIdle idle connections are kept per host (and port and
+    scheme); with 0, connections are closed after each request. Requests
+    through a proxy are supported for proxies specified by environment
+    variables. A pool may be used by several threads at once, each
+    connection being used by one thread at a time. Attributes
+    numOpened and numReused count the connections opened and the
+    requests sent over an already used connection.
+
+    Connections handed out by request are in use until they are passed
+    to release, discard or abandon; abort interrupts reads and writes on
+    them at once (e.g. when fetching is cancelled).
+    """
+
+    def __init__(self, maxIdle):
+        """Initialize a ConnectionPool instance"""
+        self.maxIdle = maxIdle
+        self.lock = threading.Lock()
+        self.idle = collections.defaultdict(list)
+        self.inUse = set()
+        self.proxies = getproxies()
+        self.closed = False
+        self.numOpened = 0
+        self.numReused = 0
+
+    def request(self, URL, headers, timeout=None):
+        """Send a GET request and return (connection, HTTPResponse)
+
+        The response's content is not read; the connection must then be
+        passed to release (or discard) or closed.
+        """
+        parts = urlsplit(URL)
+        scheme = parts.scheme.lower()
+        if scheme not in ('http', 'https'):
+            raise PermanentError(u"unknown URL scheme %s" % scheme)
+        if not parts.hostname:
+            raise PermanentError(u"no host given")
+        target = parts.path or u'/'
+        if parts.query:
+            target += u'?' + parts.query
+        proxy = self.proxies.get(scheme)
+        if proxy and not proxy_bypass(parts.hostname):
+            proxy = urlsplit(proxy if '//' in proxy else '//' + proxy)
+            if scheme == 'http':
+                key = ('http', proxy.netloc, None)
+                target = urlunsplit(parts._replace(fragment=u''))
+            else:
+                key = ('https', proxy.netloc, parts.netloc)
+        else:
+            key = (scheme, parts.netloc, None)
+        for attempt in range(2):
+            connection, reused = self._getConnection(key, timeout)
+            try:
+                connection.request('GET', target, headers=headers)
+                return connection, connection.getresponse()
+            except (ConnectionError, http.client.BadStatusLine):
+                self.abandon(connection)
+                # A reused connection may have been closed by the server
+                # in the meantime, so try again with a new one...
+                if not reused or attempt:
+                    raise
+            except BaseException:
+                self.abandon(connection)
+                raise
+
+    def release(self, connection, response):
+        """Keep the connection of a fully read response for reuse"""
+        with self.lock:
+            self.inUse.discard(connection)
+            if (
+                response.isclosed() and not response.will_close
+                and connection.sock is not None
+            ):
+                idle = self.idle[connection.poolKey]
+                if not self.closed and len(idle) < self.maxIdle:
+                    idle.append(connection)
+                    return
+        connection.close()
+
+    def abandon(self, connection):
+        """Close a connection whose response won't be read (e.g. after an
+        error)
+        """
+        with self.lock:
+            self.inUse.discard(connection)
+        connection.close()
+
+    def abort(self):
+        """Shut down the sockets of connections in use, so that threads
+        reading from (or writing to) them get an error at once
+
+        Connection attempts in progress (and TLS handshakes) aren't
+        interrupted: they last until they succeed or time out, and the
+        connection is then closed when it is released.
+        """
+        with self.lock:
+            self.closed = True
+            connections = list(self.inUse)
+        for connection in connections:
+            sock = connection.sock
+            if sock is None:
+                continue
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def discard(self, connection, response):
+        """Release the connection of a response whose content (if short)
+        isn't needed
+        """
+        try:
+            response.read(CHUNK_LENGTH)
+        except (IOError, http.client.HTTPException):
+            pass
+        self.release(connection, response)
+
+    def close(self):
+        """Close idle connections (and those released from now on)"""
+        with self.lock:
+            self.closed = True
+            for idle in self.idle.values():
+                for connection in idle:
+                    connection.close()
+            self.idle.clear()
+
+    def _getConnection(self, key, timeout):
+        with self.lock:
+            idle = self.idle[key]
+            while idle:
+                connection = idle.pop()
+                connection.timeout = timeout
+                try:
+                    connection.sock.settimeout(timeout)
+                except OSError:
+                    connection.close()
+                    continue
+                self.numReused += 1
+                self.inUse.add(connection)
+                return connection, True
+            self.numOpened += 1
+        scheme, netloc, tunnel = key
+        if scheme == 'https':
+            connection = http.client.HTTPSConnection(netloc, timeout=timeout)
+            if tunnel is not None:
+                connection.set_tunnel(tunnel)
+        else:
+            connection = http.client.HTTPConnection(netloc, timeout=timeout)
+        connection.poolKey = key
+        with self.lock:
+            self.inUse.add(connection)
+        return connection, False
+
+
+class _Decompressor(object):
+    """Incremental decoder for the content coding of a response, which
+    raises ContentTooLarge as soon as the decoded content exceeds maxSize
+    bytes (if not 0)
+    """
+
+    def __init__(self, contentEncoding, maxSize=0):
+        contentEncoding = contentEncoding.strip().lower()
+        if contentEncoding in ('', 'identity'):
+            self.decompressor = None
+        elif contentEncoding in ('gzip', 'x-gzip'):
+            self.decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif contentEncoding == 'deflate':
+            self.decompressor = zlib.decompressobj(zlib.MAX_WBITS)
+        else:
+            raise PermanentError(
+                u"unsupported content coding %s" % contentEncoding
+            )
+        self.decompressing = self.decompressor is not None
+        self.isDeflate = contentEncoding == 'deflate'
+        self.maxSize = maxSize
+        self.size = 0
+
+    def checkSize(self, size):
+        if self.maxSize and size > self.maxSize:
+            raise ContentTooLarge(
+                u"content exceeds %i bytes" % self.maxSize
+            )
+
+    def decompress(self, data):
+        if not self.decompressing:
+            output = data
+        else:
+            # Decompress at most one byte beyond the limit, so that highly
+            # compressed content can't fill memory...
+            maxLength = self.maxSize - self.size + 1 if self.maxSize else 0
+            try:
+                output = self.decompressor.decompress(data, maxLength)
+            except zlib.error:
+                # Some servers send raw deflate data instead of the zlib
+                # format required by HTTP...
+                if not (self.isDeflate and self.size == 0):
+                    raise IOError(u"corrupt compressed content")
+                self.isDeflate = False
+                self.decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+                return self.decompress(data)
+        self.size += len(output)
+        self.checkSize(self.size)
+        return output
+
+    def flush(self):
+        if not self.decompressing:
+            return b""
+        try:
+            output = self.decompressor.flush()
+        except zlib.error:
+            raise IOError(u"corrupt compressed content")
+        self.size += len(output)
+        self.checkSize(self.size)
+        return output
+
+
+def isRetryable(error):
+    """Return True if fetching a URL may succeed after some error
+
+    Errors are deemed transient (e.g. refused connections, timeouts and
+    HTTP errors 408, 429 and 5xx), except PermanentError and failed
+    verification of the server's certificate.
+    """
+    if isinstance(error, HTTPError):
+        return error.code in (408, 429) or error.code >= 500
+    if isinstance(error, (PermanentError, ssl.CertificateError)):
+        return False
+    return isinstance(error, IOError)
+
+
+def describeError(error):
+    """Return a short description of an error raised by fetchURL"""
+    if isinstance(error, HTTPError):
+        return u"HTTP error %i" % error.code
+    if isinstance(error, URLError):
+        error = error.reason
+    if isinstance(error, socket.timeout):
+        return u"timed out"
+    return str(error) or error.__class__.__name__
+
+
+class URLFetcher(object):
+    """Fetch URLs concurrently with global and per-host connection limits.
+
+    At most maxConnections URLs are fetched at once (each in a thread), and
+    at most maxPerHost of them from the same host. Among the URLs that can
+    be started within these limits, those submitted first are started
+    first, so that results come in roughly in the order in which they are
+    consumed.
+
+    Requests time out after timeout seconds without an answer (see
+    fetchURL). Failed requests are retried up to retries times if the
+    error is transient (see isRetryable), after a delay that starts at
+    backoff seconds and doubles after each attempt. Content larger than
+    maxSize bytes (if not 0) is not downloaded beyond this size. At most
+    poolSize idle connections per host are kept open for reuse (see
+    ConnectionPool, available as attribute pool).
+    """
+
+    def __init__(
+        self, maxConnections, maxPerHost, timeout=None, retries=0, backoff=1,
+        maxSize=0, poolSize=0,
+    ):
+        """Initialize a URLFetcher instance"""
+        self.maxConnections = max(maxConnections, 1)
+        self.maxPerHost = max(maxPerHost, 1)
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.maxSize = maxSize
+        self.pool = ConnectionPool(poolSize)
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.maxConnections,
+        )
+        self.lock = threading.Lock()
+        self.cancelled = threading.Event()
+        self.queues = collections.defaultdict(collections.deque)
+        self.active = collections.Counter()
+        self.ready = list()         # Heap of (first queued index, host).
+        self.numRunning = 0
+        self.numSubmitted = 0
+        self.fractions = dict()     # Fetched fraction of each started URL.
+
+    def fetch(self, URLs, headers=None):
+        """Schedule URLs and return futures for their Responses
+
+        The futures are returned in the same order as the URLs. Their
+        result is the Response returned by fetchURL, or the exception it
+        raised. If headers is not None, it is a list of request headers
+        (see fetchURL) for each URL.
+        """
+        futures = list()
+        if headers is None:
+            headers = [None] * len(URLs)
+        with self.lock:
+            for URL, URLHeaders in zip(URLs, headers):
+                future = concurrent.futures.Future()
+                futures.append(future)
+                host = urlsplit(URL).netloc.lower()
+                queue = self.queues[host]
+                if not queue and self.active[host] < self.maxPerHost:
+                    heapq.heappush(self.ready, (self.numSubmitted, host))
+                queue.append((self.numSubmitted, URL, URLHeaders, future))
+                self.numSubmitted += 1
+            self._dispatch()
+        return futures
+
+    def getProgress(self):
+        """Return the number of URLs fetched so far (a float, since URLs
+        being fetched count for the fraction of their content received)
+        """
+        with self.lock:
+            return sum(self.fractions.values())
+
+    def cancel(self):
+        """Interrupt running fetches and drop pending ones
+
+        Fetches waiting for (or reading) data are interrupted at once (see
+        ConnectionPool.abort); those still connecting to their server stop
+        when the connection is established or times out.
+        """
+        self.cancelled.set()
+        with self.lock:
+            for queue in self.queues.values():
+                for _, _, _, future in queue:
+                    future.cancel()
+                queue.clear()
+            del self.ready[:]
+        self.pool.abort()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        """Release the fetcher (interrupting any fetch still running)"""
+        self.cancel()
+        self.pool.close()
+
+    def _dispatch(self):
+        """Start queued URLs within the limits (with lock held)"""
+        while self.numRunning < self.maxConnections and self.ready:
+            _, host = heapq.heappop(self.ready)
+            queue = self.queues[host]
+            index, URL, headers, future = queue.popleft()
+            if not future.set_running_or_notify_cancel():
+                if queue:
+                    heapq.heappush(self.ready, (queue[0][0], host))
+                continue
+            self.active[host] += 1
+            self.numRunning += 1
+            if queue and self.active[host] < self.maxPerHost:
+                heapq.heappush(self.ready, (queue[0][0], host))
+            self.fractions[index] = 0
+            self.executor.submit(
+                self._run, index, host, URL, headers, future
+            )
+
+    def _run(self, index, host, URL, headers, future):
+        try:
+            onChunk = partial(self._onChunk, index)
+            for attempt in range(self.retries + 1):
+                if self.cancelled.is_set():
+                    raise ReadCancelled()
+                try:
+                    response = fetchURL(
+                        URL, onChunk, headers, self.timeout, self.maxSize,
+                        self.pool,
+                    )
+                    # (Content cut short by cancellation isn't returned.)
+                    if self.cancelled.is_set():
+                        raise ReadCancelled()
+                    break
+                except IOError as exc:
+                    # Errors caused by aborting connections on cancellation
+                    # are reported as such...
+                    if self.cancelled.is_set():
+                        raise ReadCancelled()
+                    if attempt == self.retries or not isRetryable(exc):
+                        raise
+                self.fractions[index] = 0
+                self.cancelled.wait(self.backoff * 2 ** attempt)
+            future.set_result(response)
+        except BaseException as exc:
+            future.set_exception(exc)
+        finally:
+            with self.lock:
+                self.fractions[index] = 1
+                self.active[host] -= 1
+                self.numRunning -= 1
+                queue = self.queues[host]
+                if queue and self.active[host] == self.maxPerHost - 1:
+                    heapq.heappush(self.ready, (queue[0][0], host))
+                self._dispatch()
+
+    def _onChunk(self, index, numBytes, length):
+        if self.cancelled.is_set():
+            raise ReadCancelled()
+        if length:
+            self.fractions[index] = min(numBytes / length, 1)
+
+
+class HTTPCache(DiskCache):
+    """A DiskCache for decoded and normalized URL contents
+
+    Entries store a JSON object on their first line, with the encoding
+    that was used for decoding, the validators sent by the server ('etag'
+    and 'lastModified', possibly None) and the time when the content was
+    fetched or last revalidated ('fetchTime'), and the (utf-8 encoded)
+    content on the following ones.
+
+    When an entry is revalidated (see revalidate()), its new validators and
+    fetch time are stored in a separate small entry rather than rewriting
+    the content, and they supersede those of the entry if they are more
+    recent.
+    """
+
+    def get(self, key):
+        """Return the entry stored for a key (a dict with the above keys
+        and the content under 'content'), or None
+        """
+        path = self.getPath(key)
+        try:
+            with open(path, encoding='utf-8', newline='') as fh:
+                entry = json.loads(fh.readline())
+                entry['content'] = fh.read()
+        except (OSError, ValueError):
+            return None
+        self.touch(path)
+        revalidationPath = self.getPath(self._getRevalidationKey(key))
+        try:
+            with open(revalidationPath, encoding='utf-8') as fh:
+                revalidation = json.loads(fh.read())
+        except (OSError, ValueError):
+            return entry
+        self.touch(revalidationPath)
+        if revalidation['fetchTime'] > entry['fetchTime']:
+            entry.update(revalidation)
+        return entry
+
+    def put(self, key, content, encoding, etag, lastModified, fetchTime):
+        """Store the content of a URL and its validators under a key"""
+        entry = {
+            'encoding': encoding,
+            'etag': etag,
+            'lastModified': lastModified,
+            'fetchTime': fetchTime,
+        }
+        try:
+            fh, tempPath = self.newEntryFile()
+        except OSError:
+            return
+        try:
+            with fh:
+                fh.write((json.dumps(entry) + u'\n').encode('utf-8'))
+                for index in range(0, len(content), CACHE_CHUNK_LENGTH):
+                    chunk = content[index:index+CACHE_CHUNK_LENGTH]
+                    fh.write(chunk.encode('utf-8'))
+            self.commit(tempPath, key)
+        except OSError:
+            self.discard(tempPath)
+
+    def revalidate(self, key, etag, lastModified, fetchTime):
+        """Record that the content stored under a key is still valid, with
+        new validators and fetch time (without rewriting the content)
+        """
+        revalidation = {
+            'etag': etag,
+            'lastModified': lastModified,
+            'fetchTime': fetchTime,
+        }
+        try:
+            fh, tempPath = self.newEntryFile()
+        except OSError:
+            return
+        try:
+            with fh:
+                fh.write(json.dumps(revalidation).encode('utf-8'))
+            self.commit(tempPath, self._getRevalidationKey(key))
+        except OSError:
+            self.discard(tempPath)
+
+    @staticmethod
+    def _getRevalidationKey(key):
+        return ('revalidation', key)
+
+    @staticmethod
+    def getConditionalHeaders(entry):
+        """Return the headers for revalidating an entry"""
+        headers = dict()
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['lastModified']:
+            headers['If-Modified-Since'] = entry['lastModified']
+        return headers
+
+
+class URLArchive(object):
+    """An SQLite file storing fetched URLs, for replaying them later
+
+    For each URL, the archive stores the Response returned by fetchURL
+    (status, headers and content as raw bytes) and the time when it was
+    fetched. Archived responses are committed to the file on close.
+    Raise IOError if the file can't be opened or isn't an archive.
+    """
+
+    def __init__(self, path):
+        """Open (or create) the archive stored at path"""
+        try:
+            self.connection = sqlite3.connect(path, check_same_thread=False)
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "url TEXT PRIMARY KEY, status INTEGER, headers TEXT, "
+                "content BLOB, fetchTime REAL)"
+            )
+        except sqlite3.Error as e:
+            raise IOError(u"couldn't open archive %s (%s)" % (path, e))
+
+    def get(self, URL):
+        """Return the Response archived for a URL, or None"""
+        try:
+            row = self.connection.execute(
+                "SELECT status, headers, content FROM responses "
+                "WHERE url = ?",
+                (URL,),
+            ).fetchone()
+        except sqlite3.Error as e:
+            raise IOError(str(e))
+        if row is None:
+            return None
+        headers = http.client.HTTPMessage()
+        for name, value in json.loads(row[1]):
+            headers[name] = value
+        return Response(row[0], headers, row[2])
+
+    def put(self, URL, response, fetchTime):
+        """Archive the Response fetched for a URL"""
+        try:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (
+                    URL,
+                    response.status,
+                    json.dumps(list(response.headers.items())),
+                    response.content,
+                    fetchTime,
+                ),
+            )
+        except sqlite3.Error as e:
+            raise IOError(str(e))
+
+    def close(self):
+        """Commit archived responses and close the file"""
+        try:
+            self.connection.commit()
+        except sqlite3.Error as e:
+            raise IOError(str(e))
+        finally:
+            self.connection.close()
@@ -0,0 +1,412 @@
+"""
+Module TextableHeadless.py
+Copyright 2012-2025 Aris Xanthos
+-----------------------------------------------------------------------------
+This file is part of the Orange3-Textable package.
+
+Orange3-Textable is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Orange3-Textable is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Orange3-Textable. If not, see <http://www.gnu.org/licenses/>.
+-----------------------------------------------------------------------------
+Headless execution of Orange workflows (.ows files) made of Textable
+widgets, e.g. for batch jobs on servers (see "python -m _textable run").
+
+Widgets are created with the settings stored in the workflow (with
+"Send automatically" on) and without showing them, on an offscreen Qt
+platform. Each widget is run once all widgets it gets input from have
+finished, and the values sent by its outputs are passed on to the widgets
+it is linked to. Widgets whose inputs are ready are run concurrently, up
+to a given number of them.
+-----------------------------------------------------------------------------
+Provides classes:
+- Workflow
+- HeadlessSignalManager
+- HeadlessRunner
+-----------------------------------------------------------------------------
+Provides functions:
+- setMemoryLimit
+- writeOutput
+- getOutputBasePath
+"""
+
+__version__ = '0.1.1'
+
+import os
+import re
+import ast
+import sys
+import time
+import base64
+import pickle
+import importlib
+import collections
+import xml.etree.ElementTree as ElementTree
+
+# Widgets are never shown, so no display is needed...
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from AnyQt.QtWidgets import QApplication
+
+from LTTL.Segmentation import Segmentation
+
+from _textable.widgets.TextableUtils import TEXTABLE_TABLE_TYPES
+
+# Seconds between checks for the end of widget processing...
+POLL_INTERVAL = 0.01
+
+
+class Workflow(object):
+    """Nodes, links and node settings read from an .ows file
+
+    Attribute nodes maps node ids to dicts with keys 'id', 'title' and
+    'qualifiedName' (of the widget class) and 'settings'; links is a list
+    of dicts with keys 'source', 'sink' (node ids), 'sourceChannel' and
+    'sinkChannel' (channel names).
+    """
+
+    def __init__(self, path):
+        """Read a workflow from an .ows file (raise ValueError if it is not
+        a valid workflow)
+        """
+        try:
+            root = ElementTree.parse(path).getroot()
+        except ElementTree.ParseError as exc:
+            raise ValueError(u"Invalid workflow file (%s)." % exc)
+        if root.tag != 'scheme':
+            raise ValueError(u"Invalid workflow file (no scheme element).")
+        self.title = root.get('title', u'')
+        self.nodes = collections.OrderedDict()
+        for element in root.iter('node'):
+            self.nodes[element.get('id')] = {
+                'id': element.get('id'),
+                'title': element.get('title') or element.get('name'),
+                'qualifiedName': element.get('qualified_name'),
+                'settings': None,
+            }
+        self.links = list()
+        for element in root.iter('link'):
+            if element.get('enabled', 'true') != 'true':
+                continue
+            self.links.append({
+                'source': element.get('source_node_id'),
+                'sink': element.get('sink_node_id'),
+                'sourceChannel': element.get('source_channel'),
+                'sinkChannel': element.get('sink_channel'),
+            })
+        for element in root.iter('properties'):
+            node = self.nodes.get(element.get('node_id'))
+            if node is not None:
+                node['settings'] = self._loadProperties(element)
+
+    def _loadProperties(self, element):
+        """Decode the settings stored in a properties element"""
+        text = (element.text or u'').strip()
+        if not text:
+            return None
+        fmt = element.get('format', 'pickle')
+        try:
+            if fmt == 'literal':
+                return ast.literal_eval(text)
+            elif fmt == 'pickle':
+                return pickle.loads(base64.b64decode(text))
+        except Exception as exc:
+            raise ValueError(
+                u"Invalid settings for node %s (%s)."
+                % (element.get('node_id'), exc)
+            )
+        raise ValueError(u"Unsupported settings format '%s'." % fmt)
+
+    def getSources(self, nodeId):
+        """Return the ids of nodes that a node gets input from"""
+        return {
+            link['source'] for link in self.links if link['sink'] == nodeId
+        }
+
+    def getOrder(self):
+        """Return node ids in an order where each node comes after those it
+        gets input from (raise ValueError if links form a cycle)
+        """
+        order = list()
+        done = set()
+        remaining = list(self.nodes)
+        while remaining:
+            ready = [
+                nodeId for nodeId in remaining
+                if self.getSources(nodeId) <= done
+            ]
+            if not ready:
+                raise ValueError(u"Workflow links form a cycle.")
+            order.extend(ready)
+            done.update(ready)
+            remaining = [n for n in remaining if n not in done]
+        return order
+
+
+class HeadlessSignalManager(object):
+    """Stand-in for the canvas signal manager, recording the values sent
+    by widgets through their outputs
+    """
+
+    def __init__(self):
+        """Initialize a HeadlessSignalManager instance"""
+        # (widget, channel name) -> {signal id: value}...
+        self.outputs = dict()
+
+    def send(self, widget, channelName, value, *args, **kwargs):
+        """Record a value sent by a widget"""
+        signalId = args[0] if args else kwargs.get('id')
+        values = self.outputs.setdefault((widget, channelName), dict())
+        values[signalId] = value
+
+    def getOutputs(self, widget):
+        """Return a dict mapping channel names of a widget to the values
+        sent through them (one per signal id)
+        """
+        return {
+            channelName: values
+            for (sender, channelName), values in self.outputs.items()
+            if sender is widget
+        }
+
+    def __getattr__(self, name):
+        # Other notifications of the canvas signal manager are ignored...
+        return _ignore
+
+
+def _ignore(*args, **kwargs):
+    return None
+
+
+class HeadlessRunner(object):
+    """Run the widgets of a Workflow without GUI
+
+    Attribute results maps node ids to dicts with keys 'title', 'state'
+    and 'message' (the last info box message of the widget), 'duration'
+    (in seconds) and 'outputs' (see HeadlessSignalManager.getOutputs).
+    """
+
+    def __init__(self, workflow, maxWorkers=1, log=None):
+        """Initialize a HeadlessRunner instance
+
+        maxWorkers is the maximum number of widgets processing at the same
+        time (and is passed on to widgets with a numWorkers setting).
+        Progress messages are written to log (a file object), if any.
+        """
+        self.workflow = workflow
+        self.maxWorkers = max(1, maxWorkers)
+        self.log = log
+        self.signalManager = HeadlessSignalManager()
+        self.widgets = dict()
+        self.results = collections.OrderedDict()
+        # Ids of nodes whose widget was created with autoSend off...
+        self._unsent = set()
+
+    def run(self):
+        """Run all widgets and return results (see class docstring)"""
+        self.app = QApplication.instance() or QApplication([sys.argv[0]])
+        pending = self.workflow.getOrder()
+        running = dict()
+        done = set()
+        try:
+            while pending or running:
+                for nodeId in list(pending):
+                    if len(running) >= self.maxWorkers:
+                        break
+                    if self.workflow.getSources(nodeId) <= done:
+                        pending.remove(nodeId)
+                        running[nodeId] = time.monotonic()
+                        self._start(nodeId)
+                self.app.processEvents()
+                for nodeId, startTime in list(running.items()):
+                    if self._isIdle(self.widgets[nodeId]):
+                        del running[nodeId]
+                        done.add(nodeId)
+                        self._finish(nodeId, time.monotonic() - startTime)
+                if running:
+                    time.sleep(POLL_INTERVAL)
+        finally:
+            for widget in self.widgets.values():
+                widget.onDeleteWidget()
+                widget.deleteLater()
+            self.app.processEvents()
+        return self.results
+
+    def _start(self, nodeId):
+        """Create the widget of a node and send it its inputs"""
+        node = self.workflow.nodes[nodeId]
+        self._print(u"Running %s..." % node['title'])
+        widget = self._createWidget(node)
+        self.widgets[nodeId] = widget
+        inputs = {
+            signal.name: signal
+            for signal in type(widget).get_signals('inputs')
+        }
+        for link in self.workflow.links:
+            if link['sink'] != nodeId:
+                continue
+            source = self.widgets[link['source']]
+            signal = inputs.get(link['sinkChannel'])
+            if signal is None:
+                raise ValueError(
+                    u"Widget %s has no input named '%s'."
+                    % (node['title'], link['sinkChannel'])
+                )
+            handler = getattr(widget, signal.handler)
+            values = self.signalManager.getOutputs(source).get(
+                link['sourceChannel'], {None: None}
+            )
+            for signalId, value in values.items():
+                if getattr(signal, 'single', True):
+                    handler(value)
+                else:
+                    handler(value, (link['source'], signalId, source))
+        widget.handleNewSignals()
+        # Widgets without inputs only send on creation if autoSend was on
+        # (those with inputs send when they get them)...
+        if nodeId in self._unsent and not self.workflow.getSources(nodeId):
+            widget.sendButton.sendIf()
+
+    def _createWidget(self, node):
+        """Create the widget of a node with its stored settings"""
+        moduleName, _, className = node['qualifiedName'].rpartition('.')
+        try:
+            widgetClass = getattr(
+                importlib.import_module(moduleName), className
+            )
+        except (ImportError, AttributeError) as exc:
+            raise ValueError(
+                u"Can't load widget %s (%s)." % (node['title'], exc)
+            )
+        settings = dict(node['settings'] or {})
+        # Widgets process their input as soon as it arrives...
+        settings['autoSend'] = True
+        if self.maxWorkers > 1 and 'numWorkers' in settings:
+            settings['numWorkers'] = self.maxWorkers
+        widget = widgetClass.__new__(
+            widgetClass,
+            signal_manager=self.signalManager,
+            stored_settings=settings,
+        )
+        widget.__init__()
+        widget.setCaption(node['title'])
+        # ... and without waiting for further setting changes...
+        sendButton = getattr(widget, 'sendButton', None)
+        if sendButton is not None:
+            sendButton.debounceInterval = 0
+        # Settings saved by another version of the widget are ignored
+        # (see VersionedSettingsHandlerMixin), autoSend included...
+        if not widget.autoSend:
+            if node['settings']:
+                self._print(
+                    u"Settings of %s were saved by another version of the "
+                    u"widget and are ignored." % node['title']
+                )
+            widget.autoSend = True
+            self._unsent.add(node['id'])
+        return widget
+
+    def _isIdle(self, widget):
+        """Return True if a widget has finished processing"""
+        if getattr(widget, '_task', None) is not None:
+            return False
+        sendButton = getattr(widget, 'sendButton', None)
+        timer = getattr(sendButton, 'debounceTimer', None)
+        return timer is None or not timer.isActive()
+
+    def _finish(self, nodeId, duration):
+        """Record the result of a node"""
+        node = self.workflow.nodes[nodeId]
+        widget = self.widgets[nodeId]
+        infoBox = getattr(widget, 'infoBox', None)
+        self.results[nodeId] = {
+            'title': node['title'],
+            'state': getattr(infoBox, 'state', 'ok'),
+            'message': getattr(infoBox, 'message', u''),
+            'duration': duration,
+            'outputs': self.signalManager.getOutputs(widget),
+        }
+        self._print(
+            u"%s: %s (%.2f s)" % (
+                node['title'], self.results[nodeId]['message'], duration
+            )
+        )
+
+    def _print(self, message):
+        if self.log is not None:
+            print(message, file=self.log, flush=True)
+
+
+def setMemoryLimit(maxBytes):
+    """Limit the data memory of the current process (and of each process
+    it starts) to maxBytes, and return the limit that was set, which is
+    lower if maxBytes exceeds the hard limit of the process; raise
+    NotImplementedError if the platform doesn't support it
+
+    The limit applies to the data segment, i.e. (on Linux) to the private
+    writable memory of the process such as its heap, but not to code,
+    shared libraries and mapped files, unlike a limit of the address space
+    (a limit of resident memory, RLIMIT_RSS, isn't enforced by Linux).
+    """
+    try:
+        import resource
+    except ImportError:
+        raise NotImplementedError(
+            u"Memory limits are not supported on this platform."
+        )
+    _, hard = resource.getrlimit(resource.RLIMIT_DATA)
+    if hard != resource.RLIM_INFINITY:
+        maxBytes = min(maxBytes, hard)
+    resource.setrlimit(resource.RLIMIT_DATA, (maxBytes, hard))
+    return maxBytes
+
+
+def writeOutput(value, basePath):
+    """Write a value sent by a widget to a file and return its path
+
+    Segmentations are written as text (the content of one segment per
+    line), Textable tables as tab-separated values, Orange tables in
+    Orange's .tab format and strings as text; other values are pickled.
+    Nothing is written for None (and None is returned).
+    """
+    if value is None:
+        return None
+    if isinstance(value, Segmentation):
+        path = basePath + '.txt'
+        with open(path, 'w', encoding='utf-8', newline='') as fh:
+            fh.write(value.to_string(formatting=u'%(__content__)s'))
+    elif isinstance(value, TEXTABLE_TABLE_TYPES):
+        path = basePath + '.tsv'
+        with open(path, 'w', encoding='utf-8', newline='') as fh:
+            fh.write(value.to_string())
+    elif isinstance(value, str):
+        path = basePath + '.txt'
+        with open(path, 'w', encoding='utf-8', newline='') as fh:
+            fh.write(value)
+    elif type(value).__module__.startswith('Orange.data'):
+        path = basePath + '.tab'
+        value.save(path)
+    else:
+        path = basePath + '.pkl'
+        with open(path, 'wb') as fh:
+            pickle.dump(value, fh, pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def getOutputBasePath(directory, node, channelName, signalId=None):
+    """Return the path (without extension) of the file where a value sent
+    by a node is written
+    """
+    parts = [node['id'], node['title'], channelName]
+    if signalId is not None:
+        parts.append(str(signalId))
+    name = u'_'.join(re.sub(r'[^\w.-]+', u'-', p).strip(u'-') for p in parts)
+    return os.path.join(directory, name)
@@ -0,0 +1,924 @@
+"""
+Module TextableIO.py
+Copyright 2012-2025 Aris Xanthos
+-----------------------------------------------------------------------------
+This file is part of the Orange3-Textable package.
+
+Orange3-Textable is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Orange3-Textable is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Orange3-Textable. If not, see <http://www.gnu.org/licenses/>.
+-----------------------------------------------------------------------------
+Input/output helpers for Textable's text import widgets. This module must
+not import Qt or Orange, so that its functions can be run in worker
+processes at low cost.
+-----------------------------------------------------------------------------
+Provides classes:
+- ReadCancelled
+- FileReaderPool
+- DirectoryFiles
+- DiskCache
+- TextFileCache
+- MemoryMonitor
+-----------------------------------------------------------------------------
+Provides functions:
+- readTextFile
+- readTextStream
+- readArchive
+- getArchiveType
+- detectEncoding
+- detectFileEncoding
+- iterNormalizedText
+- getCurrentMemory
+- getCurrentMonitor
+- getFileCacheKey
+- getCacheDirectory
+"""
+
+__version__ = '0.8'
+
+import os
+import sys
+import io
+import time
+import bz2
+import gzip
+import lzma
+import zlib
+import codecs
+import contextlib
+import tarfile
+import zipfile
+import fnmatch
+import hashlib
+import tempfile
+import locale
+import threading
+import multiprocessing
+import concurrent.futures
+from functools import partial
+from unicodedata import normalize
+
+import appdirs
+import chardet
+from chardet.universaldetector import UniversalDetector
+
+CHUNK_LENGTH = 1000000
+
+# Seconds between samples of memory usage (see MemoryMonitor)...
+MEMORY_SAMPLING_INTERVAL = 0.01
+
+# Size of memory pages (in bytes), used for reading memory usage on Linux...
+try:
+    _PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+# Default number of bytes examined for encoding detection...
+DETECTION_SAMPLE_SIZE = 64 * 1024
+
+# Archive file name extensions and corresponding types...
+ARCHIVE_EXTENSIONS = (
+    ('.zip', 'zip'),
+    ('.tar', 'tar'),
+    ('.tar.gz', 'tar'),
+    ('.tgz', 'tar'),
+    ('.tar.bz2', 'tar'),
+    ('.tbz2', 'tar'),
+    ('.tbz', 'tar'),
+    ('.tar.xz', 'tar'),
+    ('.txz', 'tar'),
+    ('.gz', 'gz'),
+    ('.bz2', 'bz2'),
+    ('.xz', 'xz'),
+)
+
+# Functions opening single-file compressed formats...
+COMPRESSED_OPENERS = {
+    'gz': gzip.open,
+    'bz2': bz2.open,
+    'xz': lzma.open,
+}
+
+# Byte order marks and corresponding encodings (utf-32 must precede utf-16,
+# since BOM_UTF32_LE starts with BOM_UTF16_LE)...
+BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# Version of the cached text format; must be increased whenever
+# readTextFile's output for a given file changes...
+FILE_CACHE_FORMAT = 1
+
+# Characters that str.splitlines() treats as line boundaries...
+LINE_BREAKS = u'\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029'
+
+
+class ReadCancelled(Exception):
+    """Exception raised by progress callbacks to interrupt reading"""
+    pass
+
+
+def readTextFile(
+    filePath, encoding, sampleSize=DETECTION_SAMPLE_SIZE, onChunk=None
+):
+    """Read, decode and normalize the content of a text file.
+
+    Return a (content, encoding) tuple, where encoding is the one that was
+    actually used for decoding (which differs from the requested one in
+    the case of '(auto-detect)'). Raise IOError if the file can't be opened
+    and UnicodeError if it can't be decoded with this encoding.
+
+    If onChunk is not None, it is called with the number of bytes read
+    from the file each time a chunk is read; it may raise ReadCancelled to
+    interrupt reading. See readTextStream for other details.
+    """
+    return readTextStream(
+        partial(_openFile, filePath, onChunk), encoding, sampleSize
+    )
+
+
+def readTextStream(openStream, encoding, sampleSize=DETECTION_SAMPLE_SIZE):
+    """Read, decode and normalize the content of a binary stream.
+
+    openStream is called (without arguments) to open the stream, and once
+    more if it must be read again. Return a (content, encoding) tuple as
+    readTextFile does.
+
+    With '(auto-detect)', the encoding is detected on the first sampleSize
+    bytes of the stream (see detectEncoding), which are then decoded along
+    with the rest of the stream; if decoding fails, the encoding is
+    detected again on the whole stream, which is then read again. If no
+    encoding is detected, the locale's preferred encoding is used (and
+    returned).
+
+    The stream is decoded, newline-normalized and NFC-normalized in a
+    single pass, so that peak memory usage is about twice the decoded size
+    (the normalized pieces and their final concatenation).
+    """
+    if encoding == "(auto-detect)":
+        if sampleSize:
+            with openStream() as fh:
+                head = fh.read(sampleSize)
+                encoding = (
+                    _detectSampleEncoding(head, len(head) < sampleSize)
+                    or locale.getpreferredencoding(False)
+                )
+                try:
+                    return _decodeStream(fh, encoding, head), encoding
+                except UnicodeError:
+                    pass
+        encoding = (
+            _scanStreamEncoding(openStream)
+            or locale.getpreferredencoding(False)
+        )
+    with openStream() as fh:
+        return _decodeStream(fh, encoding), encoding
+
+
+def _decodeStream(fh, encoding, head=b""):
+    """Return the decoded and normalized content of head and a stream"""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    stripBOM = codecs.lookup(encoding).name == 'utf-8'
+
+    def decodedChunks():
+        yield decoder.decode(head)
+        for data in iter(lambda: fh.read(CHUNK_LENGTH), b""):
+            yield decoder.decode(data)
+        yield decoder.decode(b"", True)
+
+    return "".join(iterNormalizedText(decodedChunks(), stripBOM))
+
+
+def _openFile(filePath, onChunk=None):
+    """Open a file for reading bytes, reporting them to onChunk if any"""
+    if onChunk is None:
+        return open(filePath, 'rb')
+    return io.BufferedReader(_MonitoredFile(filePath, onChunk), 2**16)
+
+
+class _MonitoredFile(io.FileIO):
+    """Raw binary file calling back with the number of bytes read.
+
+    Only bytes beyond the furthest position read so far are reported, so
+    that seeking back (e.g. in zip files) doesn't inflate the count.
+    """
+
+    def __init__(self, filePath, onChunk):
+        super().__init__(filePath, 'rb')
+        self.onChunk = onChunk
+        self.reported = 0
+
+    def readinto(self, buffer):
+        numBytes = super().readinto(buffer)
+        self._report()
+        return numBytes
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self._report()
+        return data
+
+    def readall(self):
+        return self.read()
+
+    def _report(self):
+        position = self.tell()
+        if position > self.reported:
+            numBytes, self.reported = position - self.reported, position
+            self.onChunk(numBytes)
+
+
+def getArchiveType(filePath):
+    """Return the type of archive a file is, judging by its name.
+
+    Return 'zip', 'tar' (possibly compressed), 'gz', 'bz2', 'xz' (single
+    compressed files) or None if the file isn't an archive.
+    """
+    filePath = filePath.lower()
+    for extension, archiveType in ARCHIVE_EXTENSIONS:
+        if filePath.endswith(extension):
+            return archiveType
+    return None
+
+
+def readArchive(
+    filePath, encoding, memberPatterns=(), sampleSize=DETECTION_SAMPLE_SIZE,
+    onChunk=None,
+):
+    """Read, decode and normalize the members of an archive.
+
+    Members are decompressed on the fly, in the order in which they appear
+    in the archive. Return a list of (content, encoding, member path)
+    triples, one for each regular member whose path matches one of the glob
+    patterns in memberPatterns (or for each member if there are none; see
+    DirectoryFiles for matching rules). A single compressed file (e.g.
+    '.gz') has one member, named after the file without its extension.
+
+    Raise IOError if the archive can't be opened or is corrupt, and
+    UnicodeError if a member can't be decoded (see readTextStream). The
+    onChunk callback is called with numbers of compressed bytes read (see
+    readTextFile).
+    """
+    archiveType = getArchiveType(filePath)
+    members = list()
+
+    def readMember(openStream, memberPath):
+        if not memberPatterns or _matchesPatterns(memberPath, memberPatterns):
+            content, memberEncoding = readTextStream(
+                openStream, encoding, sampleSize
+            )
+            members.append((content, memberEncoding, memberPath))
+
+    try:
+        if archiveType == 'zip':
+            with _openFile(filePath, onChunk) as fh, \
+                    zipfile.ZipFile(fh) as archive:
+                for info in archive.infolist():
+                    if not info.is_dir():
+                        readMember(partial(archive.open, info), info.filename)
+        elif archiveType == 'tar':
+            with _openFile(filePath, onChunk) as fh, \
+                    tarfile.open(fileobj=fh) as archive:
+                for info in archive:
+                    if info.isfile():
+                        readMember(
+                            partial(archive.extractfile, info), info.name
+                        )
+        else:
+            @contextlib.contextmanager
+            def openCompressed():
+                with _openFile(filePath, onChunk) as fh, \
+                        COMPRESSED_OPENERS[archiveType](fh) as stream:
+                    yield stream
+
+            readMember(
+                openCompressed, os.path.basename(filePath).rsplit('.', 1)[0]
+            )
+    except (zipfile.BadZipFile, tarfile.TarError, EOFError,
+            lzma.LZMAError, zlib.error) as exc:
+        raise IOError(str(exc))
+    return members
+
+
+def detectEncoding(data, sampleSize=DETECTION_SAMPLE_SIZE):
+    """Return the probable encoding of some bytes.
+
+    Only the first sampleSize bytes are examined (all of them if sampleSize
+    is 0). Byte order marks are looked for first, then strict utf-8
+    validity is checked, and chardet is only used if both tests fail.
+    Return None if no encoding could be determined.
+    """
+    if sampleSize and len(data) > sampleSize:
+        return _detectSampleEncoding(data[:sampleSize], False)
+    return _detectSampleEncoding(data, True)
+
+
+def detectFileEncoding(filePath, sampleSize=DETECTION_SAMPLE_SIZE):
+    """Return the probable encoding of a file.
+
+    Only the first sampleSize bytes are examined (see detectEncoding). If
+    sampleSize is 0, the whole file is fed to chardet's universal detector
+    until it reaches a decision.
+    """
+    if not sampleSize:
+        return _scanStreamEncoding(partial(open, filePath, 'rb'))
+    with open(filePath, 'rb') as fh:
+        sample = fh.read(sampleSize)
+        return _detectSampleEncoding(sample, not fh.read(1))
+
+
+def _scanStreamEncoding(openStream):
+    """Detect the encoding of a whole stream with chardet"""
+    with openStream() as fh:
+        head = fh.read(4)
+        for bom, encoding in BOMS:
+            if head.startswith(bom):
+                return encoding
+        detector = UniversalDetector()
+        detector.feed(head)
+        for line in fh:
+            detector.feed(line)
+            if detector.done: break
+        detector.close()
+        return detector.result['encoding']
+
+
+def _detectSampleEncoding(sample, final):
+    """Detect the encoding of a sample (final if it ends the data)"""
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding
+
+    # Null bytes are valid utf-8 but rather suggest utf-16 or utf-32...
+    if b'\x00' not in sample:
+        try:
+            codecs.getincrementaldecoder('utf-8')().decode(sample, final)
+            return 'utf-8'
+        except UnicodeDecodeError:
+            pass
+    return chardet.detect(sample)['encoding']
+
+
+def iterNormalizedText(chunks, stripBOM=False):
+    """Generate normalized pieces of text from an iterable of decoded chunks.
+
+    The concatenation of the generated pieces is the same as the result of
+    normalize('NFC', '\\n'.join(text.splitlines())), where text is the
+    concatenation of the chunks (optionally stripped of leading utf-8
+    BOMs), but no copy of the whole text is made.
+
+    Chunks are only cut before an ASCII character (other than the '\\n' of
+    '\\r\\n'): such a character never composes with the preceding one, so
+    that pieces can be normalized independently.
+    """
+    tail = u''
+    lineBreakOwed = False
+    atStart = stripBOM
+    for chunk in chunks:
+        if atStart:
+            chunk = chunk.lstrip(codecs.BOM_UTF8.decode('utf-8'))
+            atStart = not chunk
+        text = tail + chunk
+        boundary = _lastStableBoundary(text, len(tail))
+        ready, tail = text[:boundary], text[boundary:]
+        if ready:
+            piece, lineBreakOwed = _normalizePiece(ready, lineBreakOwed)
+            yield piece
+    if tail:
+        yield _normalizePiece(tail, lineBreakOwed)[0]
+
+
+def _lastStableBoundary(text, start=0):
+    """Return the index of the last safe cut point in text (or 0)
+
+    Only characters from index start on are examined (characters before it
+    are known not to contain a cut point).
+    """
+    for index in range(len(text) - 1, max(start, 1) - 1, -1):
+        if text[index] < u'\x80':
+            if text[index] == u'\n' and text[index-1] == u'\r':
+                return index - 1
+            return index
+    return 0
+
+
+def _normalizePiece(text, lineBreakOwed):
+    """Normalize newlines and Unicode composition in a piece of text
+
+    Return the normalized piece and a boolean indicating whether the piece
+    ended with a line break (which will be emitted only if some text
+    follows, as with str.splitlines()).
+    """
+    endsWithLineBreak = text[-1] in LINE_BREAKS
+    text = normalize('NFC', u'\n'.join(text.splitlines()))
+    if lineBreakOwed:
+        text = u'\n' + text
+    return text, endsWithLineBreak
+
+
+class FileReaderPool(object):
+    """A pool of processes for reading files in parallel.
+
+    Functions submitted to the pool (readTextFile or readArchive) are
+    called with an onChunk callback that adds the number of bytes read to
+    a counter shared by all workers (see getBytesRead), and interrupts
+    reading as soon as the pool is cancelled.
+
+    Worker processes are spawned rather than forked, since forking a
+    process that runs a Qt event loop is unsafe.
+    """
+
+    def __init__(self, numWorkers):
+        """Initialize a FileReaderPool instance"""
+        context = multiprocessing.get_context("spawn")
+        self.cancelEvent = context.Event()
+        self.byteCounter = context.Value('q', 0)
+        self.executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=numWorkers,
+            mp_context=context,
+            initializer=_initFileReader,
+            initargs=(self.cancelEvent, self.byteCounter),
+        )
+
+    def submit(self, function, *args):
+        """Schedule function(*args) and return a Future"""
+        return self.executor.submit(_runFileReader, function, args)
+
+    def getBytesRead(self):
+        """Return the number of bytes read by all workers so far"""
+        return self.byteCounter.value
+
+    def cancel(self):
+        """Interrupt running reads and drop pending ones"""
+        self.cancelEvent.set()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        """Release the pool (interrupting any read still running)"""
+        self.cancel()
+
+
+# Shared state of a file reader process...
+_readerCancelEvent = None
+_readerByteCounter = None
+
+
+def _initFileReader(cancelEvent, byteCounter):
+    global _readerCancelEvent, _readerByteCounter
+    _readerCancelEvent = cancelEvent
+    _readerByteCounter = byteCounter
+
+
+def _runFileReader(function, args):
+    unreported = 0
+
+    def report():
+        nonlocal unreported
+        with _readerByteCounter.get_lock():
+            _readerByteCounter.value += unreported
+        unreported = 0
+
+    def onChunk(numBytes):
+        nonlocal unreported
+        unreported += numBytes
+        if unreported >= 2**18:
+            report()
+        if _readerCancelEvent.is_set():
+            raise ReadCancelled()
+
+    try:
+        return function(*args, onChunk=onChunk)
+    finally:
+        report()
+
+
+def getCurrentMemory():
+    """Return the resident memory of this process in bytes, or None if it
+    can't be determined on this platform (currently Linux and Windows are
+    supported).
+    """
+    if sys.platform.startswith('linux'):
+        try:
+            with open('/proc/self/statm', 'rb') as fh:
+                return int(fh.read().split()[1]) * _PAGE_SIZE
+        except (OSError, ValueError, IndexError):
+            return None
+    if sys.platform == 'win32':
+        return _getWorkingSetSize()
+    return None
+
+
+def _getWorkingSetSize():
+    """Return the working set size of this process (Windows)"""
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [
+            ('cb', wintypes.DWORD),
+            ('PageFaultCount', wintypes.DWORD),
+            ('PeakWorkingSetSize', ctypes.c_size_t),
+            ('WorkingSetSize', ctypes.c_size_t),
+            ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+            ('PagefileUsage', ctypes.c_size_t),
+            ('PeakPagefileUsage', ctypes.c_size_t),
+        ]
+
+    try:
+        kernel32 = ctypes.WinDLL('kernel32')
+        psapi = ctypes.WinDLL('psapi')
+        kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+        psapi.GetProcessMemoryInfo.argtypes = [
+            wintypes.HANDLE,
+            ctypes.POINTER(ProcessMemoryCounters),
+            wintypes.DWORD,
+        ]
+        psapi.GetProcessMemoryInfo.restype = wintypes.BOOL
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        if not psapi.GetProcessMemoryInfo(
+            kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb
+        ):
+            return None
+    except (OSError, AttributeError):
+        return None
+    return counters.WorkingSetSize
+
+
+def _resetPeakMemory():
+    """Reset the peak resident memory recorded by the kernel for this
+    process to its current value, and return True if it could be (Linux)
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as fh:
+            fh.write('5')
+    except OSError:
+        return False
+    return True
+
+
+def _getPeakMemory():
+    """Return the peak resident memory of this process since it was last
+    reset (see _resetPeakMemory), or None if it can't be determined
+    """
+    try:
+        with open('/proc/self/status', 'rb') as fh:
+            for line in fh:
+                if line.startswith(b'VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+class MemoryMonitor(object):
+    """Monitor of the peak resident memory of this process during an
+    operation
+
+    Between calls to start() and stop(), the resident memory of the
+    process (see getCurrentMemory) is sampled every
+    MEMORY_SAMPLING_INTERVAL seconds by a daemon thread shared by all
+    monitors; peakIncrease is then the difference between the highest
+    sample and the memory at start() (or None if memory can't be measured
+    on this platform). On Linux, the peak recorded by the kernel is also
+    taken into account, so that short peaks aren't missed; since it can
+    only be reset for the whole process, this is only done by monitors
+    started while no other one is running. Since the whole process is
+    measured, allocations made meanwhile by other threads (e.g. other
+    widgets) are counted too.
+
+    Monitors are also context managers, which make them the current
+    monitor of their thread (see getCurrentMonitor) while they run, so
+    that nested code can use the monitor of the task it is part of rather
+    than start another one. Entering a running monitor again doesn't
+    restart it.
+    """
+
+    def __init__(self):
+        self.startMemory = None
+        self.peakMemory = None
+        self._peakReset = False
+        self._depth = 0
+
+    def __enter__(self):
+        self.start()
+        _currentMonitors.__dict__.setdefault('stack', list()).append(self)
+        return self
+
+    def __exit__(self, *args):
+        _currentMonitors.stack.pop()
+        self.stop()
+
+    def start(self):
+        """Start monitoring memory (unless this monitor is running)"""
+        global _samplerThread
+        self._depth += 1
+        if self._depth > 1:
+            return
+        self.startMemory = self.peakMemory = getCurrentMemory()
+        if self.startMemory is None:
+            return
+        with _monitorLock:
+            # The kernel's peak is only reset (and relied upon) if no
+            # other monitor depends on it...
+            self._peakReset = not _activeMonitors and _resetPeakMemory()
+            _activeMonitors.add(self)
+            if _samplerThread is None:
+                _samplerThread = threading.Thread(
+                    target=_sampleMemory,
+                    name=u'TextableMemoryMonitor',
+                    daemon=True,
+                )
+                _samplerThread.start()
+
+    def stop(self):
+        """Stop monitoring memory (once stopped as often as started)"""
+        if self._depth == 0:
+            return
+        self._depth -= 1
+        self.update()
+        if self._depth == 0:
+            with _monitorLock:
+                _activeMonitors.discard(self)
+
+    def update(self, memory=None):
+        """Take the current memory (or the given one) into account"""
+        if self.startMemory is None:
+            return
+        if memory is None:
+            memory = getCurrentMemory()
+        if self._peakReset:
+            peak = _getPeakMemory()
+            if peak is not None and (memory is None or peak > memory):
+                memory = peak
+        if memory is not None and memory > self.peakMemory:
+            self.peakMemory = memory
+
+    @property
+    def peakIncrease(self):
+        """Increase of resident memory (in bytes) at its peak"""
+        if self.startMemory is None:
+            return None
+        return max(0, self.peakMemory - self.startMemory)
+
+
+def getCurrentMonitor():
+    """Return the MemoryMonitor used as a context manager by the current
+    thread (the innermost one), or None"""
+    stack = getattr(_currentMonitors, 'stack', None)
+    return stack[-1] if stack else None
+
+
+def _sampleMemory():
+    """Sample memory for running monitors, until none is left"""
+    global _samplerThread
+    while True:
+        time.sleep(MEMORY_SAMPLING_INTERVAL)
+        memory = getCurrentMemory()
+        with _monitorLock:
+            if not _activeMonitors:
+                _samplerThread = None
+                return
+            monitors = list(_activeMonitors)
+        for monitor in monitors:
+            if memory is not None and memory > monitor.peakMemory:
+                monitor.peakMemory = memory
+
+
+# Running monitors and the thread sampling memory for them...
+_monitorLock = threading.Lock()
+_activeMonitors = set()
+_samplerThread = None
+_currentMonitors = threading.local()
+
+
+def getCacheDirectory(name):
+    """Return the path of a named cache directory in the user data dir"""
+    return os.path.join(
+        appdirs.user_data_dir("textable", "langtech"), "cache", name
+    )
+
+
+def getFileCacheKey(filePath, encoding):
+    """Return the key identifying a version of a file in a TextFileCache
+
+    The key is based on the file's absolute path, size and modification
+    time, and on the requested encoding. Raise OSError if the file can't
+    be accessed.
+    """
+    stat = os.stat(filePath)
+    return (
+        FILE_CACHE_FORMAT,
+        os.path.abspath(filePath),
+        stat.st_size,
+        stat.st_mtime_ns,
+        encoding,
+    )
+
+
+class DirectoryFiles(object):
+    """Lazily enumerate the files of a directory tree matching glob patterns.
+
+    Iterating over an instance scans the tree again with os.scandir and
+    yields file entries in the format of the Text Files widget's list, i.e.
+    [path, encoding, annotation key, annotation value], followed by the
+    file's path relative to the root directory (with '/' separators).
+    Entries are sorted by name within each directory and subdirectories are
+    visited as they are encountered, so that files come in the order of
+    their relative paths; only the entries of the directories being visited
+    are held in memory.
+
+    A pattern containing no '/' is matched against file (or directory)
+    names, and other patterns against relative paths. A file is included if
+    it matches any of the include patterns (or if there are none) and none
+    of the exclude patterns. Directories matching an exclude pattern are
+    not visited at all.
+    """
+
+    def __init__(self, root, includes, excludes, encoding):
+        """Initialize a DirectoryFiles instance"""
+        self.root = root
+        self.includes = list(includes)
+        self.excludes = list(excludes)
+        self.encoding = encoding
+
+    def __iter__(self):
+        stack = [self._scan(self.root, u'')]
+        while stack:
+            entry, relPath = next(stack[-1], (None, None))
+            if entry is None:
+                stack.pop()
+                continue
+            if _matchesPatterns(relPath, self.excludes):
+                continue
+            try:
+                if entry.is_dir():
+                    stack.append(self._scan(entry.path, relPath + u'/'))
+                    continue
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+            if not self.includes or _matchesPatterns(relPath, self.includes):
+                yield [entry.path, self.encoding, u'', u'', relPath]
+
+    @staticmethod
+    def _scan(directory, prefix):
+        with os.scandir(directory) as iterator:
+            entries = sorted(iterator, key=lambda e: e.name)
+        return iter([(entry, prefix + entry.name) for entry in entries])
+
+
+def _matchesPatterns(relPath, patterns):
+    """Return True if a relative path matches one of some glob patterns"""
+    name = relPath.rsplit(u'/', 1)[-1]
+    return any(
+        fnmatch.fnmatch(relPath if u'/' in pattern else name, pattern)
+        for pattern in patterns
+    )
+
+
+class DiskCache(object):
+    """A size-bounded on-disk cache with least recently used eviction.
+
+    Each entry is a file named after a digest of its key, whose
+    modification time records the last time it was accessed. Entries may
+    be stored from several threads at once.
+    """
+
+    def __init__(self, directory, maxSize):
+        """Initialize a new DiskCache instance (maxSize is in bytes)"""
+        self.directory = directory
+        self.maxSize = maxSize
+        self._size = None
+        self._lock = threading.RLock()
+        os.makedirs(directory, exist_ok=True)
+
+    def getPath(self, key):
+        """Return the path of the entry for a given key"""
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest)
+
+    def __contains__(self, key):
+        return os.path.exists(self.getPath(key))
+
+    def touch(self, path):
+        """Mark an entry as recently used"""
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def getSize(self):
+        """Return the total size of entries in bytes"""
+        with self._lock:
+            if self._size is None:
+                self._size = sum(e.stat().st_size for e in self._entries())
+            return self._size
+
+    def newEntryFile(self):
+        """Return a (file object, path) pair for writing a new entry
+
+        The entry must then be stored under its key with commit().
+        """
+        handle, tempPath = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        return os.fdopen(handle, 'wb'), tempPath
+
+    def commit(self, tempPath, key):
+        """Store a written entry file under a key, then evict old entries"""
+        path = self.getPath(key)
+        with self._lock:
+            size = self.getSize() + os.path.getsize(tempPath)
+            if os.path.exists(path):
+                size -= os.path.getsize(path)
+            os.replace(tempPath, path)
+            self._size = size
+            self.evict()
+
+    def discard(self, tempPath):
+        """Remove an entry file that won't be committed"""
+        try:
+            os.remove(tempPath)
+        except OSError:
+            pass
+
+    def evict(self):
+        """Remove least recently used entries until size is below limit"""
+        with self._lock:
+            if self.getSize() <= self.maxSize:
+                return
+            entries = sorted(
+                ((e.stat().st_mtime, e.stat().st_size, e.path)
+                 for e in self._entries()),
+            )
+            size = sum(e[1] for e in entries)
+            for _, entrySize, path in entries:
+                if size <= self.maxSize:
+                    break
+                try:
+                    os.remove(path)
+                    size -= entrySize
+                except OSError:
+                    pass
+            self._size = size
+
+    def _entries(self):
+        try:
+            return [
+                e for e in os.scandir(self.directory)
+                if e.is_file() and not e.name.endswith('.tmp')
+            ]
+        except OSError:
+            return []
+
+
+class TextFileCache(DiskCache):
+    """A DiskCache for decoded and normalized file contents
+
+    Entries store the encoding that was used for decoding on their first
+    line and the (utf-8 encoded) content on the following ones.
+    """
+
+    def get(self, key):
+        """Return the (content, encoding) stored for a key, or None"""
+        path = self.getPath(key)
+        try:
+            with open(path, encoding='utf-8', newline='') as fh:
+                encoding = fh.readline()[:-1]
+                content = fh.read()
+        except (OSError, UnicodeError):
+            return None
+        self.touch(path)
+        return content, encoding
+
+    def put(self, key, content, encoding):
+        """Store the (content, encoding) of a file under a key"""
+        try:
+            fh, tempPath = self.newEntryFile()
+        except OSError:
+            return
+        try:
+            with fh:
+                fh.write((encoding + u'\n').encode('utf-8'))
+                for index in range(0, len(content), CHUNK_LENGTH):
+                    chunk = content[index:index+CHUNK_LENGTH]
+                    fh.write(chunk.encode('utf-8'))
+            self.commit(tempPath, key)
+        except OSError:
+            self.discard(tempPath)
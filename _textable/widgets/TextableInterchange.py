@@ -0,0 +1,82 @@
+"""
+Module TextableInterchange.py
+Copyright 2012-2025 Aris Xanthos
+-----------------------------------------------------------------------------
+This file is part of the Orange3-Textable package.
+
+Orange3-Textable is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Orange3-Textable is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Orange3-Textable. If not, see <http://www.gnu.org/licenses/>.
+-----------------------------------------------------------------------------
+Conversion of Textable segmentations to Orange data, as performed by widget
+Interchange, so that it can also be used (e.g. by TextableBenchmark)
+without importing widgets. Like TextableProcess, this module must not
+import Qt; Orange is only imported when a conversion is performed.
+-----------------------------------------------------------------------------
+Provides functions:
+- segmentationToTable
+"""
+
+__version__ = '0.1'
+
+
+def segmentationToTable(segmentation, maxNumCategories=None,
+                        progressCallback=None):
+    """Convert a segmentation to an Orange table
+
+    Each annotation key becomes a discrete attribute (or a string meta
+    attribute if it has more than maxNumCategories values), and segment
+    contents are stored in string meta attribute "textable_text".
+    """
+    from Orange.data import DiscreteVariable, StringVariable, Domain, Table
+
+    metas = list()
+    attributes = list()
+    meta_keys = list()
+    attribute_keys = list()
+    for key in segmentation.get_annotation_keys():
+        possible_values = set()
+        for segment in segmentation:
+            try:
+                possible_values.add(str(segment.annotations[key]))
+            except KeyError:
+                pass
+        if (
+            maxNumCategories is not None
+            and len(possible_values) > maxNumCategories
+        ):
+            metas.append(StringVariable(key))
+            meta_keys.append(key)
+        else:
+            attributes.append(
+                DiscreteVariable(key, values=list(possible_values))
+            )
+            attribute_keys.append(key)
+    metas.append(StringVariable("textable_text"))
+    domain = Domain(attributes, [], metas)
+    rows = list()
+    for segment in segmentation:
+        row = [
+            str(segment.annotations.get(annotation_key, None))
+            for annotation_key in attribute_keys
+        ]
+        row.extend(
+            [
+                str(segment.annotations.get(annotation_key, None))
+                for annotation_key in meta_keys
+            ]
+        )
+        row.append(segment.get_content())
+        rows.append(row)
+        if progressCallback:
+            progressCallback()
+    return Table(domain, rows)
@@ -0,0 +1,553 @@
+"""
+Module TextableProcess.py
+Copyright 2012-2025 Aris Xanthos
+-----------------------------------------------------------------------------
+This file is part of the Orange3-Textable package.
+
+Orange3-Textable is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Orange3-Textable is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Orange3-Textable. If not, see <http://www.gnu.org/licenses/>.
+-----------------------------------------------------------------------------
+Task execution helpers for Textable widgets: cancellation tokens, and a
+process backend for running LTTL functions called by widgets in a worker
+process rather than a thread, so that CPU-bound operations don't hold the
+GIL of the process running the canvas (and can be terminated at once when
+cancelled). Like TextableIO, this module must not import Qt or Orange.
+
+Segmentations found among the function's arguments are sent to the worker
+process as lists of segments, together with the strings they refer to;
+segmentations found in the result are sent back the same way, and strings
+created by the worker are then added to Segmentation.data (with segments
+referring to them updated accordingly).
+
+Task results can also be stored in snapshots on disk (with the same
+representation of segmentations), so that they can be restored rather than
+recomputed when a workflow is opened again. The strings that snapshots refer
+to are stored once, under their digest, and shared by all snapshots.
+-----------------------------------------------------------------------------
+Provides classes:
+- CancellationToken
+- SnapshotStore
+-----------------------------------------------------------------------------
+Provides functions:
+- isProcessBackendEnabled
+- isHardCancelEnabled
+- isSnapshotStoreEnabled
+- acceptsCancelToken
+- isRemotable
+- runInProcess
+- digestString
+"""
+
+__version__ = '0.4'
+
+import io
+import hashlib
+import os
+import time
+import zlib
+import struct
+import queue
+import inspect
+import threading
+import pickle
+import traceback
+import multiprocessing
+from functools import partial
+
+from LTTL.Segmentation import Segmentation
+from LTTL.Segment import Segment
+
+from _textable.widgets.TextableIO import DiskCache, getCacheDirectory
+
+# Environment variables for enabling the process backend and hard cancel...
+PROCESS_BACKEND_VARIABLE = 'TEXTABLE_PROCESS_BACKEND'
+HARD_CANCEL_VARIABLE = 'TEXTABLE_HARD_CANCEL'
+SNAPSHOTS_VARIABLE = 'TEXTABLE_SNAPSHOTS'
+
+# Maximum total size of snapshots on disk (in bytes)...
+SNAPSHOT_MAX_SIZE = 2**30
+
+# Seconds granted to a cancelled worker process before it is terminated...
+HARD_CANCEL_DELAY = 0.5
+
+# Seconds between checks for cancellation while waiting for the worker...
+POLL_INTERVAL = 0.1
+
+# Signals of the caller that are forwarded from the worker process...
+FORWARDED_SIGNALS = ('signal_prog', 'signal_text', 'signal_cancel_button')
+
+
+class CancellationToken(object):
+    """Cancellation state of a task, shared by a widget and the function
+    that it runs in a worker thread
+
+    Functions that declare a cancelToken keyword argument receive the token
+    of their task (see acceptsCancelToken). They can poll it (cancelled,
+    raiseIfCancelled), wait on it, or register callbacks that interrupt
+    blocking operations as soon as the task is cancelled (onCancel).
+    Attribute requestTime is the time (time.monotonic) when the task was
+    cancelled, or None.
+    """
+
+    def __init__(self):
+        """Initialize a CancellationToken instance"""
+        self.event = threading.Event()
+        self.lock = threading.Lock()
+        self.callbacks = list()
+        self.requestTime = None
+
+    @property
+    def cancelled(self):
+        """True if the task was cancelled"""
+        return self.event.is_set()
+
+    def cancel(self):
+        """Cancel the task (calling registered callbacks)"""
+        with self.lock:
+            if self.event.is_set():
+                return
+            self.requestTime = time.monotonic()
+            self.event.set()
+            callbacks, self.callbacks = self.callbacks, list()
+        for callback in callbacks:
+            callback()
+
+    def onCancel(self, callback):
+        """Register a callback (without arguments) called upon cancellation,
+        in the thread that cancels the task (at once if already cancelled)
+        """
+        with self.lock:
+            if not self.event.is_set():
+                self.callbacks.append(callback)
+                return
+        callback()
+
+    def raiseIfCancelled(self, exception=RuntimeError):
+        """Raise an exception if the task was cancelled"""
+        if self.event.is_set():
+            raise exception(u"Operation cancelled.")
+
+    def wait(self, timeout=None):
+        """Wait until the task is cancelled or timeout seconds have passed
+        and return True in the former case
+        """
+        return self.event.wait(timeout)
+
+
+def isProcessBackendEnabled():
+    """Return True if LTTL functions should be run in worker processes
+    (i.e. if environment variable TEXTABLE_PROCESS_BACKEND is set to 1)
+    """
+    return _isEnabled(PROCESS_BACKEND_VARIABLE)
+
+
+def isHardCancelEnabled():
+    """Return True if LTTL functions should be run in worker processes that
+    are terminated when cancelled (i.e. if environment variable
+    TEXTABLE_HARD_CANCEL is set to 1)
+    """
+    return _isEnabled(HARD_CANCEL_VARIABLE)
+
+
+def isSnapshotStoreEnabled():
+    """Return True if task results should be stored in snapshots (i.e. if
+    environment variable TEXTABLE_SNAPSHOTS is set to 1)
+    """
+    return _isEnabled(SNAPSHOTS_VARIABLE)
+
+
+def _isEnabled(variable):
+    value = os.environ.get(variable, '')
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def acceptsCancelToken(function):
+    """Return True if function declares a cancelToken keyword argument"""
+    try:
+        return 'cancelToken' in inspect.signature(function).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def isRemotable(function):
+    """Return True if function can be run with runInProcess, i.e. if it
+    is a partial object wrapping an LTTL function with a caller keyword
+    argument
+    """
+    return (
+        isinstance(function, partial)
+        and 'caller' in function.keywords
+        and getattr(function.func, '__module__', '').startswith('LTTL.')
+    )
+
+
+def runInProcess(function, cancelToken=None, hardCancelDelay=None):
+    """Run a remotable function (see isRemotable) in a worker process and
+    return its result
+
+    The caller's signals emitted by the function (progress, info box
+    messages, cancel button) are forwarded to the caller, and cancellation
+    (with cancelToken, or the caller's cancel_operation attribute) is
+    forwarded to the function. If hardCancelDelay is not None, the worker
+    process is terminated if it is still running this number of seconds
+    after cancellation, and None is returned. Exceptions raised by the
+    function are raised again. If the arguments can't be sent to a worker
+    process, the function is run in the current thread.
+    """
+    caller = function.keywords['caller']
+    keywords = dict(function.keywords)
+    del keywords['caller']
+    strIndices = set()
+    try:
+        payload = _dumps(
+            partial(function.func, *function.args, **keywords), strIndices
+        )
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return function()
+    strings = {index: Segmentation.get_data(index) for index in strIndices}
+    context = multiprocessing.get_context('spawn')
+    messages = context.Queue()
+    cancelEvent = context.Event()
+    process = context.Process(
+        target=_runRemote,
+        args=(payload, strings, len(Segmentation.data), messages, cancelEvent),
+        daemon=True,
+    )
+    process.start()
+    deadline = None
+    try:
+        while True:
+            timeout = POLL_INTERVAL
+            if deadline is None and (
+                caller.cancel_operation
+                or (cancelToken is not None and cancelToken.cancelled)
+            ):
+                cancelEvent.set()
+                if hardCancelDelay is not None:
+                    deadline = time.monotonic() + hardCancelDelay
+            if deadline is not None:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    process.terminate()
+                    return None
+            try:
+                message = messages.get(timeout=min(timeout, POLL_INTERVAL))
+            except queue.Empty:
+                if not process.is_alive() and messages.empty():
+                    raise RuntimeError(
+                        u"Worker process exited unexpectedly (code %s)."
+                        % process.exitcode
+                    )
+                continue
+            if message[0] == 'signal':
+                getattr(caller, message[1]).emit(*message[2])
+            elif message[0] == 'result':
+                return _loads(message[1], message[2])
+            else:
+                raise message[1]
+    finally:
+        process.join(POLL_INTERVAL)
+        if process.is_alive():
+            process.terminate()
+
+
+class SnapshotStore(DiskCache):
+    """A DiskCache for the last result of each widget (identified by name)
+
+    Entries store the key of the result (e.g. a fingerprint of the inputs
+    and settings it was computed from), followed by the zlib-compressed
+    result, where segmentations are stored as lists of segments together
+    with the digest of the strings they refer to (see digestString). A
+    stored result is only returned for the key it was stored with.
+
+    Strings are stored in separate (zlib-compressed) entries of the same
+    cache, keyed by their digest, so that each string is written once
+    however many widgets and runs refer to it. Strings that are still in
+    Segmentation.data are not read back when a result is restored.
+    """
+
+    # Value returned by load for missing or stale snapshots...
+    MISSING = object()
+
+    def __init__(self, directory=None, maxSize=SNAPSHOT_MAX_SIZE):
+        """Initialize a SnapshotStore instance"""
+        if directory is None:
+            directory = getCacheDirectory('snapshots')
+        super().__init__(directory, maxSize)
+
+    def load(self, name, key, findStrings=None):
+        """Return the result stored under name for key (or MISSING)
+
+        If findStrings is not None, it is called with a dict mapping
+        the indices of the strings stored in the snapshot to their digest,
+        and must return a dict mapping the indices of those which are
+        already in Segmentation.data to their index there (other ones are
+        read from the store and added).
+        """
+        path = self.getPath(name)
+        try:
+            with open(path, 'rb') as fh:
+                headerLength, = struct.unpack('>I', fh.read(4))
+                if pickle.loads(fh.read(headerLength)) != key:
+                    return self.MISSING
+                data, digests = pickle.loads(zlib.decompress(fh.read()))
+        except (OSError, EOFError, ValueError, struct.error, zlib.error,
+                pickle.UnpicklingError):
+            return self.MISSING
+        existing = findStrings(digests) if findStrings is not None else None
+        existing = existing or dict()
+        strings = dict()
+        for index, digest in digests.items():
+            if index in existing:
+                self.touch(self.getStringPath(digest))
+                continue
+            string = self.loadString(digest)
+            if string is self.MISSING:
+                return self.MISSING
+            strings[index] = string
+        self.touch(path)
+        return _loads(data, strings, existing)
+
+    def save(self, name, key, result, getDigest=None):
+        """Store result under name for key (replacing any previous one)
+
+        If getDigest is not None, it is called with the index of each
+        string referred to by the result, and must return the digest of
+        that string (see digestString), e.g. from a cache.
+        """
+        strIndices = set()
+        try:
+            data = _dumps(result, strIndices)
+            digests = dict()
+            for index in strIndices:
+                if getDigest is not None:
+                    digest = getDigest(index)
+                else:
+                    digest = digestString(Segmentation.get_data(index))
+                digests[index] = digest.hex()
+            body = zlib.compress(
+                pickle.dumps((data, digests), pickle.HIGHEST_PROTOCOL)
+            )
+            header = pickle.dumps(key, pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return
+        for index, digest in digests.items():
+            if not self.saveString(digest, Segmentation.get_data(index)):
+                return
+        try:
+            fh, tempPath = self.newEntryFile()
+        except OSError:
+            return
+        try:
+            with fh:
+                fh.write(struct.pack('>I', len(header)))
+                fh.write(header)
+                fh.write(body)
+            self.commit(tempPath, name)
+        except OSError:
+            self.discard(tempPath)
+
+    def getStringPath(self, digest):
+        """Return the path of the entry for the string with a given digest
+        """
+        return self.getPath(('string', digest))
+
+    def loadString(self, digest):
+        """Return the string stored under digest (or MISSING)"""
+        path = self.getStringPath(digest)
+        try:
+            with open(path, 'rb') as fh:
+                string = pickle.loads(zlib.decompress(fh.read()))
+        except (OSError, EOFError, ValueError, zlib.error,
+                pickle.UnpicklingError):
+            return self.MISSING
+        self.touch(path)
+        return string
+
+    def saveString(self, digest, string):
+        """Store string under its digest unless it is already there, and
+        return True if it is stored
+        """
+        path = self.getStringPath(digest)
+        if os.path.exists(path):
+            self.touch(path)
+            return True
+        try:
+            body = zlib.compress(
+                pickle.dumps(string, pickle.HIGHEST_PROTOCOL)
+            )
+            fh, tempPath = self.newEntryFile()
+        except (OSError, pickle.PicklingError, TypeError):
+            return False
+        try:
+            with fh:
+                fh.write(body)
+            self.commit(tempPath, ('string', digest))
+        except OSError:
+            self.discard(tempPath)
+            return False
+        return True
+
+    def run(self, name, key, function, cancelToken=None, findStrings=None,
+            getDigest=None):
+        """Return the result stored under name for key, or call function
+        and store its result (unless the call was cancelled or returned
+        None); see load and save for findStrings and getDigest
+        """
+        result = self.load(name, key, findStrings)
+        if result is not self.MISSING:
+            return result
+        result = function()
+        if result is not None and not (
+            cancelToken is not None and cancelToken.cancelled
+        ):
+            self.save(name, key, result, getDigest)
+        return result
+
+
+class _SegmentationPickler(pickle.Pickler):
+    """Pickler storing segmentations as lists of segments and recording
+    the indices of the strings that they refer to
+    """
+
+    def __init__(self, file, strIndices):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.strIndices = strIndices
+
+    def persistent_id(self, obj):
+        if not isinstance(obj, Segmentation):
+            return None
+        # Segments are stored in a list (except in very large segmentations,
+        # which are iterated over at a higher cost)...
+        if obj.segments_nbr_in_chunk == 0 and isinstance(obj.buffer, list):
+            segments = obj.buffer
+        else:
+            segments = list(obj)
+        strIndices = [segment.str_index for segment in segments]
+        self.strIndices.update(strIndices)
+        return (
+            'Segmentation',
+            obj.label,
+            strIndices,
+            [segment.start for segment in segments],
+            [segment.end for segment in segments],
+            [segment.annotations for segment in segments],
+        )
+
+
+class _SegmentationUnpickler(pickle.Unpickler):
+    """Unpickler rebuilding segmentations stored by _SegmentationPickler,
+    with string indices translated according to strIndexMap
+    """
+
+    def __init__(self, file, strIndexMap=None):
+        super().__init__(file)
+        self.strIndexMap = strIndexMap or dict()
+
+    def persistent_load(self, pid):
+        _, label, strIndices, starts, ends, annotations = pid
+        if self.strIndexMap:
+            getIndex = self.strIndexMap.get
+            strIndices = [getIndex(index, index) for index in strIndices]
+        return Segmentation(
+            list(map(Segment, strIndices, starts, ends, annotations)),
+            label,
+        )
+
+
+def digestString(string):
+    """Return the digest identifying the content of a string of
+    Segmentation.data (which may also be None, if it has been released)
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(string, str):
+        digest.update(string.encode('utf-8', 'surrogatepass'))
+    elif string is None:
+        digest.update(b'N')
+    else:
+        digest.update(str(string).encode('utf-8', 'surrogatepass'))
+    return digest.digest()
+
+
+def _dumps(obj, strIndices):
+    buffer = io.BytesIO()
+    _SegmentationPickler(buffer, strIndices).dump(obj)
+    return buffer.getvalue()
+
+
+def _loads(data, newStrings, existing=None):
+    """Load a result sent by the worker (or stored in a snapshot), adding
+    the strings it created to Segmentation.data (except those that are
+    already there, whose indices are given by existing)
+    """
+    strIndexMap = dict(existing or {})
+    for index, value in sorted(newStrings.items()):
+        if index in strIndexMap:
+            continue
+        Segmentation.set_data(-1, value)
+        strIndexMap[index] = len(Segmentation.data) - 1
+    return _SegmentationUnpickler(io.BytesIO(data), strIndexMap).load()
+
+
+class _RemoteSignal(object):
+    """Stand-in for a signal of the caller in the worker process"""
+
+    def __init__(self, name, messages):
+        self.name = name
+        self.messages = messages
+        self.lastArgs = None
+
+    def emit(self, *args):
+        # Skip repeated values (typically progress)...
+        if args != self.lastArgs:
+            self.lastArgs = args
+            self.messages.put(('signal', self.name, args))
+
+
+class _RemoteCaller(object):
+    """Stand-in for the caller (widget) of an LTTL function in the worker
+    process
+    """
+
+    def __init__(self, messages, cancelEvent):
+        self.cancelEvent = cancelEvent
+        for name in FORWARDED_SIGNALS:
+            setattr(self, name, _RemoteSignal(name, messages))
+
+    @property
+    def cancel_operation(self):
+        return self.cancelEvent.is_set()
+
+
+def _runRemote(payload, strings, numStrings, messages, cancelEvent):
+    """Run a function in the worker process and send back its result"""
+    try:
+        numMissing = numStrings - len(Segmentation.data)
+        Segmentation.data.extend([None] * numMissing)
+        for index, value in strings.items():
+            Segmentation.data[index] = value
+        function = _SegmentationUnpickler(io.BytesIO(payload)).load()
+        result = function(caller=_RemoteCaller(messages, cancelEvent))
+        strIndices = set()
+        data = _dumps(result, strIndices)
+        newStrings = {
+            index: Segmentation.get_data(index)
+            for index in strIndices if index >= numStrings
+        }
+        messages.put(('result', data, newStrings))
+    except BaseException as exc:
+        try:
+            pickle.dumps(exc)
+        except Exception:
+            exc = RuntimeError(traceback.format_exc())
+        messages.put(('error', exc))
@@ -0,0 +1,302 @@
+"""
+Module TextableProfile.py
+Copyright 2012-2025 Aris Xanthos
+-----------------------------------------------------------------------------
+This file is part of the Orange3-Textable package.
+
+Orange3-Textable is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Orange3-Textable is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Orange3-Textable. If not, see <http://www.gnu.org/licenses/>.
+-----------------------------------------------------------------------------
+Profiling of the tasks run by Textable widgets (see
+OWTextableBaseWidget.threading), enabled for all widgets with environment
+variable TEXTABLE_PROFILE or for a given widget in its advanced settings.
+
+In "Full" mode, tasks are run with cProfile and statistics are saved in a
+.prof file (which can be read with module pstats or tools such as
+snakeviz). In "Sampling" mode, the stack of the thread running the task is
+sampled at regular intervals by another thread, which has a much lower
+overhead on long tasks, and sample counts are saved in a .txt file in the
+"collapsed stacks" format of flame graph tools (one line per stack, with
+functions separated by semicolons, followed by the number of samples).
+
+Profile files are named after the date, the widget, its caption and the
+size of its inputs, and each comes with a .json file describing the run.
+Since Python 3.12, only one cProfile profiler can be active at a time, so
+tasks that can't be profiled fully (e.g. because another widget is being
+profiled) are profiled in "Sampling" mode instead.
+Like TextableProcess, this module must not import Qt or Orange.
+-----------------------------------------------------------------------------
+Provides classes:
+- SamplingProfiler
+-----------------------------------------------------------------------------
+Provides functions:
+- getProfilingMode
+- getProfileDirectory
+- getTaskInputs
+- getInputSizes
+- getProfileBasePath
+- profileCall
+"""
+
+__version__ = '0.2'
+
+import os
+import re
+import sys
+import json
+import time
+import cProfile
+import threading
+import collections
+from functools import partial
+
+import appdirs
+
+from LTTL.Segmentation import Segmentation
+
+# Environment variables for enabling profiling of all widgets and for
+# choosing the directory where profiles are saved...
+PROFILE_VARIABLE = 'TEXTABLE_PROFILE'
+PROFILE_DIR_VARIABLE = 'TEXTABLE_PROFILE_DIR'
+
+# Profiling modes (as shown in the advanced settings of widgets)...
+PROFILING_OFF = u'Off'
+PROFILING_FULL = u'Full'
+PROFILING_SAMPLING = u'Sampling'
+PROFILING_MODES = (PROFILING_OFF, PROFILING_FULL, PROFILING_SAMPLING)
+
+# Seconds between samples in sampling mode...
+SAMPLING_INTERVAL = 0.005
+
+# Maximum length of labels in profile file names...
+MAX_LABEL_LENGTH = 40
+
+
+class SamplingProfiler(object):
+    """Statistical profiler sampling the stack of a thread
+
+    Stacks are recorded by a daemon thread every interval seconds between
+    calls to start() and stop(), and counted in attribute counts (a
+    Counter whose keys are tuples of "function (file:line)" strings, from
+    outermost to innermost call).
+    """
+
+    def __init__(self, interval=SAMPLING_INTERVAL):
+        self.interval = interval
+        self.counts = collections.Counter()
+        self.numSamples = 0
+        self.threadId = None
+        self._stopEvent = threading.Event()
+        self._thread = None
+
+    def start(self, threadId=None):
+        """Start sampling the given thread (by default the current one)"""
+        self.threadId = threadId or threading.get_ident()
+        self._stopEvent.clear()
+        self._thread = threading.Thread(
+            target=self._sample,
+            name=u'TextableSamplingProfiler',
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling"""
+        self._stopEvent.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _sample(self):
+        while not self._stopEvent.wait(self.interval):
+            frame = sys._current_frames().get(self.threadId)
+            if frame is None:
+                continue
+            stack = list()
+            while frame is not None:
+                code = frame.f_code
+                stack.append(u'%s (%s:%i)' % (
+                    code.co_name,
+                    os.path.basename(code.co_filename),
+                    code.co_firstlineno,
+                ))
+                frame = frame.f_back
+            del frame
+            self.counts[tuple(reversed(stack))] += 1
+            self.numSamples += 1
+
+    def dump(self, path):
+        """Save sample counts in collapsed stacks format"""
+        with open(path, 'w', encoding='utf-8') as profileFile:
+            for stack, count in self.counts.most_common():
+                profileFile.write(u'%s %i\n' % (u';'.join(stack), count))
+
+
+def getProfilingMode():
+    """Return the profiling mode set with environment variable
+    TEXTABLE_PROFILE: PROFILING_FULL if it is set to 1 (or "full"),
+    PROFILING_SAMPLING if it is set to "sampling", otherwise PROFILING_OFF
+    """
+    value = os.environ.get(PROFILE_VARIABLE, '').strip().lower()
+    if value in ('1', 'true', 'yes', 'on', 'full'):
+        return PROFILING_FULL
+    if value in ('sample', 'sampling'):
+        return PROFILING_SAMPLING
+    return PROFILING_OFF
+
+
+def getProfileDirectory():
+    """Return the directory where profiles are saved (environment variable
+    TEXTABLE_PROFILE_DIR, or "profiles" in the user data dir)
+    """
+    directory = os.environ.get(PROFILE_DIR_VARIABLE, '').strip()
+    if directory:
+        return directory
+    return os.path.join(
+        appdirs.user_data_dir("textable", "langtech"), "profiles"
+    )
+
+
+def getTaskInputs(function):
+    """Return the segmentations and tables that a task (a partial object)
+    is called with (also within lists and dicts), in order
+    """
+    inputs = list()
+    if isinstance(function, partial):
+        _addTaskInputs(inputs, list(function.args))
+        _addTaskInputs(inputs, list(function.keywords.values()))
+    return inputs
+
+
+def _addTaskInputs(inputs, value):
+    if isinstance(value, Segmentation) or _isTable(value):
+        inputs.append(value)
+    elif isinstance(value, dict):
+        _addTaskInputs(inputs, list(value.values()))
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _addTaskInputs(inputs, item)
+
+
+def _isTable(value):
+    return hasattr(value, 'row_ids') and hasattr(value, 'col_ids')
+
+
+def getInputSizes(function):
+    """Return the sizes of the segmentations and tables (number of rows)
+    that a task is called with, in order
+    """
+    return [
+        len(value.row_ids) if _isTable(value) else len(value)
+        for value in getTaskInputs(function)
+    ]
+
+
+def getProfileBasePath(widgetName, caption, inputSizes, directory=None):
+    """Return the path (without extension) of the files where the profile
+    of a task is saved, e.g. ".../20250301-142501-123-Segment-words-1x20000"
+
+    The path is reserved by creating its .json file (filled in once the
+    profile is saved), so that tasks started at the same time get distinct
+    paths. If it can't be created, the path is returned nonetheless (the
+    problem is reported when the profile is saved).
+    """
+    if directory is None:
+        directory = getProfileDirectory()
+    now = time.time()
+    parts = [
+        u'%s-%03i' % (
+            time.strftime('%Y%m%d-%H%M%S', time.localtime(now)),
+            int(now * 1000) % 1000,
+        ),
+        _cleanLabel(widgetName),
+    ]
+    if caption and caption != widgetName:
+        parts.append(_cleanLabel(caption))
+    if inputSizes:
+        parts.append(u'x'.join(str(size) for size in inputSizes))
+    basePath = os.path.join(directory, u'-'.join(parts))
+    path = basePath
+    number = 1
+    while True:
+        try:
+            os.makedirs(directory, exist_ok=True)
+            open(path + u'.json', 'x').close()
+        except FileExistsError:
+            number += 1
+            path = u'%s-%i' % (basePath, number)
+            continue
+        except OSError:
+            pass
+        return path
+
+
+def _cleanLabel(label):
+    label = re.sub(r'[^\w.]+', u'_', str(label), flags=re.UNICODE)
+    return label.strip(u'_')[:MAX_LABEL_LENGTH] or u'_'
+
+
+def profileCall(function, mode, basePath, info=None, errors=None):
+    """Call function with a profiler (depending on mode) and save its
+    profile and a description of the run (info dict, completed with the
+    mode, date and duration) in files at basePath (see module docstring)
+
+    Profiles that can't be saved mustn't prevent the task from completing:
+    a description of the problem is appended to list errors (if any).
+    """
+    info = dict(info or {})
+    info[u'date'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+    if mode != PROFILING_SAMPLING:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is active (Python 3.12+), sample instead...
+            mode = PROFILING_SAMPLING
+        else:
+            info[u'mode'] = mode
+            start = time.perf_counter()
+            try:
+                return function()
+            finally:
+                profiler.disable()
+                info[u'duration'] = time.perf_counter() - start
+                _saveProfile(
+                    profiler.dump_stats, basePath + u'.prof', info, errors
+                )
+    info[u'mode'] = mode
+    start = time.perf_counter()
+    profiler = SamplingProfiler()
+    profiler.start()
+    try:
+        return function()
+    finally:
+        profiler.stop()
+        info[u'duration'] = time.perf_counter() - start
+        info[u'samples'] = profiler.numSamples
+        info[u'interval'] = profiler.interval
+        _saveProfile(profiler.dump, basePath + u'.txt', info, errors)
+
+
+def _saveProfile(dump, path, info, errors=None):
+    info[u'profile'] = os.path.basename(path)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        dump(path)
+        with open(
+            os.path.splitext(path)[0] + u'.json', 'w', encoding='utf-8'
+        ) as infoFile:
+            json.dump(info, infoFile, indent=2, sort_keys=True)
+    except OSError as exc:
+        if errors is not None:
+            errors.append(u"Profile could not be saved: %s" % exc)
@@ -0,0 +1,228 @@
+"""
+Module TextableTelemetry.py
+Copyright 2012-2025 Aris Xanthos
+-----------------------------------------------------------------------------
+This file is part of the Orange3-Textable package.
+
+Orange3-Textable is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Orange3-Textable is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Orange3-Textable. If not, see <http://www.gnu.org/licenses/>.
+-----------------------------------------------------------------------------
+Telemetry of the tasks run by Textable widgets (see
+OWTextableBaseWidget.threading): for each task, the time it waited for a
+worker thread and the time it ran, the number of segments (or table rows)
+it got as input and produced, the number of characters in input segments
+(only when requested, since counting them takes a pass over all input
+segments), the increase of the resident memory of the process at its peak
+while it ran (see TextableIO.MemoryMonitor), whether its result came from a
+cache (memo or snapshot), and whether it was cancelled.
+
+Records are shown in the details panel of widgets' info box, and appended
+as JSON lines to the file named by environment variable
+TEXTABLE_TELEMETRY_LOG if it is set. Like TextableProcess, this module must
+not import Qt or Orange.
+-----------------------------------------------------------------------------
+Provides classes:
+- TaskTelemetry
+-----------------------------------------------------------------------------
+Provides functions:
+- getTelemetryLogPath
+- appendToTelemetryLog
+"""
+
+__version__ = '0.2.1'
+
+import os
+import json
+import time
+import threading
+
+from LTTL.Segmentation import Segmentation
+
+from _textable.widgets.TextableIO import MemoryMonitor
+from _textable.widgets.TextableProfile import getTaskInputs
+
+# Environment variable naming the file telemetry records are appended to...
+TELEMETRY_LOG_VARIABLE = 'TEXTABLE_TELEMETRY_LOG'
+
+# Serializes writes to the log file...
+_logLock = threading.Lock()
+
+
+class TaskTelemetry(object):
+    """Measurements of a widget task
+
+    The task is wrapped with run() (which measures it in the worker
+    thread) and the function computing its result (as opposed to getting
+    it from a cache) with compute(); finish() is then called in the main
+    thread when the task has finished or has been cancelled. Characters in
+    input segments are only counted if countCharacters is True.
+    """
+
+    def __init__(self, widget, caption, uuid=None, function=None,
+                 countCharacters=False):
+        self.widget = widget
+        self.caption = caption
+        self.uuid = uuid
+        self.inputs = getTaskInputs(function)
+        self.submitTime = time.monotonic()
+        self.startTime = None
+        self.endTime = None
+        self.cancelTime = None
+        self.segmentsIn = sum(_getSize(value) for value in self.inputs)
+        self.segmentsOut = None
+        self.countCharacters = countCharacters
+        self.characters = None
+        self.peakMemoryDelta = None
+        self.cacheHit = False
+        self.computed = False
+        self.cancelled = False
+        self.state = None
+        # Problems with profiling or logging the task (see
+        # OWTextableBaseWidget.recordTelemetry)...
+        self.errors = list()
+        self.date = time.strftime('%Y-%m-%dT%H:%M:%S')
+
+    def run(self, function):
+        """Call the task function and measure it (in the worker thread)"""
+        self.startTime = time.monotonic()
+        # (Nested code such as Text Files' imports uses the same monitor,
+        # see TextableIO.getCurrentMonitor.)
+        memoryMonitor = MemoryMonitor()
+        result = None
+        try:
+            with memoryMonitor:
+                result = function()
+            return result
+        finally:
+            self.endTime = time.monotonic()
+            self.peakMemoryDelta = memoryMonitor.peakIncrease
+            self.segmentsOut = _getOutputSize(result)
+            if self.countCharacters and not self.cancelled:
+                self.characters = sum(
+                    _getNumCharacters(value) for value in self.inputs
+                )
+
+    def compute(self, function):
+        """Call the function computing the task result, recording that the
+        result didn't come from a cache"""
+        self.computed = True
+        return function()
+
+    def finish(self, state=None, cancelled=False):
+        """Record the end of the task (in the main thread)"""
+        self.state = state
+        if cancelled:
+            self.cancelled = True
+            self.cancelTime = time.monotonic()
+        elif self.startTime is not None and not self.computed:
+            self.cacheHit = True
+        # Inputs mustn't be kept alive by records...
+        self.inputs = list()
+
+    @property
+    def queueTime(self):
+        """Seconds between submission and start of the task"""
+        if self.startTime is None:
+            return None
+        return self.startTime - self.submitTime
+
+    @property
+    def runTime(self):
+        """Seconds the task ran for (until cancellation if cancelled)"""
+        if self.startTime is None:
+            return None
+        endTime = self.endTime
+        if self.cancelled:
+            endTime = min(endTime or self.cancelTime, self.cancelTime)
+        return max(0.0, endTime - self.startTime)
+
+    def asDict(self):
+        """Return the record as a dict (as written to the log)"""
+        return {
+            u'date': self.date,
+            u'widget': self.widget,
+            u'caption': self.caption,
+            u'uuid': self.uuid,
+            u'queue_time': self.queueTime,
+            u'run_time': self.runTime,
+            u'segments_in': self.segmentsIn,
+            u'segments_out': self.segmentsOut,
+            u'characters': self.characters,
+            u'peak_memory_delta': self.peakMemoryDelta,
+            u'cache_hit': self.cacheHit,
+            u'cancelled': self.cancelled,
+            u'state': self.state,
+        }
+
+
+def _getSize(value):
+    if isinstance(value, Segmentation):
+        return len(value)
+    return len(value.row_ids)
+
+
+def _getOutputSize(result):
+    """Return the number of segments (or table rows) in a task result, or
+    None if it contains no segmentation or table"""
+    if isinstance(result, (list, tuple)):
+        sizes = [_getOutputSize(item) for item in result]
+        sizes = [size for size in sizes if size is not None]
+        return sum(sizes) if sizes else None
+    if isinstance(result, Segmentation):
+        return len(result)
+    if hasattr(result, 'row_ids') and hasattr(result, 'col_ids'):
+        return len(result.row_ids)
+    return None
+
+
+def _getNumCharacters(value):
+    """Return the number of characters in the segments of a segmentation
+    (0 for tables)"""
+    if not isinstance(value, Segmentation):
+        return 0
+    lengths = dict()
+    total = 0
+    for segment in value:
+        end = segment.end
+        if end is None:
+            end = lengths.get(segment.str_index)
+            if end is None:
+                string = Segmentation.get_data(segment.str_index)
+                end = lengths[segment.str_index] = len(string or u'')
+        total += end - (segment.start or 0)
+    return total
+
+
+def getTelemetryLogPath():
+    """Return the path of the telemetry log (environment variable
+    TEXTABLE_TELEMETRY_LOG), or None if there is none"""
+    return os.environ.get(TELEMETRY_LOG_VARIABLE, '').strip() or None
+
+
+def appendToTelemetryLog(record, path=None):
+    """Append a record to the telemetry log (as a JSON line), if any
+
+    Failures to write mustn't disturb widgets: they are appended to the
+    record's errors.
+    """
+    if path is None:
+        path = getTelemetryLogPath()
+    if path is None:
+        return
+    line = json.dumps(record.asDict(), sort_keys=True)
+    try:
+        with _logLock:
+            with open(path, 'a', encoding='utf-8') as logFile:
+                logFile.write(line + u'\n')
+    except OSError as exc:
+        record.errors.append(u"Telemetry could not be logged: %s" % exc)
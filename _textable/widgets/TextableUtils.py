@@ -29,6 +29,8 @@ Provides classes:
 - SegmentationListContextHandler
 - SegmentationContextHandler
 - OWTextableBaseWidget
+- ProgressReporter
+- ResultMemo
 - ProgressBar
 - ExpandableOrangeLineEdit
 -----------------------------------------------------------------------------
@@ -37,22 +39,39 @@ Provides functions:
 - updateMultipleInputs
 - normalizeCarriageReturns
 - getPredefinedEncodings
+- getFingerprint
 """
 
-__version__ = '0.24'
+__version__ = '0.33'
 
-import re, os, uuid
+import re, os, uuid, time, threading
+import collections, hashlib, itertools, marshal, pickle, weakref
 
 from LTTL.Segmentation import Segmentation
+import LTTL.Table
+import LTTL.TableThread
+
+from _textable.widgets.TextableProcess import (
+    CancellationToken, isProcessBackendEnabled, isHardCancelEnabled,
+    acceptsCancelToken, isRemotable, runInProcess, HARD_CANCEL_DELAY,
+    SnapshotStore, isSnapshotStoreEnabled, digestString,
+)
+from _textable.widgets.TextableProfile import (
+    getProfilingMode, getInputSizes, getProfileBasePath, profileCall,
+    PROFILING_OFF, PROFILING_MODES,
+)
+from _textable.widgets.TextableTelemetry import (
+    TaskTelemetry, appendToTelemetryLog, getTelemetryLogPath,
+)
 
 from Orange.widgets import gui, settings, utils as widgetutils
 from Orange.widgets.utils.buttons import VariableTextPushButton
 from Orange.widgets import widget
 
-from AnyQt.QtCore import QTimer, QEventLoop
+from AnyQt.QtCore import Qt, QTimer, QEventLoop
 from AnyQt.QtWidgets import (QSizePolicy, QApplication, QWidget, QPushButton, 
                             QHBoxLayout, QDialog, QLineEdit, QVBoxLayout, 
-                            QDialogButtonBox, QStyle)
+                            QDialogButtonBox, QStyle, QToolButton)
 
 # Threading
 from AnyQt.QtCore import QThread, pyqtSlot, pyqtSignal
@@ -60,6 +79,22 @@ from Orange.widgets.utils.concurrent import ThreadExecutor, FutureWatcher
 from functools import partial
 import concurrent.futures
 
+# Default debounce interval of send buttons (in milliseconds)...
+DEBOUNCE_INTERVAL = 300
+
+# Default bounds of the memo of task results (see ResultMemo)...
+MEMO_MAX_ENTRIES = 10
+MEMO_MAX_SIZE = 256 * 2**20
+
+# Approximate memory used by a segment, by a cell of a Textable table and
+# by an object in an array of an Orange table (in bytes)...
+SEGMENT_SIZE = 200
+TABLE_CELL_SIZE = 100
+OBJECT_SIZE = 50
+
+# Classes of Textable tables (those of LTTL.TableThread are used by widgets
+# that run in a worker thread, and don't derive from those of LTTL.Table)...
+TEXTABLE_TABLE_TYPES = (LTTL.Table.Table, LTTL.TableThread.Table)
 
 
 class Task:
@@ -67,6 +102,7 @@ class Task:
 
     future = ...   # type: concurrent.futures.Future
     watcher = ...  # type: FutureWatcher
+    telemetry = None  # type: Optional[TaskTelemetry]
     cancelled = False
 
     def cancel(self):
@@ -91,8 +127,15 @@ class SendButton(object):
         infoBoxAttribute=None,
         sendIfPreCallback=None,
         sendIfPostCallback=None,
+        debounceInterval=0,
     ):
-        """Initialize a new Send Button instance"""
+        """Initialize a new Send Button instance
+
+        If debounceInterval is positive, automatic sending is postponed
+        until settings have not changed for that many milliseconds, so that
+        a burst of changes (e.g. typing or dragging a spin box) results in
+        a single run; numAvoidedRuns counts the runs thus saved.
+        """
         self.widget = widget
         self.master = master
         self.callback = callback
@@ -104,6 +147,9 @@ class SendButton(object):
         self.infoBoxAttribute = infoBoxAttribute
         self.sendIfPreCallback = sendIfPreCallback
         self.sendIfPostCallback = sendIfPostCallback
+        self.debounceInterval = debounceInterval
+        self.debounceTimer = None
+        self.numAvoidedRuns = 0
 
     def draw(self):
         """Draw the send button and stopper on window"""
@@ -166,13 +212,40 @@ class SendButton(object):
         """Send data if autoSend is on, else register setting change"""
         if self.sendIfPreCallback is not None:
             self.sendIfPreCallback()
-        if self.master.autoSend:
+        if self.master.autoSend and self.debounceInterval > 0:
+            setattr(self.master, self.changedFlag, True)
+            self.scheduleSend()
+        elif self.master.autoSend:
             self.callback()
         else:
             setattr(self.master, self.changedFlag, True)
         if self.sendIfPostCallback is not None:
             self.sendIfPostCallback()
 
+    def scheduleSend(self):
+        """Send data once debounceInterval ms have passed without another
+        call (a pending send being replaced counts as an avoided run)
+        """
+        if self.debounceTimer is None:
+            self.debounceTimer = QTimer(self.master)
+            self.debounceTimer.setSingleShot(True)
+            self.debounceTimer.timeout.connect(self.sendPending)
+        if self.debounceTimer.isActive():
+            self.numAvoidedRuns += 1
+        self.debounceTimer.start(self.debounceInterval)
+
+    def sendPending(self):
+        """Send data scheduled by scheduleSend (unless autoSend was
+        unchecked in the meantime)
+        """
+        if self.master.autoSend:
+            self.callback()
+
+    def cancelPendingSend(self):
+        """Drop data sending scheduled by scheduleSend, if any"""
+        if self.debounceTimer is not None:
+            self.debounceTimer.stop()
+
     def settingsChanged(self):
         """Notify setting change and send (if autoSend)"""
         if self.infoBoxAttribute is not None:
@@ -289,6 +362,8 @@ class InfoBox(object):
         self.stringSeeWidgetState = stringSeeWidgetState
         self.stringClickSend = stringClickSend
         self.wrappedWidth = wrappedWidth
+        self.message = u''
+        self.state = 'ok'
 
         # Path to icons...
         iconDir = os.path.join(
@@ -318,10 +393,33 @@ class InfoBox(object):
                                       QSizePolicy.Preferred)
         self.stateLabel.setWordWrap(True)
 
+        # Collapsible details about the last run (see setDetails)...
+        self.detailsButton = QToolButton()
+        self.detailsButton.setText(u'Run details')
+        self.detailsButton.setCheckable(True)
+        self.detailsButton.setAutoRaise(True)
+        self.detailsButton.setToolButtonStyle(Qt.ToolButtonTextBesideIcon)
+        self.detailsButton.setArrowType(Qt.RightArrow)
+        self.detailsButton.setToolTip(
+            u"Show or hide measurements of the last run of this widget."
+        )
+        self.detailsButton.toggled.connect(self.toggleDetails)
+        self.detailsButton.setVisible(False)
+        box.layout().addWidget(self.detailsButton)
+        self.detailsLabel = gui.widgetLabel(
+            widget=box,
+            label=u'',
+        )
+        self.detailsLabel.setWordWrap(True)
+        self.detailsLabel.setVisible(False)
+
         self.initialMessage()
 
     def setText(self, message='', state='ok'):
         """Format and display message"""
+        # Last message and state (e.g. for reporting in headless runs)...
+        self.message = message
+        self.state = state
         self.widget.window().warning("")
         self.widget.window().error("")
         if state == 'ok':
@@ -336,6 +434,31 @@ class InfoBox(object):
             "<html><img src='%s'>&nbsp;&nbsp;%s</html>" % (iconPath, message)
         )
 
+    def setDetails(self, details):
+        """Set the text of the details panel (shown on demand)"""
+        if not hasattr(self, 'detailsLabel'):
+            return
+        self.detailsLabel.setText(details)
+        self.detailsButton.setVisible(bool(details))
+        self.detailsLabel.setVisible(
+            bool(details) and self.detailsButton.isChecked()
+        )
+
+    def isDetailsShown(self):
+        """Return True if the details panel is shown"""
+        return (
+            hasattr(self, 'detailsButton')
+            and self.detailsButton.isChecked()
+        )
+
+    def toggleDetails(self, shown):
+        """Show or hide the details panel"""
+        self.detailsButton.setArrowType(
+            Qt.DownArrow if shown else Qt.RightArrow
+        )
+        self.detailsLabel.setVisible(shown)
+        self.widget.window().adjustSizeWithTimer()
+
     def initialMessage(self):
         """Display initial message"""
         self.setText(
@@ -957,8 +1080,8 @@ class OWTextableBaseWidget(widget.OWWidget, openclass=True):
 
     """
     
-    # Signals
-    signal_prog = pyqtSignal((int, bool)) # Progress bar (value, init)
+    # Signals (progress is reported through signal_prog, see below)
+    _signal_prog = pyqtSignal((int, bool)) # Progress bar (value, init)
     signal_text = pyqtSignal((str, str))  # Text label (text, infotype)
     signal_cancel_button = pyqtSignal(bool)     # Allow to Deactivate cancel
                                                 # button from worker thread
@@ -968,11 +1091,19 @@ class OWTextableBaseWidget(widget.OWWidget, openclass=True):
     #: A global widget unique id, for every widget created anew (i.e. not
     #: restored from a saved workflow) a new unique id is issued.
     uuid = settings.Setting(None, schema_only=True)  # type: str
+    #: Profiling of the widget's tasks (see TextableProfile), which takes
+    #: precedence over environment variable TEXTABLE_PROFILE unless off.
+    profilingMode = settings.Setting(PROFILING_OFF, schema_only=True)
 
     # Disable default OWWidget message bar
     # All in widget messages are delegated to InfoBox ??
     want_message_bar = False
 
+    # Widgets may set this to True in order to reuse the result of a
+    # previous task with the same function, inputs and settings rather
+    # than computing it again (see getMemoKey)
+    memoizeResults = False
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         # uuid is None -> a new widget, otherwise it was restored from a
@@ -989,16 +1120,41 @@ class OWTextableBaseWidget(widget.OWWidget, openclass=True):
         # Threading
         self._task = None  # type: Optional[Task]
         self._executor = ThreadExecutor()
-        self.cancel_operation = False
+        self.cancelToken = CancellationToken()
+        self.lastCancelLatency = None
+        self.resultMemo = ResultMemo()
+        self.lastTelemetry = None  # type: Optional[TaskTelemetry]
 
         # Connect signals to slots
-        self.signal_prog.connect(self.update_progress_bar) 
+        self.progressReporter = ProgressReporter(self._signal_prog)
+        self._signal_prog.connect(self.update_progress_bar)
+        # While a task is running, progress values held back by the
+        # reporter are flushed periodically...
+        self._progressTimer = QTimer(self)
+        self._progressTimer.setInterval(
+            int(1000 * self.progressReporter.minInterval)
+        )
+        self._progressTimer.timeout.connect(self.progressReporter.flush)
         self.signal_text.connect(self.update_infobox)
         self.signal_cancel_button.connect(self.disable_cancel_button)
 
         # Attribute to handle GUI visibility
         self.guiElements = []
 
+    @property
+    def signal_prog(self):
+        """Progress reporter, used like a signal (emit(value, init)) by
+        widgets and by LTTL functions that they call with caller=self
+        """
+        return self.progressReporter
+
+    def progressBarInit(self, *args, **kwargs):
+        """Reimplemented so that the progress reporter forwards the values
+        of the next task (including completion) to the new progress bar
+        """
+        self.progressReporter.reset()
+        super().progressBarInit(*args, **kwargs)
+
     def adjustSizeWithTimer(self):
         self.ensurePolished()
         if self.layout():
@@ -1042,6 +1198,7 @@ class OWTextableBaseWidget(widget.OWWidget, openclass=True):
 
         # Thread currently running, freeze the GUI
         if processing:
+            self._progressTimer.start()
             for guiElement in self.guiElements:
                 if guiElement.__class__.__name__ == "AdvancedSettings":
                     guiElement.checkbox.setDisabled(1)
@@ -1055,6 +1212,7 @@ class OWTextableBaseWidget(widget.OWWidget, openclass=True):
 
         # Thread done or not running, unfreeze the GUI
         else:
+            self._progressTimer.stop()
             # If "Send automatically" is disabled, reactivate "Send" button
             if not self.sendButton.autoSendCheckbox.isChecked():
                 self.sendButton.mainButton.setDisabled(0) # Send: ENABLED
@@ -1084,22 +1242,56 @@ class OWTextableBaseWidget(widget.OWWidget, openclass=True):
         used for manual cancellations """
         self.cancel(manualCancel=True)
     
+    @property
+    def cancel_operation(self):
+        """True if the current task was cancelled (polled by worker
+        functions, see also cancelToken)"""
+        return self.cancelToken.cancelled
+
+    @cancel_operation.setter
+    def cancel_operation(self, value):
+        if value:
+            self.cancelToken.cancel()
+        # Resetting the flag provides a new token, so that functions that
+        # are still running with the old one remain cancelled...
+        elif self.cancelToken.cancelled:
+            self.cancelToken = CancellationToken()
+
     def cancel(self, manualCancel=False):
         # Make loop break
         self.cancel_operation = True
+        wasRunning = self._task is not None
 
         # Cancel current task
         if self._task is not None:
             self._task.cancel()
             assert self._task.future.done()
+            # Time between cancellation request and end of task...
+            self.lastCancelLatency = (
+                time.monotonic() - self.cancelToken.requestTime
+            )
             # Disconnect slot
             self._task.watcher.done.disconnect(self.task_finished)
+            telemetry = self._task.telemetry
             self._task = None
+            if telemetry is not None:
+                telemetry.finish(cancelled=True)
+                self.recordTelemetry(telemetry)
             
             # Send None to output
             self.sendNoneToOutputs()
             
+        # Drop any run scheduled by a debounced send button...
         if manualCancel:
+            self.sendButton.cancelPendingSend()
+
+        if manualCancel and wasRunning:
+            self.infoBox.setText(
+                u'Operation cancelled by user (stopped in %.2f s).'
+                % self.lastCancelLatency,
+                'warning',
+            )
+        elif manualCancel:
             self.infoBox.setText(u'Operation cancelled by user.', 'warning')
             
         # Manage GUI visibility
@@ -1148,9 +1340,85 @@ class OWTextableBaseWidget(widget.OWWidget, openclass=True):
             self.cancel()
         assert self._task is None
 
-        self.cancel_operation = False
+        # Each task gets its own cancellation token...
+        self.cancelToken = CancellationToken()
+
+        # Input sizes are part of the label of profiles...
+        profilingMode = self.getTaskProfilingMode()
+        if profilingMode != PROFILING_OFF:
+            inputSizes = getInputSizes(threaded_function)
+        # (Characters in input segments are only counted if they will be
+        # reported, since this takes a pass over all segments.)
+        infoBox = getattr(self, 'infoBox', None)
+        telemetry = TaskTelemetry(
+            self.name, self.captionTitle, self.uuid, threaded_function,
+            countCharacters=(
+                getTelemetryLogPath() is not None
+                or (infoBox is not None and infoBox.isDetailsShown())
+            ),
+        )
+
+        # Key of the result of this task among memoized ones...
+        memoKey = self.getMemoKey(threaded_function)
+
+        # Pass the cancellation token to functions that accept it, and run
+        # LTTL functions in a worker process if the process backend or hard
+        # cancel is enabled (see TextableProcess)...
+        if acceptsCancelToken(threaded_function):
+            threaded_function = partial(
+                threaded_function, cancelToken=self.cancelToken
+            )
+        elif isRemotable(threaded_function):
+            if isHardCancelEnabled():
+                threaded_function = partial(
+                    runInProcess,
+                    threaded_function,
+                    cancelToken=self.cancelToken,
+                    hardCancelDelay=HARD_CANCEL_DELAY,
+                )
+            elif isProcessBackendEnabled():
+                threaded_function = partial(
+                    runInProcess,
+                    threaded_function,
+                    cancelToken=self.cancelToken,
+                )
+        # Telemetry tells computed results from cached ones...
+        threaded_function = partial(telemetry.compute, threaded_function)
+
+        # Look up the result among memoized ones (and in snapshots on disk
+        # if they are enabled) in the worker thread...
+        if memoKey is not None:
+            store = None
+            if isSnapshotStoreEnabled():
+                store = _getSnapshotStore()
+            threaded_function = partial(
+                self.resultMemo.run,
+                memoKey,
+                threaded_function,
+                self.cancelToken,
+                store,
+                self.uuid,
+            )
+
+        threaded_function = partial(telemetry.run, threaded_function)
+
+        # Profile the task if requested...
+        if profilingMode != PROFILING_OFF:
+            threaded_function = partial(
+                profileCall,
+                threaded_function,
+                profilingMode,
+                getProfileBasePath(self.name, self.captionTitle, inputSizes),
+                {
+                    u'widget': self.name,
+                    u'caption': self.captionTitle,
+                    u'inputs': inputSizes,
+                },
+                telemetry.errors,
+            )
 
         self._task = task = Task()
+        task.telemetry = telemetry
         
         # Threading start, future, and watcher
         task.future = self._executor.submit(threaded_function)
@@ -1159,7 +1427,129 @@ class OWTextableBaseWidget(widget.OWWidget, openclass=True):
         
         # Manage GUI visibility
         self.manageGuiVisibility(True) # Processing
+
+    def runTaskStep(self, function):
+        """Run a step of a task that is a method of the widget (see
+        threading) and return its result
+
+        Remotable steps (see isRemotable, e.g. LTTL table conversions with
+        a caller keyword argument) are run like tasks that are LTTL
+        functions: in a worker process if the process backend is enabled,
+        which is terminated when cancelled if hard cancel is enabled.
+        """
+        if isRemotable(function):
+            if isHardCancelEnabled():
+                return runInProcess(
+                    function,
+                    cancelToken=self.cancelToken,
+                    hardCancelDelay=HARD_CANCEL_DELAY,
+                )
+            elif isProcessBackendEnabled():
+                return runInProcess(function, cancelToken=self.cancelToken)
+        return function()
     
+    def recordTelemetry(self, telemetry):
+        """Show the telemetry of the last task in the details panel of the
+        info box and append it to the telemetry log (if any)
+
+        Problems with profiling or logging the task are shown in the
+        details panel and, if the task succeeded, as a warning.
+        """
+        self.lastTelemetry = telemetry
+        appendToTelemetryLog(telemetry)
+        self.infoBox.setDetails(self.formatTelemetry(telemetry))
+        if telemetry.errors and self.infoBox.state == 'ok':
+            self.infoBox.setText(
+                u'%s %s.' % (
+                    self.infoBox.message, u'; '.join(telemetry.errors)
+                ),
+                'warning',
+            )
+
+    def formatTelemetry(self, telemetry):
+        """Return a description of a task's telemetry"""
+        lines = list()
+        if telemetry.startTime is None:
+            lines.append(u'Cancelled before starting.')
+        else:
+            lines.append(u'Waited %.2f s, ran %.2f s%s.' % (
+                telemetry.queueTime,
+                telemetry.runTime,
+                u' (cancelled)' if telemetry.cancelled else u'',
+            ))
+        line = pluralize(
+            u'%i segment@p in' % telemetry.segmentsIn, telemetry.segmentsIn
+        )
+        if telemetry.characters is not None:
+            line += pluralize(
+                u' (%i character@p)' % telemetry.characters,
+                telemetry.characters,
+            )
+        if telemetry.segmentsOut is not None:
+            line += u', %i out' % telemetry.segmentsOut
+        lines.append(line + u'.')
+        if telemetry.peakMemoryDelta is not None:
+            lines.append(u'Peak memory increase: %.1f MB.' % (
+                telemetry.peakMemoryDelta / 2**20
+            ))
+        if telemetry.cacheHit:
+            lines.append(u'Result reused from a previous run.')
+        lines.extend(u'%s.' % error for error in telemetry.errors)
+        sendButton = getattr(self, 'sendButton', None)
+        if getattr(sendButton, 'debounceInterval', 0) > 0:
+            lines.append(pluralize(
+                u'%i run@p avoided by waiting for changes to end.'
+                % sendButton.numAvoidedRuns,
+                sendButton.numAvoidedRuns,
+            ))
+        return u'\n'.join(lines)
+
+    def getTaskProfilingMode(self):
+        """Return the profiling mode of tasks: the widget's one unless
+        off, otherwise the one set by environment variable TEXTABLE_PROFILE
+        """
+        if (
+            self.profilingMode != PROFILING_OFF
+            and self.profilingMode in PROFILING_MODES
+        ):
+            return self.profilingMode
+        return getProfilingMode()
+
+    def getMemoKey(self, function):
+        """Return the key under which the result of function (a task) is
+        memoized, or None if it shouldn't be
+
+        The key is made of a fingerprint of the widget's settings and of
+        the function and its arguments (e.g. input segmentations), whose
+        fingerprint is computed by ResultMemo.run in the worker thread
+        (since it hashes the content of inputs). Widgets may override this
+        to exclude some tasks (e.g. random ones).
+        """
+        if not self.memoizeResults or not isinstance(function, partial):
+            return None
+        func = getattr(function.func, '__func__', function.func)
+        settingValues = [
+            (name, getattr(self, name, None))
+            for name, setting in sorted(
+                self.settingsHandler.provider.settings.items()
+            )
+            if not getattr(setting, 'schema_only', False)
+        ]
+        try:
+            settingsFingerprint = getFingerprint(settingValues)
+        except (TypeError, ValueError, RecursionError):
+            return None
+        return (
+            settingsFingerprint,
+            func.__module__,
+            func.__qualname__,
+            [arg for arg in function.args if arg is not self],
+            {
+                key: value for key, value in function.keywords.items()
+                if value is not self
+            },
+        )
+
     def task_decorator(task_function):
             """ Decorator for the task_finished function """
             @pyqtSlot(concurrent.futures.Future)
@@ -1169,6 +1559,7 @@ class OWTextableBaseWidget(widget.OWWidget, openclass=True):
                 assert self._task.future is f
                 assert f.done()
 
+                telemetry = self._task.telemetry
                 self._task = None
                 
                 try:
@@ -1215,6 +1606,9 @@ class OWTextableBaseWidget(widget.OWWidget, openclass=True):
                     # Following called moved here from manageGuiVisibility
                     # (AX 7.3.25)
                     self.sendButton.resetSettingsChangedFlag()
+                    if telemetry is not None:
+                        telemetry.finish(state=self.infoBox.state)
+                        self.recordTelemetry(telemetry)
             return _task_finished
     
     def create_widgetbox(self, box, orientation, addSpace=False):
@@ -1237,7 +1631,563 @@ class OWTextableBaseWidget(widget.OWWidget, openclass=True):
         )
         self.guiElements.append(self.advancedSettings)
         return self.advancedSettings
+
+    def create_profilingBox(self):
+        """Profiling box creator (shown with advanced settings, if the
+        widget has some)"""
+        self.profilingBox = self.create_widgetbox(
+            box=u'Profiling',
+            orientation='horizontal',
+        )
+        gui.comboBox(
+            widget=self.profilingBox,
+            master=self,
+            value='profilingMode',
+            items=list(PROFILING_MODES),
+            sendSelectedValue=True,
+            label=u'Profile processing:',
+            labelWidth=131,
+            orientation='horizontal',
+            tooltip=(
+                u"Save a profile of each run of this widget, showing\n"
+                u"where processing time is spent (e.g. to join it to\n"
+                u"a bug report about slow processing).\n\n"
+                u"'Full' records every function call, which slows\n"
+                u"processing down; 'Sampling' records what is being\n"
+                u"computed at regular intervals, at a much lower cost.\n\n"
+                u"Profiles are saved in the 'profiles' folder of\n"
+                u"Textable's user data folder, unless another one is\n"
+                u"set with environment variable TEXTABLE_PROFILE_DIR."
+            ),
+        )
+        if getattr(self, 'advancedSettings', None) is not None:
+            self.advancedSettings.advancedWidgets.append(self.profilingBox)
+            self.profilingBox.setVisible(
+                bool(getattr(self, 'displayAdvancedSettings', False))
+            )
+        return self.profilingBox
+
+    def create_debounceSpin(self, widget):
+        """Spin box for the debounce interval of the send button (setting
+        debounceInterval, see SendButton)
+        """
+        return gui.spin(
+            widget=widget,
+            master=self,
+            value='debounceInterval',
+            minv=0,
+            maxv=5000,
+            step=50,
+            orientation='horizontal',
+            label=u'Wait before sending (ms):',
+            labelWidth=180,
+            callback=self.updateDebounceInterval,
+            keyboardTracking=False,
+            tooltip=(
+                u"When 'Send automatically' is checked, wait until\n"
+                u"settings or input haven't changed for this number\n"
+                u"of milliseconds before processing, so that e.g.\n"
+                u"typing a regex results in a single run. Set to 0\n"
+                u"to process data at every change."
+            ),
+        )
+
+    def updateDebounceInterval(self):
+        """Apply the debounce interval setting to the send button"""
+        self.sendButton.debounceInterval = self.debounceInterval
     
+class ProgressReporter(object):
+    """Rate-limited, coalescing forwarding of progress values to a signal
+
+    Values are forwarded (with emit(value, init), like a signal) only if
+    their whole percentage differs from the last one forwarded, and at
+    most maxRate times per second; in between, only the last value is
+    kept, and it is forwarded with the next one that gets through.
+    Re-initialization and completion (100) are always forwarded at once.
+    Thread-safe.
+    """
+
+    def __init__(self, signal, maxRate=20):
+        """Initialize a ProgressReporter instance"""
+        self.signal = signal
+        self.minInterval = 1 / maxRate
+        self.lock = threading.Lock()
+        self.lastValue = None
+        self.lastTime = 0
+        self.pending = None
+
+    def emit(self, value, init=False):
+        """Report progress value (re-initializing progress if init)"""
+        value = int(value)
+        if (
+            not init and value < 100
+            and (value == self.lastValue or value == self.pending)
+        ):
+            return
+        with self.lock:
+            if init or value >= 100:
+                self.pending = None
+            elif value == self.lastValue:
+                return
+            elif time.monotonic() - self.lastTime < self.minInterval:
+                self.pending = value
+                return
+            self.lastValue = value
+            self.lastTime = time.monotonic()
+            self.signal.emit(value, init)
+
+    def reset(self):
+        """Forget the values forwarded so far (e.g. when the progress bar
+        is re-initialized without this reporter)"""
+        with self.lock:
+            self.lastValue = None
+            self.pending = None
+            self.lastTime = 0
+
+    def flush(self):
+        """Forward the last value kept (if any)"""
+        with self.lock:
+            value, self.pending = self.pending, None
+            if value is not None and value != self.lastValue:
+                self.lastValue = value
+                self.lastTime = time.monotonic()
+                self.signal.emit(value, False)
+
+
+class ResultMemo(object):
+    """Memo of task results, keyed on fingerprints (see
+    OWTextableBaseWidget.getMemoKey)
+
+    The least recently used results are dropped when there are more than
+    maxEntries of them or when their total (estimated) size exceeds maxSize
+    bytes; larger results are never memoized. Results referring to strings
+    of Segmentation.data that have since been released or replaced are
+    dropped rather than returned. Thread-safe.
+    """
+
+    # Default value returned by get for keys that aren't memoized...
+    MISSING = object()
+
+    def __init__(self, maxEntries=MEMO_MAX_ENTRIES, maxSize=MEMO_MAX_SIZE):
+        """Initialize a ResultMemo instance"""
+        self.maxEntries = maxEntries
+        self.maxSize = maxSize
+        self.entries = collections.OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """Return the result memoized under key (or default)"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and not _areStringsLive(entry[2]):
+                self.size -= self.entries.pop(key)[1]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, result):
+        """Memoize result under key"""
+        strIndices = set()
+        size = _getPickledSize(result, strIndices)
+        if size is None or size > self.maxSize:
+            return
+        # What identifies the strings the result refers to (see get)...
+        strings = {
+            index: _getStringKey(Segmentation.get_data(index))
+            for index in strIndices
+        }
+        with self.lock:
+            if key in self.entries:
+                self.size -= self.entries.pop(key)[1]
+            self.entries[key] = (result, size, strings)
+            self.size += size
+            while (
+                len(self.entries) > self.maxEntries
+                or self.size > self.maxSize
+            ):
+                self.size -= self.entries.popitem(last=False)[1][1]
+
+    def run(self, key, function, cancelToken=None, store=None, name=None):
+        """Return the result memoized under the fingerprint of key, or call
+        function and memoize its result (unless the call was cancelled or
+        returned None)
+
+        If store (a SnapshotStore) is not None, results that aren't
+        memoized are looked up in (and saved to) its entry for name, under
+        the portable fingerprint of key (see getFingerprint).
+        """
+        try:
+            fingerprint = getFingerprint(key)
+            if store is not None:
+                portableFingerprint = getFingerprint(key, portable=True)
+        except (TypeError, ValueError, RecursionError):
+            return function()
+        result = self.get(fingerprint, self.MISSING)
+        if result is not self.MISSING:
+            return result
+        if store is not None:
+            result = store.run(
+                name,
+                portableFingerprint,
+                function,
+                cancelToken,
+                _findStrings,
+                _getLockedStringDigest,
+            )
+        else:
+            result = function()
+        if result is not None and not (
+            cancelToken is not None and cancelToken.cancelled
+        ):
+            self.put(fingerprint, result)
+        return result
+
+    def clear(self):
+        """Drop all memoized results"""
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+
+class _ByteCounter(object):
+    """File-like object counting the bytes written to it"""
+
+    def __init__(self):
+        self.numBytes = 0
+
+    def write(self, data):
+        self.numBytes += len(data)
+
+
+class _SizePickler(pickle.Pickler):
+    """Pickler estimating the size of segmentations, tables and strings
+    from their dimensions rather than pickling them (which is slow), and
+    recording the indices of the strings that segmentations refer to
+    """
+
+    def __init__(self, counter, strIndices):
+        super().__init__(counter, pickle.HIGHEST_PROTOCOL)
+        self.counter = counter
+        self.strIndices = strIndices
+
+    def persistent_id(self, obj):
+        if isinstance(obj, Segmentation):
+            self.counter.numBytes += SEGMENT_SIZE * len(obj)
+            if (
+                obj.segments_nbr_in_chunk == 0
+                and isinstance(obj.buffer, list)
+            ):
+                segments = obj.buffer
+            else:
+                segments = obj
+            self.strIndices.update(
+                [segment.str_index for segment in segments]
+            )
+        elif isinstance(obj, str):
+            self.counter.numBytes += len(obj)
+        elif isinstance(obj, TEXTABLE_TABLE_TYPES):
+            self.counter.numBytes += TABLE_CELL_SIZE * (
+                len(obj.values) + len(obj.row_ids) + len(obj.col_ids)
+            )
+        elif hasattr(obj, 'domain') and hasattr(obj, 'X'):
+            # Orange tables...
+            for name in ('X', 'Y', 'metas', 'W'):
+                array = getattr(obj, name, None)
+                self.counter.numBytes += getattr(array, 'nbytes', 0)
+                if getattr(getattr(array, 'dtype', None), 'kind', '') == 'O':
+                    self.counter.numBytes += OBJECT_SIZE * array.size
+        else:
+            return None
+        return id(obj)
+
+
+def _getPickledSize(obj, strIndices):
+    """Return the size of obj once pickled (an estimate of the memory it
+    uses, see _SizePickler), or None if it can't be pickled; the indices
+    of the strings that
+    segmentations in obj refer to are added to strIndices
+    """
+    counter = _ByteCounter()
+    try:
+        _SizePickler(counter, strIndices).dump(obj)
+    except Exception:
+        return None
+    return counter.numBytes
+
+
+def _areStringsLive(strings):
+    """Return True if the strings of Segmentation.data that a memoized
+    result refers to (a dict mapping their index to their key, see
+    _getStringKey) are still there
+    """
+    return all(
+        stringKey is not None
+        and _getStringKey(Segmentation.get_data(index)) == stringKey
+        for index, stringKey in strings.items()
+    )
+
+
+def getFingerprint(value, portable=False):
+    """Return a hex digest identifying the content of value
+
+    Value may be a segmentation or any (nested) combination of builtin
+    values, segmentations and other objects (identified by their class and
+    attributes). Segmentations are identified by their label, the address
+    and annotations of their segments, the content of the strings they
+    refer to and the indices of these strings in Segmentation.data, so
+    that results computed from a segmentation only match segmentations
+    referring to the same (live) strings. If portable is True, indices
+    are left out (strings are then only identified by their content and
+    order of first appearance), so that fingerprints are stable across
+    sessions (see SnapshotStore, which maps strings back to indices).
+
+    Textable tables are identified by the table object (i.e. they are
+    assumed not to change once created, like tables sent by widgets), so
+    that they aren't hashed on every call; if portable is True, their
+    content is hashed, once per table.
+
+    The fingerprint of a segmentation is cached and updated incrementally
+    as long as segments are only appended to it, so that computing it
+    again is cheap when the segmentation hasn't changed; changes of the
+    strings it refers to (e.g. with Input.update) are detected as well.
+    Segments are otherwise assumed not to change once they are in a
+    segmentation: replacing them (segmentation[index] = segment) or
+    changing their annotations in place goes unnoticed, so widgets must
+    create new segments rather than modify those they receive.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    _updateFingerprint(digest, value, set(), portable)
+    return digest.hexdigest()
+
+
+class _SegmentationFingerprint(object):
+    """Cached (incremental) fingerprint of a segmentation"""
+
+    def __init__(self):
+        self.segments = hashlib.blake2b(digest_size=16)
+        self.numSegments = 0
+        self.buffer = None
+        # Order of first appearance of each string among segments...
+        self.strOrder = dict()
+        self.digest = None
+        self.portableDigest = None
+        self.strDigests = None
+        self.label = None
+
+
+# Caches of segmentation and string fingerprints (the latter map indices
+# in Segmentation.data to the digest of the string there, together with
+# what identifies that string without keeping it alive, see _getStringKey)
+_segmentationFingerprints = weakref.WeakKeyDictionary()
+_stringDigests = dict()
+_fingerprintLock = threading.RLock()
+
+# Tokens identifying table objects, and digests of the content of tables
+# (for portable fingerprints)...
+_tableTokens = weakref.WeakKeyDictionary()
+_tableDigests = weakref.WeakKeyDictionary()
+_tableTokenCounter = itertools.count()
+
+
+def _getTableFingerprint(table, portable=False):
+    """Return a token identifying a table object, or (if portable is True)
+    the cached digest of its content"""
+    with _fingerprintLock:
+        cache = _tableDigests if portable else _tableTokens
+        fingerprint = cache.get(table)
+        if fingerprint is None:
+            if portable:
+                digest = hashlib.blake2b(digest_size=16)
+                digest.update(type(table).__qualname__.encode())
+                _updateFingerprint(digest, vars(table), set(), True)
+                fingerprint = digest.digest()
+            else:
+                fingerprint = b'%i' % next(_tableTokenCounter)
+            cache[table] = fingerprint
+        return fingerprint
+
+
+def _getSegmentationFingerprint(segmentation):
+    """Return the up-to-date cached fingerprint of a segmentation"""
+    with _fingerprintLock:
+        entry = _segmentationFingerprints.get(segmentation)
+        buffer = segmentation.buffer
+        numSegments = len(segmentation)
+        if (
+            entry is None
+            or segmentation.segments_nbr_in_chunk > 0
+            or entry.buffer is not buffer
+            or entry.numSegments > numSegments
+        ):
+            entry = _SegmentationFingerprint()
+            _segmentationFingerprints[segmentation] = entry
+        if entry.numSegments < numSegments:
+            # Only segments appended since the last call are hashed...
+            if segmentation.segments_nbr_in_chunk > 0:
+                segments = list(segmentation)
+            else:
+                segments = buffer[entry.numSegments:]
+            strOrder = entry.strOrder
+            for segment in segments:
+                strOrder.setdefault(segment.str_index, len(strOrder))
+            addresses = [
+                (strOrder[s.str_index], s.start, s.end, s.annotations)
+                for s in segments
+            ]
+            # (Each segment is serialized separately so that the digest
+            # doesn't depend on how segments were appended.)
+            try:
+                entry.segments.update(
+                    b''.join([marshal.dumps(a, 2) for a in addresses])
+                )
+            except ValueError:
+                for address in addresses:
+                    entry.segments.update(repr(address).encode())
+            entry.numSegments = numSegments
+            entry.buffer = buffer
+            entry.digest = None
+        # Strings and label may have been changed in place (e.g. with
+        # Input.update)...
+        strDigests = [_getStringDigest(index) for index in entry.strOrder]
+        if (
+            entry.digest is None
+            or strDigests != entry.strDigests
+            or entry.label != segmentation.label
+        ):
+            digest = entry.segments.copy()
+            digest.update(repr(segmentation.label).encode())
+            for strDigest in strDigests:
+                digest.update(strDigest)
+            entry.portableDigest = digest.digest()
+            digest.update(marshal.dumps(list(entry.strOrder), 2))
+            entry.digest = digest.digest()
+            entry.strDigests = strDigests
+            entry.label = segmentation.label
+        return entry
+
+
+def _getStringKey(string):
+    """Return what identifies a string object without referring to it (its
+    identity, length and hash, which is cached by str objects)
+    """
+    if string is None:
+        return None
+    return (id(string), len(string), hash(string))
+
+
+def _getStringDigest(index):
+    """Return the (cached) digest of the content of a string referred to by
+    segments
+    """
+    string = Segmentation.get_data(index)
+    stringKey = _getStringKey(string)
+    cached = _stringDigests.get(index)
+    if cached is not None and cached[0] == stringKey:
+        return cached[1]
+    digest = digestString(string)
+    if string is None:
+        _stringDigests.pop(index, None)
+    else:
+        _stringDigests[index] = (stringKey, digest)
+    return digest
+
+
+def _getLockedStringDigest(index):
+    """Thread-safe version of _getStringDigest (see SnapshotStore.save)"""
+    with _fingerprintLock:
+        return _getStringDigest(index)
+
+
+def _findStrings(digests):
+    """Return a dict mapping the keys of digests (a dict of hex digests of
+    strings) to the index of identical strings in Segmentation.data, among
+    those whose digest is cached (see SnapshotStore.load)
+
+    Cached digests of strings that have since been released or replaced
+    are dropped.
+    """
+    with _fingerprintLock:
+        indices = dict()
+        for index, (stringKey, digest) in list(_stringDigests.items()):
+            if _getStringKey(Segmentation.get_data(index)) == stringKey:
+                indices[digest.hex()] = index
+            else:
+                del _stringDigests[index]
+    found = dict()
+    for key, digest in digests.items():
+        index = indices.get(digest)
+        if index is not None:
+            found[key] = index
+    return found
+
+
+def _getSnapshotStore():
+    """Return the SnapshotStore shared by widgets (or None if it can't be
+    created)
+    """
+    global _snapshotStore
+    if _snapshotStore is None:
+        try:
+            _snapshotStore = SnapshotStore()
+        except OSError:
+            return None
+    return _snapshotStore
+
+
+_snapshotStore = None
+
+
+def _updateFingerprint(digest, value, seen, portable=False):
+    if isinstance(value, Segmentation):
+        entry = _getSegmentationFingerprint(value)
+        digest.update(b'S')
+        digest.update(entry.portableDigest if portable else entry.digest)
+        return
+    if isinstance(value, TEXTABLE_TABLE_TYPES):
+        digest.update(b'T')
+        digest.update(_getTableFingerprint(value, portable))
+        return
+    if isinstance(value, re.Pattern):
+        digest.update(repr((b'P', value.pattern, value.flags)).encode())
+        return
+    # Sets are sorted (their order of iteration varies across sessions)...
+    if isinstance(value, (set, frozenset)):
+        value = sorted(value, key=repr)
+    # Values made of builtin types are serialized in a single call (in
+    # version 2 of the marshal format, which unlike later ones doesn't
+    # depend on how objects are shared, i.e. on reference counts)...
+    try:
+        digest.update(marshal.dumps(value, 2))
+        return
+    except ValueError:
+        pass
+    if id(value) in seen:
+        digest.update(b'@')
+        return
+    seen.add(id(value))
+    if isinstance(value, (list, tuple)):
+        digest.update(b'L%i' % len(value))
+        for item in value:
+            _updateFingerprint(digest, item, seen, portable)
+    elif isinstance(value, dict):
+        digest.update(b'D%i' % len(value))
+        for key, item in value.items():
+            _updateFingerprint(digest, key, seen, portable)
+            _updateFingerprint(digest, item, seen, portable)
+    elif hasattr(value, '__dict__'):
+        digest.update(type(value).__qualname__.encode())
+        _updateFingerprint(digest, vars(value), seen, portable)
+    else:
+        digest.update(repr(value).encode())
+
+
 class ProgressBar:
     def __init__(self, widget, iterations):
         self.iter = iterations
@@ -0,0 +1,310 @@
+"""
+Module test_TextableHTTP.py
+Copyright 2012-2025 Aris Xanthos
+-----------------------------------------------------------------------------
+This file is part of the Orange3-Textable package.
+
+Orange3-Textable is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Orange3-Textable is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Orange3-Textable. If not, see <http://www.gnu.org/licenses/>.
+-----------------------------------------------------------------------------
+Tests of TextableHTTP against a local HTTP server (run with
+python -m unittest _textable.widgets.tests.test_TextableHTTP).
+"""
+
+import os
+import gzip
+import time
+import shutil
+import tempfile
+import zlib
+import threading
+import collections
+import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from _textable.widgets.TextableHTTP import (
+    URLFetcher, IncompleteContent, HTTPCache
+)
+from _textable.widgets.TextableIO import ReadCancelled
+
+CONTENT = b'Textable test content. ' * 1000
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Handler of the test server (see LocalServer)"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        host = self.headers.get('Host')
+        with server.lock:
+            server.requests[self.path] += 1
+            server.active[host] += 1
+            server.maxActive[host] = max(
+                server.maxActive[host], server.active[host]
+            )
+            numActive = sum(server.active.values())
+            server.maxTotal = max(server.maxTotal, numActive)
+        try:
+            self.respond()
+        finally:
+            with server.lock:
+                server.active[host] -= 1
+
+    def respond(self):
+        path = self.path
+        headers = dict()
+        status = 200
+        content = CONTENT
+        if path == '/gzip':
+            content = gzip.compress(CONTENT)
+            headers['Content-Encoding'] = 'gzip'
+        elif path == '/deflate':
+            content = zlib.compress(CONTENT)
+            headers['Content-Encoding'] = 'deflate'
+        elif path == '/raw-deflate':
+            compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+            content = compressor.compress(CONTENT) + compressor.flush()
+            headers['Content-Encoding'] = 'deflate'
+        elif path == '/flaky':
+            # Unavailable for the first two requests...
+            if self.server.requests[path] <= 2:
+                status = 503
+        elif path == '/missing':
+            status = 404
+        elif path.startswith('/truncated'):
+            # Connection closed after a tenth of the content (only for the
+            # first request of /truncated-once)...
+            if path == '/truncated' or self.server.requests[path] == 1:
+                self.send_response(status)
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content[:len(content) // 10])
+                self.close_connection = True
+                return
+        elif path.startswith('/slow'):
+            time.sleep(0.2)
+        elif path == '/hang':
+            time.sleep(10)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+class LocalServer(ThreadingHTTPServer):
+    """Local HTTP server recording the requests it receives and the
+    maximum number of requests it handles at once (per Host header and in
+    total)
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _Handler)
+        self.lock = threading.Lock()
+        self.requests = collections.Counter()
+        self.active = collections.Counter()
+        self.maxActive = collections.Counter()
+        self.maxTotal = 0
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+
+    def getURL(self, path, host='127.0.0.1'):
+        return 'http://%s:%i%s' % (host, self.server_address[1], path)
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class URLFetcherTestCase(unittest.TestCase):
+    """Base class of tests using a LocalServer and a URLFetcher"""
+
+    def setUp(self):
+        self.server = LocalServer()
+        self.fetchers = list()
+
+    def tearDown(self):
+        for fetcher in self.fetchers:
+            fetcher.shutdown()
+        self.server.stop()
+
+    def getFetcher(self, **kwargs):
+        kwargs.setdefault('maxConnections', 4)
+        kwargs.setdefault('maxPerHost', 4)
+        kwargs.setdefault('timeout', 10)
+        fetcher = URLFetcher(**kwargs)
+        # Requests to the local server mustn't go through a proxy...
+        fetcher.pool.proxies = dict()
+        self.fetchers.append(fetcher)
+        return fetcher
+
+    def fetch(self, fetcher, URLs):
+        futures = fetcher.fetch(URLs)
+        return [future.exception(timeout=30) or future.result()
+                for future in futures]
+
+
+class TestDecoding(URLFetcherTestCase):
+    """Decoding of compressed responses"""
+
+    def testCodings(self):
+        fetcher = self.getFetcher()
+        paths = ['/plain', '/gzip', '/deflate', '/raw-deflate']
+        responses = self.fetch(
+            fetcher, [self.server.getURL(path) for path in paths]
+        )
+        for path, response in zip(paths, responses):
+            self.assertEqual(response.status, 200, path)
+            self.assertEqual(response.content, CONTENT, path)
+
+
+class TestTruncation(URLFetcherTestCase):
+    """Detection of content cut off before its Content-Length"""
+
+    def testTruncatedContentIsAnError(self):
+        fetcher = self.getFetcher()
+        error, = self.fetch(fetcher, [self.server.getURL('/truncated')])
+        self.assertIsInstance(error, IncompleteContent)
+
+    def testTruncatedContentIsRetried(self):
+        fetcher = self.getFetcher(retries=2, backoff=0.01)
+        response, = self.fetch(
+            fetcher, [self.server.getURL('/truncated-once')]
+        )
+        self.assertEqual(response.content, CONTENT)
+        self.assertEqual(self.server.requests['/truncated-once'], 2)
+
+
+class TestRetries(URLFetcherTestCase):
+    """Retries of transient errors only"""
+
+    def testTransientErrorIsRetried(self):
+        fetcher = self.getFetcher(retries=2, backoff=0.01)
+        response, = self.fetch(fetcher, [self.server.getURL('/flaky')])
+        self.assertEqual(response.content, CONTENT)
+        self.assertEqual(self.server.requests['/flaky'], 3)
+
+    def testPermanentErrorIsNotRetried(self):
+        fetcher = self.getFetcher(retries=2, backoff=0.01)
+        error, = self.fetch(fetcher, [self.server.getURL('/missing')])
+        self.assertEqual(getattr(error, 'code', None), 404)
+        self.assertEqual(self.server.requests['/missing'], 1)
+
+    def testInvalidURLIsNotRetried(self):
+        # With retries, the backoff would take about 100 seconds...
+        fetcher = self.getFetcher(retries=5, backoff=10)
+        start = time.monotonic()
+        error, = self.fetch(fetcher, ['ftp://127.0.0.1/file'])
+        self.assertIsInstance(error, IOError)
+        self.assertLess(time.monotonic() - start, 5)
+
+
+class TestScheduling(URLFetcherTestCase):
+    """Global and per-host limits, and reuse of connections"""
+
+    def testPerHostLimit(self):
+        fetcher = self.getFetcher(maxConnections=4, maxPerHost=1)
+        URLs = [
+            self.server.getURL('/slow%i' % index, host)
+            for index in range(3)
+            for host in ('127.0.0.1', 'localhost')
+        ]
+        responses = self.fetch(fetcher, URLs)
+        for response in responses:
+            self.assertEqual(response.content, CONTENT)
+        for host in self.server.maxActive:
+            self.assertEqual(self.server.maxActive[host], 1, host)
+        # Both hosts were fetched from at the same time...
+        self.assertEqual(self.server.maxTotal, 2)
+
+    def testGlobalLimit(self):
+        fetcher = self.getFetcher(maxConnections=2, maxPerHost=4)
+        URLs = [self.server.getURL('/slow%i' % index) for index in range(6)]
+        self.fetch(fetcher, URLs)
+        self.assertEqual(self.server.maxTotal, 2)
+
+    def testConnectionsAreReused(self):
+        fetcher = self.getFetcher(maxConnections=1, poolSize=1)
+        URLs = [self.server.getURL('/plain%i' % index) for index in range(3)]
+        self.fetch(fetcher, URLs)
+        self.assertEqual(fetcher.pool.numOpened, 1)
+        self.assertEqual(fetcher.pool.numReused, 2)
+
+
+class TestCancellation(URLFetcherTestCase):
+    """Cancellation of fetches waiting for an answer"""
+
+    def testCancelInterruptsWaiting(self):
+        fetcher = self.getFetcher(timeout=30)
+        futures = fetcher.fetch([self.server.getURL('/hang')])
+        while not self.server.requests['/hang']:
+            time.sleep(0.01)
+        start = time.monotonic()
+        fetcher.cancel()
+        error = futures[0].exception(timeout=30)
+        self.assertIsInstance(error, ReadCancelled)
+        self.assertLess(time.monotonic() - start, 2)
+
+
+
+class TestHTTPCache(unittest.TestCase):
+    """Storage and revalidation of cached URL contents"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = HTTPCache(self.directory, 2**20)
+        self.key = ('http://example.org/', None)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def testRevalidationKeepsContent(self):
+        self.cache.put(self.key, u'caf\xe9', 'utf-8', '"a"', None, 100.0)
+        path = self.cache.getPath(self.key)
+        with open(path, 'rb') as fh:
+            stored = fh.read()
+        inode = os.stat(path).st_ino
+        self.cache.revalidate(self.key, '"b"', None, 200.0)
+        entry = self.cache.get(self.key)
+        self.assertEqual(entry['content'], u'caf\xe9')
+        self.assertEqual(entry['encoding'], 'utf-8')
+        self.assertEqual(entry['etag'], '"b"')
+        self.assertEqual(entry['fetchTime'], 200.0)
+        self.assertEqual(os.stat(path).st_ino, inode)
+        with open(path, 'rb') as fh:
+            self.assertEqual(fh.read(), stored)
+
+    def testNewContentSupersedesRevalidation(self):
+        self.cache.put(self.key, u'old', 'utf-8', '"a"', None, 100.0)
+        self.cache.revalidate(self.key, '"b"', None, 200.0)
+        self.cache.put(self.key, u'new', 'utf-8', '"c"', None, 300.0)
+        entry = self.cache.get(self.key)
+        self.assertEqual(entry['content'], u'new')
+        self.assertEqual(entry['etag'], '"c"')
+        self.assertEqual(entry['fetchTime'], 300.0)
+
+    def testMissingEntry(self):
+        self.cache.revalidate(self.key, '"b"', None, 200.0)
+        self.assertIsNone(self.cache.get(self.key))
+
+
+if __name__ == '__main__':
+    unittest.main()
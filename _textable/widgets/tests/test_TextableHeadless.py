@@ -0,0 +1,228 @@
+"""
+Module test_TextableHeadless.py
+Copyright 2012-2025 Aris Xanthos
+-----------------------------------------------------------------------------
+This file is part of the Orange3-Textable package.
+
+Orange3-Textable is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Orange3-Textable is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Orange3-Textable. If not, see <http://www.gnu.org/licenses/>.
+-----------------------------------------------------------------------------
+Tests of the headless runner of TextableHeadless on small workflows (run
+with python -m unittest _textable.widgets.tests.test_TextableHeadless).
+"""
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from LTTL.Input import Input
+from LTTL.TableThread import PivotCrosstab
+
+from _textable.widgets.TextableHeadless import (
+    Workflow, HeadlessRunner, writeOutput, getOutputBasePath,
+)
+from _textable.widgets.TextableUtils import VersionedSettingsHandlerMixin
+from _textable.widgets import (
+    OWTextableTextField, OWTextableSegment, OWTextableCount,
+)
+
+# Nodes of the test workflow: (widget module, title, settings)...
+NODES = [
+    (OWTextableTextField, u'Text Field', {
+        'textFieldContent': b'a rose is a rose is a rose',
+        'encoding': 'utf-8',
+    }),
+    (OWTextableSegment, u'Segment', {'segmentType': u'Segment into words'}),
+    (OWTextableCount, u'Count', {}),
+]
+
+# Links of the test workflow: (source, sink, source channel, sink channel)...
+LINKS = [
+    (0, 1, u'Text data', u'Segmentation'),
+    (1, 2, u'Segmented data', u'Segmentation'),
+]
+
+
+def _getVersion(module):
+    """Return the settings version of a widget module"""
+    return tuple(
+        int(number) for number in module.__version__.split('.')[:-1]
+    )
+
+
+def _writeWorkflow(path, nodes=NODES, links=LINKS, versioned=True):
+    """Write a workflow file in the format of Orange Canvas"""
+    lines = [u'<?xml version="1.0" encoding="utf-8"?>']
+    lines.append(u'<scheme version="2.0" title="Test">')
+    lines.append(u'<nodes>')
+    for nodeId, (module, title, _) in enumerate(nodes):
+        widgetName = module.__name__.rsplit('.', 1)[-1]
+        lines.append(
+            u'<node id="%i" name="%s" qualified_name="%s.%s" title="%s" />'
+            % (nodeId, title, module.__name__, widgetName, title)
+        )
+    lines.append(u'</nodes>')
+    lines.append(u'<links>')
+    for linkId, (source, sink, sourceChannel, sinkChannel) in (
+        enumerate(links)
+    ):
+        lines.append(
+            u'<link id="%i" source_node_id="%i" sink_node_id="%i" '
+            u'source_channel="%s" sink_channel="%s" enabled="true" />'
+            % (linkId, source, sink, sourceChannel, sinkChannel)
+        )
+    lines.append(u'</links>')
+    lines.append(u'<node_properties>')
+    for nodeId, (module, _, settings) in enumerate(nodes):
+        settings = dict(settings)
+        if versioned:
+            settings[VersionedSettingsHandlerMixin.VERSION_KEY] = (
+                _getVersion(module)
+            )
+        lines.append(
+            u'<properties node_id="%i" format="literal">%r</properties>'
+            % (nodeId, settings)
+        )
+    lines.append(u'</node_properties>')
+    lines.append(u'</scheme>')
+    with open(path, 'w', encoding='utf-8') as fh:
+        fh.write(u'\n'.join(lines))
+
+
+class HeadlessTestCase(unittest.TestCase):
+    """Test case with a temporary directory"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def getPath(self, name):
+        return os.path.join(self.directory, name)
+
+
+class TestWorkflow(HeadlessTestCase):
+    """Reading of workflow files"""
+
+    def testNodesLinksAndSettings(self):
+        _writeWorkflow(self.getPath('test.ows'))
+        workflow = Workflow(self.getPath('test.ows'))
+        self.assertEqual(
+            [node['title'] for node in workflow.nodes.values()],
+            [u'Text Field', u'Segment', u'Count'],
+        )
+        self.assertEqual(
+            workflow.nodes['1']['settings']['segmentType'],
+            u'Segment into words',
+        )
+        self.assertEqual(workflow.getSources('2'), {'1'})
+        self.assertEqual(workflow.getOrder(), ['0', '1', '2'])
+
+    def testOrderFollowsLinks(self):
+        _writeWorkflow(
+            self.getPath('test.ows'), links=list(reversed(LINKS))
+        )
+        order = Workflow(self.getPath('test.ows')).getOrder()
+        self.assertEqual(order, ['0', '1', '2'])
+
+    def testCycle(self):
+        _writeWorkflow(
+            self.getPath('test.ows'),
+            links=LINKS + [(2, 0, u'Orange table', u'Text data')],
+        )
+        with self.assertRaises(ValueError):
+            Workflow(self.getPath('test.ows')).getOrder()
+
+    def testInvalidFile(self):
+        with open(self.getPath('test.ows'), 'w') as fh:
+            fh.write(u'<scheme><nodes>')
+        with self.assertRaises(ValueError):
+            Workflow(self.getPath('test.ows'))
+
+
+class TestOutputs(HeadlessTestCase):
+    """Writing of output values to files"""
+
+    def testSegmentation(self):
+        path = writeOutput(Input(u'some text', u'text'), self.getPath('a'))
+        self.assertEqual(path, self.getPath('a.txt'))
+        with open(path, encoding='utf-8') as fh:
+            self.assertEqual(fh.read(), u'some text')
+
+    def testTable(self):
+        table = PivotCrosstab(
+            [u'row'], [u'col'], {(u'row', u'col'): 1}
+        )
+        path = writeOutput(table, self.getPath('a'))
+        self.assertEqual(path, self.getPath('a.tsv'))
+        with open(path, encoding='utf-8') as fh:
+            self.assertEqual(fh.read(), table.to_string())
+
+    def testOtherValues(self):
+        self.assertIsNone(writeOutput(None, self.getPath('a')))
+        self.assertEqual(
+            writeOutput({u'key': 1}, self.getPath('b')),
+            self.getPath('b.pkl'),
+        )
+
+    def testBasePath(self):
+        node = {'id': '2', 'title': u'Count: words'}
+        self.assertEqual(
+            getOutputBasePath(self.directory, node, u'Orange table', 1),
+            self.getPath(u'2_Count-words_Orange-table_1'),
+        )
+
+
+class TestHeadlessRunner(HeadlessTestCase):
+    """Running of workflows without GUI"""
+
+    def runWorkflow(self, **kwargs):
+        _writeWorkflow(self.getPath('test.ows'), **kwargs)
+        self.log = io.StringIO()
+        runner = HeadlessRunner(
+            Workflow(self.getPath('test.ows')), log=self.log
+        )
+        return runner.run()
+
+    def testWidgetsAreRunInOrder(self):
+        results = self.runWorkflow()
+        self.assertEqual(list(results), ['0', '1', '2'])
+        self.assertEqual(
+            [result['state'] for result in results.values()],
+            ['ok', 'ok', 'ok'],
+        )
+        segments, = results['1']['outputs'][u'Segmented data'].values()
+        self.assertEqual(len(segments), 8)
+        table, = results['2']['outputs'][u'Textable pivot crosstab'].values()
+        self.assertEqual(
+            sorted(table.row_ids), [u'a', u'is', u'rose']
+        )
+
+    def testSettingsOfOtherVersionsAreReported(self):
+        results = self.runWorkflow(versioned=False)
+        self.assertIn(
+            u'Settings of Segment were saved by another version',
+            self.log.getvalue(),
+        )
+        # Widgets are then run with their default settings...
+        self.assertEqual(results['0']['state'], 'warning')
+        self.assertEqual(
+            results['1']['message'], u'Widget needs input.'
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,343 @@
+"""
+Module test_TextableIO.py
+Copyright 2012-2025 Aris Xanthos
+-----------------------------------------------------------------------------
+This file is part of the Orange3-Textable package.
+
+Orange3-Textable is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Orange3-Textable is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Orange3-Textable. If not, see <http://www.gnu.org/licenses/>.
+-----------------------------------------------------------------------------
+Tests of TextableIO on temporary files (run with
+python -m unittest _textable.widgets.tests.test_TextableIO).
+"""
+
+import io
+import os
+import bz2
+import gzip
+import lzma
+import codecs
+import locale
+import shutil
+import time
+import tarfile
+import zipfile
+import tempfile
+import unittest
+from functools import partial
+from unicodedata import normalize
+
+from _textable.widgets.TextableIO import (
+    iterNormalizedText, readTextStream, readTextFile, TextFileCache,
+    getFileCacheKey, DirectoryFiles, readArchive, getArchiveType,
+)
+
+
+def _reference(text):
+    """Return text normalized the way Text Files always did"""
+    return normalize('NFC', u'\n'.join(text.splitlines()))
+
+
+class TestNormalization(unittest.TestCase):
+    """Single-pass newline and Unicode normalization of decoded chunks"""
+
+    TEXTS = [
+        u'plain text\nwith two lines\n',
+        u'windows\r\nline\r\nbreaks\r\n',
+        u'old mac\rline breaks\rand \u2028 others\x85',
+        u'cafe\u0301 and re\u0301sume\u0301, decomposed',
+        u'\r\n\r\n\n\nleading and trailing breaks\r\n\r\n',
+        u'',
+    ]
+
+    def join(self, chunks, stripBOM=False):
+        return u''.join(iterNormalizedText(chunks, stripBOM))
+
+    def testSameAsWholeText(self):
+        for text in self.TEXTS:
+            self.assertEqual(self.join([text]), _reference(text), text)
+
+    def testAnyChunking(self):
+        # Chunks may cut combining sequences and '\r\n' anywhere...
+        for text in self.TEXTS:
+            for size in range(1, 6):
+                chunks = [
+                    text[index:index+size]
+                    for index in range(0, len(text), size)
+                ]
+                self.assertEqual(
+                    self.join(chunks), _reference(text), (text, size)
+                )
+
+    def testStripBOM(self):
+        bom = codecs.BOM_UTF8.decode('utf-8')
+        self.assertEqual(self.join([bom, bom + u'text'], True), u'text')
+        self.assertEqual(self.join([bom + u'text']), bom + u'text')
+
+
+class TestReadTextStream(unittest.TestCase):
+    """Decoding of streams with requested or detected encodings"""
+
+    TEXT = u'Caf\xe9 cr\xe8me\r\nna\xefve ' * 100
+
+    def read(self, data, encoding, sampleSize=16):
+        return readTextStream(
+            partial(io.BytesIO, data), encoding, sampleSize
+        )
+
+    def testRequestedEncoding(self):
+        content, encoding = self.read(self.TEXT.encode('latin-1'), 'latin-1')
+        self.assertEqual(content, _reference(self.TEXT))
+        self.assertEqual(encoding, 'latin-1')
+
+    def testDetectedBOM(self):
+        data = codecs.BOM_UTF8 + self.TEXT.encode('utf-8')
+        content, encoding = self.read(data, '(auto-detect)')
+        self.assertEqual(content, _reference(self.TEXT))
+        self.assertEqual(encoding, 'utf-8-sig')
+
+    def testDetectionFallsBackToWholeStream(self):
+        # The sample is valid utf-8, but what follows it isn't...
+        data = b'a' * 16 + self.TEXT.encode('latin-1')
+        content, encoding = self.read(data, '(auto-detect)')
+        self.assertNotEqual(codecs.lookup(encoding).name, 'utf-8')
+        self.assertEqual(content, _reference(data.decode(encoding)))
+
+    def testUndetectedEncodingIsReturned(self):
+        # chardet detects no encoding for an empty stream...
+        content, encoding = self.read(b'', '(auto-detect)', 0)
+        self.assertEqual(content, u'')
+        self.assertEqual(encoding, locale.getpreferredencoding(False))
+
+    def testUndecodableStream(self):
+        with self.assertRaises(UnicodeError):
+            self.read(self.TEXT.encode('latin-1'), 'utf-8')
+
+
+class TestReadTextFile(unittest.TestCase):
+    """Reading of files with progress reports"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def testBytesAreReported(self):
+        path = os.path.join(self.directory, 'text.txt')
+        with open(path, 'wb') as fh:
+            fh.write(b'line\n' * 100000)
+        reports = list()
+        content, _ = readTextFile(path, 'utf-8', onChunk=reports.append)
+        self.assertEqual(content, u'line\n' * 99999 + u'line')
+        self.assertEqual(sum(reports), 500000)
+
+
+
+class TestTextFileCache(unittest.TestCase):
+    """Storage and least recently used eviction of imported files"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def testContentAndEncodingAreStored(self):
+        cache = TextFileCache(self.directory, 2**20)
+        cache.put('key', u'caf\xe9\nline', 'latin-1')
+        self.assertEqual(cache.get('key'), (u'caf\xe9\nline', 'latin-1'))
+        self.assertIsNone(cache.get('other key'))
+
+    def testLeastRecentlyUsedEntryIsEvicted(self):
+        cache = TextFileCache(self.directory, 2500)
+        for key in ('a', 'b'):
+            cache.put(key, u'x' * 1000, 'utf-8')
+        # Mark 'a' as older than 'b', then use it...
+        past = time.time() - 100
+        os.utime(cache.getPath('a'), (past, past))
+        os.utime(cache.getPath('b'), (past + 1, past + 1))
+        cache.get('a')
+        cache.put('c', u'x' * 1000, 'utf-8')
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+        self.assertLessEqual(cache.getSize(), 2500)
+        self.assertEqual(
+            cache.getSize(),
+            sum(os.path.getsize(cache.getPath(key)) for key in 'ac'),
+        )
+
+    def testKeyChangesWithFile(self):
+        path = os.path.join(self.directory, 'text.txt')
+        with open(path, 'w') as fh:
+            fh.write(u'text')
+        key = getFileCacheKey(path, 'utf-8')
+        self.assertEqual(key, getFileCacheKey(path, 'utf-8'))
+        self.assertNotEqual(key, getFileCacheKey(path, 'latin-1'))
+        with open(path, 'w') as fh:
+            fh.write(u'longer text')
+        self.assertNotEqual(key, getFileCacheKey(path, 'utf-8'))
+
+
+
+class TestDirectoryFiles(unittest.TestCase):
+    """Enumeration of the files of a directory tree"""
+
+    PATHS = [
+        'b.txt', 'a.txt', 'notes.md', 'sub/c.txt', 'sub/deep/d.txt',
+        'skip/e.txt', 'sub/skip/f.txt',
+    ]
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for path in self.PATHS:
+            path = os.path.join(self.directory, *path.split('/'))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as fh:
+                fh.write(u'text')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def list(self, includes=(), excludes=()):
+        return [
+            entry[-1] for entry in DirectoryFiles(
+                self.directory, includes, excludes, 'utf-8'
+            )
+        ]
+
+    def testAllFilesInOrder(self):
+        self.assertEqual(self.list(), sorted(self.PATHS))
+
+    def testEntries(self):
+        entry = next(iter(DirectoryFiles(self.directory, [], [], 'latin-1')))
+        self.assertEqual(entry, [
+            os.path.join(self.directory, 'a.txt'), 'latin-1', u'', u'',
+            u'a.txt',
+        ])
+
+    def testNamePatterns(self):
+        self.assertEqual(self.list(['*.md']), ['notes.md'])
+        self.assertEqual(
+            self.list(['*.txt'], ['skip']),
+            ['a.txt', 'b.txt', 'sub/c.txt', 'sub/deep/d.txt'],
+        )
+
+    def testPathPatterns(self):
+        self.assertEqual(
+            self.list(['sub/*']),
+            ['sub/c.txt', 'sub/deep/d.txt', 'sub/skip/f.txt'],
+        )
+        self.assertEqual(
+            self.list(excludes=['sub/skip', 'skip/*']),
+            ['a.txt', 'b.txt', 'notes.md', 'sub/c.txt', 'sub/deep/d.txt'],
+        )
+
+    def testIterationIsRepeatable(self):
+        files = DirectoryFiles(self.directory, ['*.txt'], [], 'utf-8')
+        self.assertEqual(list(files), list(files))
+
+
+
+class TestReadArchive(unittest.TestCase):
+    """Import of the members of archives and compressed files"""
+
+    MEMBERS = [
+        ('a.txt', u'caf\xe9\r\nline'.encode('utf-8')),
+        ('docs/b.txt', b'second member'),
+        ('docs/c.md', b'markdown'),
+    ]
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def getPath(self, name):
+        return os.path.join(self.directory, name)
+
+    def writeZip(self, name):
+        with zipfile.ZipFile(self.getPath(name), 'w') as archive:
+            archive.writestr('docs/', b'')
+            for memberPath, data in self.MEMBERS:
+                archive.writestr(memberPath, data)
+        return self.getPath(name)
+
+    def writeTar(self, name, mode):
+        with tarfile.open(self.getPath(name), mode) as archive:
+            for memberPath, data in self.MEMBERS:
+                info = tarfile.TarInfo(memberPath)
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+        return self.getPath(name)
+
+    def testArchiveTypes(self):
+        for name, archiveType in [
+            ('x.ZIP', 'zip'), ('x.tar.gz', 'tar'), ('x.tgz', 'tar'),
+            ('x.txt.gz', 'gz'), ('x.bz2', 'bz2'), ('x.xz', 'xz'),
+            ('x.txt', None),
+        ]:
+            self.assertEqual(getArchiveType(name), archiveType, name)
+
+    def testZipAndTarMembers(self):
+        paths = [
+            self.writeZip('x.zip'),
+            self.writeTar('x.tar', 'w'),
+            self.writeTar('x.tar.gz', 'w:gz'),
+            self.writeTar('x.tar.bz2', 'w:bz2'),
+            self.writeTar('x.tar.xz', 'w:xz'),
+        ]
+        for path in paths:
+            members = readArchive(path, '(auto-detect)')
+            self.assertEqual(
+                [member[2] for member in members],
+                [memberPath for memberPath, _ in self.MEMBERS],
+                path,
+            )
+            self.assertEqual(members[0][:2], (u'caf\xe9\nline', 'utf-8'))
+            self.assertEqual(members[1][0], u'second member')
+
+    def testMemberPatterns(self):
+        path = self.writeZip('x.zip')
+        members = readArchive(path, 'utf-8', ['*.md', 'a.*'])
+        self.assertEqual([m[2] for m in members], ['a.txt', 'docs/c.md'])
+
+    def testCompressedFiles(self):
+        data = u'caf\xe9 '.encode('utf-8') * 1000
+        for extension, opener in [
+            ('gz', gzip.open), ('bz2', bz2.open), ('xz', lzma.open),
+        ]:
+            path = self.getPath('text.txt.' + extension)
+            with opener(path, 'wb') as fh:
+                fh.write(data)
+            reports = list()
+            members = readArchive(
+                path, 'utf-8', onChunk=reports.append
+            )
+            self.assertEqual(
+                members, [(data.decode('utf-8'), 'utf-8', 'text.txt')]
+            )
+            self.assertEqual(sum(reports), os.path.getsize(path))
+
+    def testCorruptArchive(self):
+        for name in ('x.zip', 'x.tar.gz', 'x.txt.gz'):
+            with open(self.getPath(name), 'wb') as fh:
+                fh.write(b'not an archive' * 100)
+            with self.assertRaises(IOError):
+                readArchive(self.getPath(name), 'utf-8')
+
+
+if __name__ == '__main__':
+    unittest.main()
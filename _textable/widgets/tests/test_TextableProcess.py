@@ -0,0 +1,127 @@
+"""
+Module test_TextableProcess.py
+Copyright 2012-2025 Aris Xanthos
+-----------------------------------------------------------------------------
+This file is part of the Orange3-Textable package.
+
+Orange3-Textable is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Orange3-Textable is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Orange3-Textable. If not, see <http://www.gnu.org/licenses/>.
+-----------------------------------------------------------------------------
+Tests of the snapshot store of TextableProcess on a temporary directory
+(run with python -m unittest _textable.widgets.tests.test_TextableProcess).
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from LTTL.Input import Input
+from LTTL.Segment import Segment
+from LTTL.Segmentation import Segmentation
+
+from _textable.widgets.TextableProcess import (
+    SnapshotStore, CancellationToken, digestString,
+)
+
+
+def _getContents(segmentation):
+    return [segment.get_content() for segment in segmentation]
+
+
+class TestSnapshotStore(unittest.TestCase):
+    """Storage of widget results and of the strings they refer to"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = SnapshotStore(self.directory, 2**20)
+        self.text = Input(u'a rose is a rose', u'text')
+        index = self.text[0].str_index
+        self.words = Segmentation(
+            [Segment(index, 0, 1), Segment(index, 2, 6, {u'pos': u'N'})],
+            label=u'words',
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def testResultIsRestored(self):
+        self.store.save('Segment', 'key', (self.words, 2))
+        words, number = self.store.load('Segment', 'key')
+        self.assertEqual(number, 2)
+        self.assertEqual(words.label, u'words')
+        self.assertEqual(_getContents(words), [u'a', u'rose'])
+        self.assertEqual(words[1].annotations, {u'pos': u'N'})
+        # Strings are read back from the store...
+        self.assertNotEqual(words[0].str_index, self.words[0].str_index)
+
+    def testOtherKeyIsMissing(self):
+        self.store.save('Segment', 'key', self.words)
+        self.assertIs(
+            self.store.load('Segment', 'other key'), self.store.MISSING
+        )
+        self.assertIs(
+            self.store.load('Count', 'key'), self.store.MISSING
+        )
+
+    def testStringsAreStoredOnce(self):
+        self.store.save('Segment', 'key', self.words)
+        self.store.save('Select', 'key', self.words)
+        self.store.save('Segment', 'new key', self.text)
+        # Two results and a single string...
+        self.assertEqual(len(os.listdir(self.directory)), 3)
+
+    def testExistingStringsAreReused(self):
+        self.store.save('Segment', 'key', self.words)
+        index = self.text[0].str_index
+        digest = digestString(Segmentation.get_data(index)).hex()
+        requested = list()
+
+        def findStrings(digests):
+            requested.append(digests)
+            return {
+                key: index for key, value in digests.items()
+                if value == digest
+            }
+
+        os.remove(self.store.getStringPath(digest))
+        words = self.store.load('Segment', 'key', findStrings)
+        self.assertEqual(requested, [{index: digest}])
+        self.assertEqual(words[0].str_index, index)
+        self.assertEqual(_getContents(words), [u'a', u'rose'])
+
+    def testMissingStringMakesResultMissing(self):
+        self.store.save('Segment', 'key', self.words)
+        index = self.text[0].str_index
+        digest = digestString(Segmentation.get_data(index)).hex()
+        os.remove(self.store.getStringPath(digest))
+        self.assertIs(self.store.load('Segment', 'key'), self.store.MISSING)
+
+    def testRun(self):
+        calls = list()
+
+        def compute():
+            calls.append(None)
+            return self.words
+
+        token = CancellationToken()
+        token.cancel()
+        self.store.run('Segment', 'key', compute, token)
+        self.store.run('Segment', 'key', compute)
+        words = self.store.run('Segment', 'key', compute)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(_getContents(words), [u'a', u'rose'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+"""
+Module test_TextableUtils.py
+Copyright 2012-2025 Aris Xanthos
+-----------------------------------------------------------------------------
+This file is part of the Orange3-Textable package.
+
+Orange3-Textable is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Orange3-Textable is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Orange3-Textable. If not, see <http://www.gnu.org/licenses/>.
+-----------------------------------------------------------------------------
+Tests of the result memo and fingerprints of TextableUtils (run with
+python -m unittest _textable.widgets.tests.test_TextableUtils).
+"""
+
+import re
+import shutil
+import tempfile
+import unittest
+
+from LTTL.Input import Input
+from LTTL.Segment import Segment
+from LTTL.Segmentation import Segmentation
+from LTTL.TableThread import PivotCrosstab
+
+from _textable.widgets.TextableProcess import (
+    CancellationToken, SnapshotStore,
+)
+from _textable.widgets.TextableUtils import ResultMemo, getFingerprint
+
+
+def _getTable(numRows):
+    rows = [u'row%i' % index for index in range(numRows)]
+    return PivotCrosstab(
+        rows, [u'col'], {(row, u'col'): 1 for row in rows}
+    )
+
+
+class TestResultMemo(unittest.TestCase):
+    """Reuse of task results with the same inputs and settings"""
+
+    def setUp(self):
+        self.calls = list()
+
+    def compute(self, value):
+        self.calls.append(value)
+        return value
+
+    def testResultIsReused(self):
+        memo = ResultMemo()
+        text = Input(u'some text', u'text')
+        for _ in range(2):
+            self.assertIs(
+                memo.run((text, u'words'), lambda: self.compute(text)),
+                text,
+            )
+        memo.run((text, u'letters'), lambda: self.compute(text))
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual((memo.hits, memo.misses), (1, 2))
+
+    def testCancelledAndMissingResultsAreNotMemoized(self):
+        memo = ResultMemo()
+        token = CancellationToken()
+        token.cancel()
+        memo.run('key', lambda: self.compute('partial'), token)
+        memo.run('key', lambda: self.compute(None))
+        self.assertEqual(
+            memo.run('key', lambda: self.compute('done')), 'done'
+        )
+        self.assertEqual(self.calls, ['partial', None, 'done'])
+
+    def testLeastRecentlyUsedResultIsDropped(self):
+        memo = ResultMemo(maxEntries=2)
+        for key in ('a', 'b', 'a', 'c', 'a', 'b'):
+            memo.run(key, lambda: self.compute(key))
+        self.assertEqual(self.calls, ['a', 'b', 'c', 'b'])
+        self.assertEqual(len(memo.entries), 2)
+
+    def testLargeResultsAreNotMemoized(self):
+        memo = ResultMemo(maxSize=10000)
+        memo.put('small', _getTable(2))
+        memo.put('large', _getTable(1000))
+        self.assertEqual(list(memo.entries), ['small'])
+        self.assertLessEqual(memo.size, 10000)
+
+    def testResultsOfReplacedStringsAreDropped(self):
+        memo = ResultMemo()
+        text = Input(u'some text', u'text')
+        memo.put('key', text)
+        self.assertIs(memo.get('key'), text)
+        text.update(u'other text')
+        self.assertIsNone(memo.get('key'))
+        self.assertEqual(memo.size, 0)
+
+    def testResultIsRestoredFromSnapshot(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        store = SnapshotStore(directory, 2**20)
+        text = Input(u'some text', u'text')
+        key = (text, u'words')
+        ResultMemo().run(
+            key, lambda: self.compute(text), None, store, u'Segment'
+        )
+        # Another session (e.g. after reopening a workflow)...
+        restored = ResultMemo().run(
+            key, lambda: self.compute(None), None, store, u'Segment'
+        )
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(restored[0].get_content(), u'some text')
+        # (The string is still in Segmentation.data, so it is reused.)
+        self.assertEqual(restored[0].str_index, text[0].str_index)
+
+
+
+class TestFingerprint(unittest.TestCase):
+    """Fingerprints of segmentations, tables and settings"""
+
+    def testSameContentInOtherStrings(self):
+        first, second = Input(u'same', u'a'), Input(u'same', u'a')
+        self.assertNotEqual(getFingerprint(first), getFingerprint(second))
+        self.assertEqual(
+            getFingerprint(first, portable=True),
+            getFingerprint(second, portable=True),
+        )
+        self.assertNotEqual(
+            getFingerprint(first, portable=True),
+            getFingerprint(Input(u'other', u'a'), portable=True),
+        )
+
+    def testChangesAreDetected(self):
+        text = Input(u'some text', u'text')
+        segmentation = Segmentation([Segment(text[0].str_index, 0, 4)])
+        fingerprints = [getFingerprint(segmentation)]
+        segmentation.append(Segment(text[0].str_index, 5, 9))
+        fingerprints.append(getFingerprint(segmentation))
+        segmentation.label = u'label'
+        fingerprints.append(getFingerprint(segmentation))
+        text.update(u'some word')
+        fingerprints.append(getFingerprint(segmentation))
+        self.assertEqual(len(set(fingerprints)), 4)
+        self.assertEqual(getFingerprint(segmentation), fingerprints[-1])
+
+    def testAppendedSegmentsMatchWholeSegmentation(self):
+        text = Input(u'some text', u'text')
+        index = text[0].str_index
+        appended = Segmentation([Segment(index, 0, 4)])
+        getFingerprint(appended)
+        appended.append(Segment(index, 5, 9, {u'key': u'value'}))
+        whole = Segmentation([
+            Segment(index, 0, 4), Segment(index, 5, 9, {u'key': u'value'})
+        ])
+        self.assertEqual(getFingerprint(appended), getFingerprint(whole))
+
+    def testTables(self):
+        table, copy = _getTable(3), _getTable(3)
+        self.assertEqual(getFingerprint(table), getFingerprint(table))
+        self.assertNotEqual(getFingerprint(table), getFingerprint(copy))
+        self.assertEqual(
+            getFingerprint(table, portable=True),
+            getFingerprint(copy, portable=True),
+        )
+        self.assertNotEqual(
+            getFingerprint(table, portable=True),
+            getFingerprint(_getTable(4), portable=True),
+        )
+
+    def testSettings(self):
+        settings = {
+            u'regexes': [(re.compile(u'\\w+', re.U), u'tokenize')],
+            u'keys': {u'b', u'a'},
+            u'number': 1,
+        }
+        same = {
+            u'regexes': [(re.compile(u'\\w+', re.U), u'tokenize')],
+            u'keys': {u'a', u'b'},
+            u'number': 1,
+        }
+        self.assertEqual(getFingerprint(settings), getFingerprint(same))
+        same[u'number'] = 2
+        self.assertNotEqual(getFingerprint(settings), getFingerprint(same))
+
+
+if __name__ == '__main__':
+    unittest.main()